@@ -1,35 +1,44 @@
 from datetime import datetime, timedelta
 from typing import Optional
 import os
+import secrets
+import time
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 
-from database import get_db
+from cache import TTLCache
+from database import get_session, run_db
+from hashing import check_password
 from models import User
-from schemas import TokenData
+from schemas import User as Principal
 
 # Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # OAuth2
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
+# Principal cache: tokens map to their decoded subject, subjects to a
+# snapshot of the user row. Entries live AUTH_CACHE_TTL seconds at most and
+# are dropped as soon as the user row changes in this process.
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "30"))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+token_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
+principal_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+# EventSource cannot send headers, and URLs end up in access logs and
+# history: streams are opened with a short-lived, single-use ticket in the
+# query string instead of the access token. Redeemed ticket ids are kept
+# until the tickets expire.
+STREAM_TICKET_SECONDS = int(os.getenv("STREAM_TICKET_SECONDS", "30"))
+STREAM_TICKET_TYPE = "stream"
+redeemed_tickets = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=STREAM_TICKET_SECONDS)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -43,42 +52,103 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def create_stream_ticket(email: str) -> str:
+    return create_access_token(
+        {"sub": email, "typ": STREAM_TICKET_TYPE, "jti": secrets.token_urlsafe(16)},
+        timedelta(seconds=STREAM_TICKET_SECONDS)
+    )
+
+
+def redeem_stream_ticket(ticket: str) -> Optional[str]:
+    """Return the email a ticket was issued for, once; None if invalid or used"""
+    try:
+        payload = jwt.decode(ticket, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("typ") != STREAM_TICKET_TYPE or not payload.get("jti"):
+        return None
+    if not redeemed_tickets.add(payload["jti"], True):
+        return None
+    return payload.get("sub")
+
+
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    user = get_user_by_email(db, email)
+async def authenticate_user(db, email: str, password: str) -> Optional[User]:
+    user = await run_db(db, get_user_by_email, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    # bcrypt runs on the hashing process pool, may raise PoolSaturated
+    if not await check_password(password, user.hashed_password):
         return None
     return user
 
 
-async def get_current_user(
-    token: Optional[str] = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> Optional[User]:
-    if not token:
+def decode_subject(token: str) -> Optional[str]:
+    """Return the email a token was issued for, or None if it is invalid"""
+    cached = token_cache.get(token, None)
+    if cached is not None:
+        email, expires_at = cached
+        if expires_at > time.time():
+            return email
+        token_cache.delete(token)
         return None
 
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            return None
-        token_data = TokenData(email=email)
     except JWTError:
         return None
+    email = payload.get("sub")
+    # Stream tickets only open streams, see get_stream_user
+    if email is None or payload.get("typ") == STREAM_TICKET_TYPE:
+        return None
+    token_cache.set(token, (email, payload.get("exp", float("inf"))))
+    return email
 
-    user = get_user_by_email(db, email=token_data.email)
-    return user
+
+def invalidate_principal(email: str):
+    principal_cache.delete(email)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _drop_cached_principal(mapper, connection, target):
+    # Deactivation or an admin flag change must apply on the next request.
+    # Bulk query.update() bypasses this hook: call invalidate_principal().
+    invalidate_principal(target.email)
+    for previous_email in inspect(target).attrs.email.history.deleted or ():
+        invalidate_principal(previous_email)
+
+
+async def get_current_user(
+    token: Optional[str] = Depends(oauth2_scheme),
+    db=Depends(get_session)
+) -> Optional[Principal]:
+    if not token:
+        return None
+
+    email = decode_subject(token)
+    if email is None:
+        return None
+    return await load_principal(email, db)
+
+
+async def load_principal(email: str, db) -> Optional[Principal]:
+    principal = principal_cache.get(email, None)
+    if principal is None:
+        user = await run_db(db, get_user_by_email, email)
+        if user is None:
+            return None
+        principal = Principal.model_validate(user)
+        principal_cache.set(email, principal)
+    return principal
 
 
 async def get_current_active_user(
-    current_user: Optional[User] = Depends(get_current_user)
-) -> User:
+    current_user: Optional[Principal] = Depends(get_current_user)
+) -> Principal:
     if not current_user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -91,11 +161,27 @@ async def get_current_active_user(
 
 
 async def get_current_admin_user(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+    current_user: Principal = Depends(get_current_active_user)
+) -> Principal:
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
     return current_user
+
+
+async def get_stream_user(
+    token: Optional[str] = Depends(oauth2_scheme),
+    ticket: Optional[str] = Query(None),
+    db=Depends(get_session)
+) -> Principal:
+    """
+    get_current_active_user for streaming endpoints: the Authorization
+    header, or ?ticket= from POST /api/events/ticket for EventSource.
+    """
+    if token:
+        return await get_current_active_user(await get_current_user(token, db))
+    email = redeem_stream_ticket(ticket) if ticket else None
+    principal = await load_principal(email, db) if email else None
+    return await get_current_active_user(principal)
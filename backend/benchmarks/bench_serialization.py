@@ -0,0 +1,104 @@
+"""
+Benchmark list response serialization.
+
+Compares, for lists of 100/1,000/10,000 articles:
+- full: what list endpoints used to do, full ORM objects (content included)
+  validated into List[Article] via from_attributes, then stdlib json
+- summary+pydantic: summary rows, still validated through ArticlePage
+- summary+orjson: summary rows turned into dicts and encoded by orjson
+
+Run from backend/: python benchmarks/bench_serialization.py
+"""
+import json
+import os
+import sys
+import time
+from datetime import date, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Article as ArticleModel
+from pagination import SUMMARY_COLUMNS
+from schemas import Article, ArticlePage
+from serialization import dumps, page_content
+
+SIZES = (100, 1_000, 10_000)
+REPEAT = 5
+
+PARAGRAPH = (
+    "L'observabilité n'est pas un luxe : sans métriques, sans traces et sans "
+    "journaux structurés, chaque incident devient une enquête à l'aveugle. "
+)
+CONTENT = "# Titre\n\n" + "\n\n".join(PARAGRAPH * 4 for _ in range(6))
+
+
+def build_session(size: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    start = date(2026, 1, 1)
+    session.add_all(
+        ArticleModel(
+            title=f"Article {i}",
+            slug=f"article-{i}",
+            date=start - timedelta(days=i % 365),
+            category="IA",
+            image="https://images.unsplash.com/photo-1485827404703?w=800",
+            excerpt=PARAGRAPH,
+            content=CONTENT,
+            status="published",
+        )
+        for i in range(size)
+    )
+    session.commit()
+    return session
+
+
+def best_of(fn) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    article_list = TypeAdapter(List[Article])
+    print(f"{'articles':>9} {'variant':<18} {'ms':>9} {'bytes':>12}")
+    for size in SIZES:
+        session = build_session(size)
+        full = session.query(ArticleModel).all()
+        rows = session.query(*SUMMARY_COLUMNS).all()
+        page = {"items": rows, "next_cursor": None}
+
+        def full_path():
+            validated = article_list.validate_python(full, from_attributes=True)
+            return json.dumps(
+                jsonable_encoder(article_list.dump_python(validated, mode="json"))
+            ).encode()
+
+        def summary_pydantic():
+            return ArticlePage.model_validate(page).model_dump_json().encode()
+
+        def summary_orjson():
+            return dumps(page_content(page))
+
+        for name, fn in (
+            ("full", full_path),
+            ("summary+pydantic", summary_pydantic),
+            ("summary+orjson", summary_orjson),
+        ):
+            elapsed = best_of(fn)
+            print(f"{size:>9} {name:<18} {elapsed * 1000:>9.2f} {len(fn()):>12}")
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
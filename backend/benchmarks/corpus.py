@@ -0,0 +1,179 @@
+"""
+Synthetic corpus generator for the benchmark suite.
+
+Builds N articles spread over the seed.py categories, with French Markdown
+bodies (headings, paragraphs, lists, code blocks), plus benchmark users:
+bench-user-{i}@example.com and bench-admin@example.com, all with password
+"benchmark". Articles are spread round-robin over the bench users as
+authors, so /api/articles/my has rows to return. Slugs are deterministic
+(article-synthetique-{i}) so the load generator can address articles
+without listing them first.
+
+Run from backend/:
+    python benchmarks/corpus.py --size 100000 --database-url sqlite:///bench.db
+Sizes: any integer; the suite uses 1000, 100000 and 1000000.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CATEGORIES = ["IA", "RH", "STORY", "FRONT", "CLOUD"]
+# Roughly what a live moderation queue looks like
+STATUS_WEIGHTS = {"published": 90, "pending": 7, "rejected": 3}
+BENCH_PASSWORD = "benchmark"
+BENCH_USERS = 50
+
+SUBJECTS = [
+    "l'équipe produit", "le développeur", "la plateforme", "notre architecture",
+    "le modèle de langage", "la base de données", "le recruteur tech",
+    "le cluster Kubernetes", "l'API publique", "le pipeline de données",
+    "la direction technique", "le manager", "le navigateur", "le service d'authentification",
+]
+VERBS = [
+    "améliore", "complique", "accélère", "sécurise", "transforme", "mesure",
+    "simplifie", "fragilise", "automatise", "documente", "déploie", "observe",
+]
+OBJECTS = [
+    "la latence des requêtes", "la rentabilité du projet", "les coûts d'infrastructure",
+    "la qualité du code", "l'expérience utilisateur", "les temps de réponse",
+    "la gestion des incidents", "la dette technique", "les tests de charge",
+    "la confidentialité des données", "le recrutement des profils seniors",
+    "la revue de code", "les performances du rendu", "la montée en charge",
+]
+CLAUSES = [
+    "sans sacrifier la lisibilité", "grâce à une meilleure observabilité",
+    "malgré un budget limité", "au prix d'une complexité accrue",
+    "lorsque le trafic explose", "dès la première mise en production",
+    "à condition de mesurer avant d'optimiser", "avec un cache bien dimensionné",
+]
+HEADINGS = [
+    "Contexte", "Le problème", "Mesurer d'abord", "Les compromis", "Retour d'expérience",
+    "Ce qui a fonctionné", "Les pièges à éviter", "Pour aller plus loin", "Conclusion",
+]
+TITLE_TOPICS = [
+    "l'IA générative", "Kubernetes", "PostgreSQL", "React", "le recrutement tech",
+    "l'observabilité", "le cache HTTP", "la recherche plein texte", "FastAPI",
+    "le travail à distance", "la sécurité applicative", "les micro-services",
+]
+TITLE_PATTERNS = [
+    "Au-delà du hype : {topic} en production",
+    "{topic} : les 7 clés pour réussir",
+    "Pourquoi {topic} change tout",
+    "Ce que {topic} nous a appris",
+    "{topic} en 2026 : état des lieux",
+]
+CODE_SNIPPETS = [
+    "```python\nasync def handler(request):\n    return await service.fetch(request.id)\n```",
+    "```sql\nSELECT slug, title FROM articles WHERE status = 'published' ORDER BY date DESC;\n```",
+    "```typescript\nconst controller = new AbortController();\nfetch(url, { signal: controller.signal });\n```",
+]
+
+
+def sentence(rng: random.Random) -> str:
+    text = f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(CLAUSES)}."
+    return text[0].upper() + text[1:]
+
+
+def paragraph(rng: random.Random) -> str:
+    return " ".join(sentence(rng) for _ in range(rng.randint(3, 7)))
+
+
+def markdown_body(rng: random.Random, title: str) -> str:
+    parts = [f"# {title}", paragraph(rng)]
+    for heading in rng.sample(HEADINGS, rng.randint(2, 5)):
+        parts.append(f"## {heading}")
+        parts.append(paragraph(rng))
+        roll = rng.random()
+        if roll < 0.3:
+            parts.append("\n".join(f"- {sentence(rng)}" for _ in range(rng.randint(3, 5))))
+        elif roll < 0.45:
+            parts.append(rng.choice(CODE_SNIPPETS))
+        parts.append(paragraph(rng))
+    return "\n\n".join(parts)
+
+
+def generate_articles(size: int, seed: int = 42, render: bool = False, authors=()):
+    """Article rows; authors are (user id, name) pairs assigned round-robin"""
+    from models import utcnow
+    from rendering import render_article
+
+    rng = random.Random(seed)
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+    newest = date(2026, 1, 31)
+    for i in range(size):
+        topic = rng.choice(TITLE_TOPICS)
+        title = rng.choice(TITLE_PATTERNS).format(topic=topic)
+        title = f"{title[0].upper()}{title[1:]} #{i}"
+        content = markdown_body(rng, title)
+        author_id, author = authors[i % len(authors)] if authors else (None, "BENCH")
+        row = {
+            "title": title,
+            "slug": f"article-synthetique-{i}",
+            "author": author,
+            "author_id": author_id,
+            "date": newest - timedelta(days=rng.randint(0, 5 * 365)),
+            "category": rng.choice(CATEGORIES),
+            "image": None,
+            "excerpt": sentence(rng),
+            "content": content,
+            "status": rng.choices(statuses, weights)[0],
+            "updated_at": utcnow(),
+        }
+        if render:
+            row.update(render_article(content, row["excerpt"]))
+        yield row
+
+
+def build_corpus(database_url: str, size: int, render: bool = False, batch_size: int = 5000):
+    os.environ["DATABASE_URL"] = database_url
+    from sqlalchemy import create_engine, insert, select
+
+    from database import run_migrations
+    from hashing import get_password_hash
+    from models import Article, User
+
+    run_migrations(database_url)
+    engine = create_engine(database_url)
+
+    started = time.perf_counter()
+    hashed = get_password_hash(BENCH_PASSWORD)
+    users = [
+        {"email": f"bench-user-{i}@example.com", "name": f"Bench {i}",
+         "hashed_password": hashed, "is_active": True, "is_admin": False}
+        for i in range(BENCH_USERS)
+    ]
+    users.append({"email": "bench-admin@example.com", "name": "Bench Admin",
+                  "hashed_password": hashed, "is_active": True, "is_admin": True})
+
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), users)
+        authors = conn.execute(
+            select(User.id, User.name).where(User.email.like("bench-user-%")).order_by(User.id)
+        ).all()
+        batch = []
+        for row in generate_articles(size, render=render, authors=authors):
+            batch.append(row)
+            if len(batch) == batch_size:
+                conn.execute(insert(Article.__table__), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Article.__table__), batch)
+
+    elapsed = time.perf_counter() - started
+    print(f"Generated {size} articles and {len(users)} users in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--database-url", default="sqlite:///bench.db")
+    parser.add_argument("--render", action="store_true",
+                        help="also render HTML/TOC/reading time (slower)")
+    args = parser.parse_args()
+    build_corpus(args.database_url, args.size, render=args.render)
@@ -0,0 +1,296 @@
+"""
+Concurrent load generator for the API.
+
+Drives the real FastAPI app with N concurrent clients for a fixed duration,
+either over HTTP against a running server (--base-url) or in-process through
+httpx's ASGI transport (--asgi, app imported with --database-url). Expects a
+corpus built by benchmarks/corpus.py.
+
+Mixes:
+    read        list pages (by category, following cursors) and article detail
+    search      full-text search with one to three terms
+    auth        login, /api/auth/me and the user's own articles
+    moderation  admin pending queue, publish / unpublish, admin listing
+    all         a weighted blend of the above
+
+Results are printed as JSON (throughput, errors by status, p50/p95/p99/max
+overall and per operation, git commit) so runs can be diffed between commits:
+    python benchmarks/loadtest.py --asgi --database-url sqlite:///bench.db \
+        --mix read --concurrency 32 --duration 30 --output results/read.json
+
+Authenticated operations share one token per role (bench-user-0, and
+bench-admin), obtained once before the run, so they measure the endpoints and
+not the login rate limits. The "login" operation itself still logs in every
+time: with --asgi the auth limits are raised for the in-process app (unless
+AUTH_* is set), over HTTP raise AUTH_IP_PER_MINUTE/AUTH_IP_BURST and
+AUTH_EMAIL_PER_MINUTE/AUTH_EMAIL_BURST in the server environment unless 429s
+are the point.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import BENCH_PASSWORD, BENCH_USERS, CATEGORIES  # noqa: E402
+
+SEARCH_TERMS = [
+    "kubernetes", "latence", "postgresql", "cache", "recrutement", "react",
+    "observabilité", "sécurité", "déploie", "performances", "dette", "modèle",
+]
+
+MIXES = {
+    "read": {"list": 45, "list_category": 20, "list_next": 10, "detail": 25},
+    "search": {"search": 80, "detail": 20},
+    "auth": {"login": 30, "me": 50, "my": 20},
+    "moderation": {"pending": 40, "publish": 20, "unpublish": 20, "all": 20},
+    "all": {
+        "list": 30, "list_category": 10, "list_next": 5, "detail": 20,
+        "search": 15, "login": 3, "me": 5, "my": 2, "pending": 4, "publish": 2,
+        "unpublish": 2, "all": 2,
+    },
+}
+
+
+# Operations that need a token, and the accounts whose tokens they share
+AUTHENTICATED_OPS = {"me", "my", "pending", "publish", "unpublish", "all"}
+ROLE_EMAILS = {"user": "bench-user-0@example.com", "admin": "bench-admin@example.com"}
+# Used with --asgi unless set: the in-process app would otherwise rate-limit logins
+ASGI_AUTH_LIMITS = {
+    "AUTH_IP_PER_MINUTE": "1000000", "AUTH_IP_BURST": "1000000",
+    "AUTH_EMAIL_PER_MINUTE": "1000000", "AUTH_EMAIL_BURST": "1000000",
+}
+
+
+async def login_roles(http: httpx.AsyncClient) -> dict:
+    """One token per role, shared by every client"""
+    tokens = {}
+    for role, email in ROLE_EMAILS.items():
+        response = await http.post(
+            "/api/auth/login", json={"email": email, "password": BENCH_PASSWORD}
+        )
+        if not response.is_success:
+            raise SystemExit(f"Login as {email} failed: {response.status_code} {response.text}")
+        tokens[role] = response.json()["access_token"]
+    return tokens
+
+
+class Client:
+    """One simulated user: holds its cursor state, shares the role tokens."""
+
+    def __init__(
+        self, http: httpx.AsyncClient, corpus_size: int, rng: random.Random, tokens: dict
+    ):
+        self.http = http
+        self.corpus_size = corpus_size
+        self.rng = rng
+        self.email = f"bench-user-{rng.randrange(BENCH_USERS)}@example.com"
+        self.tokens = tokens
+        self.next_cursor = None
+
+    def random_slug(self) -> str:
+        return f"article-synthetique-{self.rng.randrange(self.corpus_size)}"
+
+    async def login(self, email: str) -> httpx.Response:
+        return await self.http.post(
+            "/api/auth/login", json={"email": email, "password": BENCH_PASSWORD}
+        )
+
+    def auth_headers(self, admin: bool = False) -> dict:
+        return {"Authorization": f"Bearer {self.tokens['admin' if admin else 'user']}"}
+
+    async def op_list(self):
+        response = await self.http.get("/api/articles")
+        self.next_cursor = response.json().get("next_cursor") if response.is_success else None
+        return response
+
+    async def op_list_category(self):
+        return await self.http.get("/api/articles", params={"category": self.rng.choice(CATEGORIES)})
+
+    async def op_list_next(self):
+        if not self.next_cursor:
+            return await self.op_list()
+        response = await self.http.get("/api/articles", params={"cursor": self.next_cursor})
+        self.next_cursor = response.json().get("next_cursor") if response.is_success else None
+        return response
+
+    async def op_detail(self):
+        return await self.http.get(f"/api/articles/{self.random_slug()}")
+
+    async def op_search(self):
+        q = " ".join(self.rng.sample(SEARCH_TERMS, self.rng.randint(1, 3)))
+        return await self.http.get("/api/articles/search", params={"q": q})
+
+    async def op_login(self):
+        return await self.login(self.email)
+
+    async def op_me(self):
+        return await self.http.get("/api/auth/me", headers=self.auth_headers())
+
+    async def op_my(self):
+        return await self.http.get("/api/articles/my", headers=self.auth_headers())
+
+    async def op_pending(self):
+        return await self.http.get("/api/articles/pending", headers=self.auth_headers(admin=True))
+
+    async def set_status(self, status: str):
+        return await self.http.put(
+            f"/api/articles/{self.random_slug()}/status",
+            json={"status": status},
+            headers=self.auth_headers(admin=True),
+        )
+
+    async def op_publish(self):
+        return await self.set_status("published")
+
+    async def op_unpublish(self):
+        return await self.set_status("pending")
+
+    async def op_all(self):
+        return await self.http.get("/api/articles/all", headers=self.auth_headers(admin=True))
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, statuses, errors, elapsed: float) -> dict:
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "errors": sum(errors.values()),
+        "error_breakdown": dict(errors),
+        "status_codes": {str(code): n for code, n in sorted(statuses.items())},
+        "latency_ms": {
+            "p50": round(percentile(ordered, 50) * 1000, 3),
+            "p95": round(percentile(ordered, 95) * 1000, 3),
+            "p99": round(percentile(ordered, 99) * 1000, 3),
+            "max": round((ordered[-1] if ordered else 0.0) * 1000, 3),
+            "mean": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        },
+    }
+
+
+async def run_client(client: Client, mix: dict, deadline: float, results: dict):
+    ops = list(mix)
+    weights = list(mix.values())
+    while time.perf_counter() < deadline:
+        name = client.rng.choices(ops, weights)[0]
+        started = time.perf_counter()
+        try:
+            response = await getattr(client, f"op_{name}")()
+        except httpx.HTTPError as exc:
+            results[name]["errors"][type(exc).__name__] += 1
+            continue
+        elapsed = time.perf_counter() - started
+        bucket = results[name]
+        bucket["latencies"].append(elapsed)
+        bucket["statuses"][response.status_code] += 1
+        # 404s are expected for detail/moderation on non-published or
+        # re-statused slugs; everything else >= 400 counts as an error.
+        if response.status_code >= 400 and response.status_code != 404:
+            bucket["errors"][f"http_{response.status_code}"] += 1
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def make_transport(args):
+    if not args.asgi:
+        return None
+    os.environ["DATABASE_URL"] = args.database_url
+    for name, value in ASGI_AUTH_LIMITS.items():
+        os.environ.setdefault(name, value)
+    from main import app
+    return httpx.ASGITransport(app=app)
+
+
+async def run(args) -> dict:
+    mix = MIXES[args.mix]
+    transport = make_transport(args)
+    base_url = "http://bench" if transport else args.base_url
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = defaultdict(lambda: {"latencies": [], "statuses": Counter(), "errors": Counter()})
+
+    async with httpx.AsyncClient(
+        base_url=base_url, transport=transport, limits=limits, timeout=args.timeout
+    ) as http:
+        tokens = await login_roles(http) if AUTHENTICATED_OPS & set(mix) else {}
+        clients = [
+            Client(http, args.corpus_size, random.Random(args.seed + i), tokens)
+            for i in range(args.concurrency)
+        ]
+        if args.warmup:
+            warm_deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(*(run_client(c, mix, warm_deadline, defaultdict(
+                lambda: {"latencies": [], "statuses": Counter(), "errors": Counter()})) for c in clients))
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(run_client(c, mix, deadline, results) for c in clients))
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [t for bucket in results.values() for t in bucket["latencies"]]
+    all_statuses = sum((bucket["statuses"] for bucket in results.values()), Counter())
+    all_errors = sum((bucket["errors"] for bucket in results.values()), Counter())
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "target": "asgi" if transport else args.base_url,
+        "database_url": args.database_url if transport else None,
+        "mix": args.mix,
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 3),
+        "corpus_size": args.corpus_size,
+        "overall": summarize(all_latencies, all_statuses, all_errors, elapsed),
+        "operations": {
+            name: summarize(bucket["latencies"], bucket["statuses"], bucket["errors"], elapsed)
+            for name, bucket in sorted(results.items())
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mix", choices=sorted(MIXES), default="read")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds of measured load")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds of unmeasured load first")
+    parser.add_argument("--corpus-size", type=int, default=1000,
+                        help="--size the corpus was built with (used to pick slugs)")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--asgi", action="store_true", help="run the app in-process instead of over HTTP")
+    parser.add_argument("--database-url", default="sqlite:///bench.db", help="with --asgi only")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
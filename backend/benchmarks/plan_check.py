@@ -0,0 +1,153 @@
+"""
+Query-plan regression check for the article endpoints.
+
+Runs each endpoint's real query (through crud / search) against a seeded
+corpus, captures the SQL it sends, and EXPLAINs it. A listing or lookup plan
+that falls back to a sequential scan of articles or sorts rows explicitly
+fails the check; search may sort (by rank) but must not scan the table.
+
+Run from backend/ (exits 1 on a regression):
+    python benchmarks/plan_check.py                      # temporary SQLite
+    python benchmarks/plan_check.py --database-url postgresql://... --size 20000
+A fresh database is seeded with benchmarks/corpus.py; an existing corpus is
+reused as is.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def endpoint_queries(crud, search):
+    """(endpoint, allow_sort, fn(db)) for every read query the API issues"""
+    def with_next_page(**filters):
+        def run(db):
+            page = crud.list_articles(db, None, 20, **filters)
+            if page["next_cursor"]:
+                crud.list_articles(db, page["next_cursor"], 20, **filters)
+        return run
+
+    return [
+        ("GET /api/articles", False, with_next_page(status="published")),
+        ("GET /api/articles?category=", False, with_next_page(status="published", category="CLOUD")),
+        ("GET /api/articles/pending", False, with_next_page(status="pending")),
+        ("GET /api/articles/my", False, with_next_page(author_id=1)),
+        ("GET /api/articles/all", False, with_next_page()),
+        ("GET /api/articles/{slug}", False,
+         lambda db: crud.get_article_by_slug(db, "article-synthetique-1")),
+        ("GET /api/articles/search", True,
+         lambda db: search.search_published(db, "kubernetes latence")),
+    ]
+
+
+def capture_statements(engine, SessionLocal, fn):
+    """Run fn(session) and return the (statement, parameters) it executed"""
+    from sqlalchemy import event
+
+    captured = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before)
+    try:
+        with SessionLocal() as db:
+            fn(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", before)
+    return captured
+
+
+def _postgres_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _postgres_nodes(child)
+
+
+def explain(conn, statement, parameters):
+    """(plan text, problems) for one statement"""
+    if conn.dialect.name == "postgresql":
+        raw = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+        plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+        problems, lines = [], []
+        for node in _postgres_nodes(plan):
+            kind = node["Node Type"]
+            relation = node.get("Relation Name", "")
+            lines.append(f"{kind} {relation} {node.get('Index Name', '')}".strip())
+            if kind == "Seq Scan" and relation == "articles":
+                problems.append("seq scan on articles")
+            elif kind in ("Sort", "Incremental Sort"):
+                problems.append(f"{kind.lower()} on {node.get('Sort Key')}")
+        return "\n".join(lines), problems
+
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+    details = [row[-1] for row in rows]
+    problems = []
+    for detail in details:
+        if detail.startswith("SCAN ") and "USING" not in detail and "VIRTUAL TABLE" not in detail:
+            problems.append(f"full scan: {detail}")
+        elif "TEMP B-TREE" in detail:
+            problems.append(f"sort: {detail}")
+    return "\n".join(details), problems
+
+
+def check_plans(verbose: bool = False) -> list:
+    """EXPLAIN every endpoint query on DATABASE_URL; returns the failures"""
+    import crud
+    import search
+    from database import SessionLocal, engine
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+    failures = []
+    for endpoint, allow_sort, fn in endpoint_queries(crud, search):
+        for statement, parameters in capture_statements(engine, SessionLocal, fn):
+            with engine.connect() as conn:
+                plan, problems = explain(conn, statement, parameters)
+            if allow_sort:
+                problems = [p for p in problems if not p.startswith("sort")]
+            status = "FAIL" if problems else "ok"
+            print(f"[{status}] {endpoint}")
+            if verbose or problems:
+                print("    " + plan.replace("\n", "\n    "))
+            for problem in problems:
+                print(f"    -> {problem}")
+                failures.append((endpoint, problem))
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite file")
+    parser.add_argument("--size", type=int, default=20000, help="corpus size when seeding")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        database_url = f"sqlite:///{tempfile.mkdtemp()}/plan_check.db"
+
+    # Before anything imports database.py
+    os.environ["DATABASE_URL"] = database_url
+    from sqlalchemy import create_engine, inspect, text
+
+    probe = create_engine(database_url)
+    with probe.connect() as conn:
+        seeded = inspect(conn).has_table("articles") and conn.execute(
+            text("SELECT count(*) FROM articles")
+        ).scalar()
+    probe.dispose()
+    if not seeded:
+        from corpus import build_corpus
+        build_corpus(database_url, args.size)
+    else:
+        from database import run_migrations
+        run_migrations(database_url)
+
+    failures = check_plans(args.verbose)
+    print(f"{len(failures)} plan regression(s)")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,127 @@
+"""
+In-process read-through cache for published article reads.
+
+Entries are evicted least-recently-used once the cache is full and expire
+after a TTL, which also bounds staleness when several workers each hold
+their own copy. Write endpoints invalidate exactly the keys they affect.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+ARTICLE_CACHE_SIZE = int(os.getenv("ARTICLE_CACHE_SIZE", "1024"))
+ARTICLE_CACHE_TTL = float(os.getenv("ARTICLE_CACHE_TTL", "300"))
+
+MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry expiry and hit/miss counters"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=MISSING):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def add(self, key, value) -> bool:
+        """Set key unless it holds an unexpired entry; return whether it was set"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] >= time.monotonic():
+                return False
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_where(self, predicate):
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+article_cache = TTLCache(maxsize=ARTICLE_CACHE_SIZE, ttl=ARTICLE_CACHE_TTL)
+
+
+def article_key(slug: str):
+    return ("article", slug)
+
+
+def list_key(category, cursor, limit):
+    """category is None for the global list, an upper-cased category otherwise"""
+    return ("list", category, cursor, limit)
+
+
+def invalidate_article(slug: str, categories=(), published: bool = False):
+    """
+    Drop cached entries affected by a write to one article.
+
+    published must be True when the article was published before or after
+    the write; only then can the published list pages have changed.
+    """
+    invalidate_articles([slug], categories, published)
+
+
+def invalidate_articles(slugs, categories=(), published: bool = False):
+    """invalidate_article for a batch, scanning the list pages once"""
+    for slug in slugs:
+        article_cache.delete(article_key(slug))
+    if published:
+        affected = set(categories)
+        article_cache.delete_where(
+            lambda key: key[0] == "list" and (key[1] is None or key[1] in affected)
+        )
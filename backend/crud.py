@@ -0,0 +1,224 @@
+"""
+Synchronous ORM operations behind the endpoints in main.py.
+
+Every function takes the session as its first argument so main.py can run
+it through database.run_db in either database mode.
+"""
+from datetime import date
+from typing import Dict, List, Optional
+
+from sqlalchemy import Date, bindparam, delete as sql_delete, exists, func, select, text, update
+
+from models import Article, ArticleView, utcnow
+from pagination import SUMMARY_COLUMNS, paginate
+
+# Slugs accepted by one bulk request, and rows touched by one filter request
+MAX_BULK_SLUGS = 1000
+# Slugs accepted by one batch fetch
+MAX_BATCH_SLUGS = 50
+
+
+def get_article_by_slug(db, slug: str) -> Optional[Article]:
+    return db.query(Article).filter(Article.slug == slug).first()
+
+
+def get_articles_by_slugs(db, slugs: List[str], summary: bool = False) -> list:
+    """Articles (or summary rows) for slugs, in no particular order, one query"""
+    query = db.query(*SUMMARY_COLUMNS) if summary else db.query(Article)
+    return query.filter(Article.slug.in_(slugs)).all()
+
+
+def list_articles(
+    db,
+    cursor: Optional[str],
+    limit: int,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    author_id: Optional[int] = None
+) -> dict:
+    """One page of article summaries matching the given filters"""
+    query = db.query(*SUMMARY_COLUMNS)
+    if status:
+        query = query.filter(Article.status == status)
+    if category:
+        query = query.filter(Article.category == category)
+    if author_id is not None:
+        query = query.filter(Article.author_id == author_id)
+    return paginate(query, cursor, limit)
+
+
+def count_articles(db) -> int:
+    return db.query(Article).count()
+
+
+def count_by_status_category(db) -> list:
+    """(status, category, count) for every combination in use"""
+    return db.query(Article.status, Article.category, func.count()).group_by(
+        Article.status, Article.category
+    ).all()
+
+
+def related_rows(db, slugs: Optional[List[str]] = None):
+    """
+    Summary rows plus content of published articles (all of them, streamed,
+    when slugs is None), for building related-article vectors
+    """
+    query = db.query(*SUMMARY_COLUMNS, Article.content).filter(Article.status == "published")
+    if slugs is None:
+        return query.yield_per(1000)
+    return query.filter(Article.slug.in_(slugs)).all()
+
+
+def published_summaries(db, category: Optional[str] = None) -> list:
+    """Every published summary (of one category), newest first"""
+    query = db.query(*SUMMARY_COLUMNS).filter(Article.status == "published")
+    if category:
+        query = query.filter(Article.category == category)
+    return query.order_by(Article.date.desc(), Article.id.desc()).all()
+
+
+def published_articles(db, slugs: Optional[List[str]] = None):
+    """Published articles (all of them, streamed, when slugs is None)"""
+    query = db.query(Article).filter(Article.status == "published")
+    if slugs is None:
+        return query.yield_per(500)
+    return query.filter(Article.slug.in_(slugs)).all()
+
+
+FEED_COLUMNS = (
+    Article.id, Article.slug, Article.title, Article.excerpt, Article.author,
+    Article.category, Article.date, Article.updated_at,
+)
+
+
+def feed_rows(db, slugs: Optional[List[str]] = None) -> list:
+    """Feed and sitemap fields of published articles (all, or just slugs)"""
+    query = db.query(*FEED_COLUMNS).filter(Article.status == "published")
+    if slugs is not None:
+        query = query.filter(Article.slug.in_(slugs))
+    return query.all()
+
+
+_RECORD_VIEWS = text(
+    "INSERT INTO article_views (article_id, day, views) "
+    "SELECT id, :day, :views FROM articles WHERE slug = :slug "
+    "ON CONFLICT (article_id, day) DO UPDATE SET views = article_views.views + excluded.views"
+).bindparams(bindparam("day", type_=Date))
+
+
+def record_views(db, counts: Dict[str, int], day: date):
+    """Add counts (slug -> views) to day's rows in one batched upsert"""
+    db.execute(_RECORD_VIEWS, [
+        {"slug": slug, "day": day, "views": views} for slug, views in counts.items()
+    ])
+    db.commit()
+
+
+def views_since(db, since: date) -> list:
+    """(slug, day, views) rows of published articles from since onwards"""
+    return db.query(Article.slug, ArticleView.day, ArticleView.views).join(
+        Article, Article.id == ArticleView.article_id
+    ).filter(ArticleView.day >= since, Article.status == "published").all()
+
+
+def add(db, obj):
+    db.add(obj)
+    db.commit()
+    db.refresh(obj)
+    return obj
+
+
+def add_all(db, objs):
+    db.add_all(objs)
+    db.commit()
+
+
+def save(db, obj):
+    """Commit pending changes to obj and reload it"""
+    db.commit()
+    db.refresh(obj)
+    return obj
+
+
+def delete(db, obj):
+    db.delete(obj)
+    db.commit()
+
+
+def _filter_conditions(filters) -> list:
+    conditions = []
+    if filters.status:
+        conditions.append(Article.status == filters.status)
+    if filters.category:
+        conditions.append(Article.category == filters.category)
+    if filters.author_id is not None:
+        conditions.append(Article.author_id == filters.author_id)
+    if filters.date_before:
+        conditions.append(Article.date < filters.date_before)
+    return conditions
+
+
+def _selection(slugs: Optional[List[str]], filters, *extra) -> list:
+    """
+    WHERE clauses for a bulk operation: explicit slugs, or the first
+    MAX_BULK_SLUGS articles (by id) matching an ArticleFilter and extra.
+    """
+    if slugs is not None:
+        return [Article.slug.in_(slugs), *extra]
+    conditions = [*_filter_conditions(filters), *extra]
+    batch = select(Article.id).where(*conditions).order_by(Article.id).limit(MAX_BULK_SLUGS)
+    return [Article.id.in_(batch)]
+
+
+def _has_more(db, slugs, filters, rows, *extra) -> bool:
+    """Whether a filter request left matching rows behind the batch cap"""
+    if slugs is not None or len(rows) < MAX_BULK_SLUGS:
+        return False
+    return db.scalar(select(exists().where(*_filter_conditions(filters), *extra)))
+
+
+def bulk_update_status(db, status: str, slugs: Optional[List[str]] = None, filters=None):
+    """
+    Move every selected article to status with one UPDATE ... RETURNING.
+
+    A filter changes at most MAX_BULK_SLUGS articles per call. Returns the
+    (slug, category) rows that changed; when slugs were given, the subset
+    of the others that exist but already had the status; and whether
+    matching articles remain (changed rows no longer match, so repeating
+    the call moves on to them).
+    """
+    statement = (
+        update(Article)
+        .where(*_selection(slugs, filters, Article.status != status))
+        .values(status=status, updated_at=utcnow())
+        .returning(Article.slug, Article.category)
+        .execution_options(synchronize_session=False)
+    )
+    changed = db.execute(statement).all()
+    unchanged = set()
+    if slugs:
+        changed_slugs = {row.slug for row in changed}
+        rest = [slug for slug in slugs if slug not in changed_slugs]
+        if rest:
+            unchanged = set(db.scalars(select(Article.slug).where(Article.slug.in_(rest))))
+    has_more = _has_more(db, slugs, filters, changed, Article.status != status)
+    db.commit()
+    return changed, unchanged, has_more
+
+
+def bulk_delete(db, slugs: Optional[List[str]] = None, filters=None):
+    """
+    Delete every selected article with one DELETE ... RETURNING; a filter
+    deletes at most MAX_BULK_SLUGS articles per call. Returns the deleted
+    rows and whether matching articles remain.
+    """
+    statement = (
+        sql_delete(Article)
+        .where(*_selection(slugs, filters))
+        .returning(Article.slug, Article.category, Article.status)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = db.execute(statement).all()
+    has_more = _has_more(db, slugs, filters, deleted)
+    db.commit()
+    return deleted, has_more
@@ -0,0 +1,190 @@
+"""
+Opt-in SQL diagnostics: slow-query log with EXPLAIN plans and N+1 detection.
+
+Enable with SQL_DIAGNOSTICS=true. Statements slower than SLOW_QUERY_MS are
+logged with their plan, and a request that runs the same statement shape more
+than N_PLUS_ONE_THRESHOLD times is flagged, which is what a lazy
+relationship (Article.user, User.articles) loaded per row looks like.
+
+assert_max_queries() is meant for tests and works whether or not the mode is
+enabled:
+
+    with assert_max_queries(2):
+        client.get("/api/articles/some-slug")
+"""
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger("sql.diagnostics")
+
+SQL_DIAGNOSTICS = os.getenv("SQL_DIAGNOSTICS", "false").lower() in ("1", "true", "yes")
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+# Placeholder styles: qmark (sqlite), pyformat (psycopg2), numeric (asyncpg)
+_PLACEHOLDER_LIST = re.compile(
+    r"\(\s*(?:\?|%\(\w+\)s|\$\d+)(?:\s*,\s*(?:\?|%\(\w+\)s|\$\d+))*\s*\)"
+)
+_PARAM_NAME = re.compile(r"%\(\w+\)s")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so repeats with different parameters compare equal"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _PARAM_NAME.sub("?", shape)
+
+
+class QueryRecorder:
+    """Statements seen while active, in execution order"""
+
+    def __init__(self):
+        self.statements: List[str] = []
+        self._lock = threading.Lock()
+
+    def record(self, statement: str):
+        with self._lock:
+            self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int):
+        """(shape, count) for shapes run more than threshold times, worst first"""
+        counts = Counter(statement_shape(s) for s in self.statements)
+        return [(shape, n) for shape, n in counts.most_common() if n > threshold]
+
+
+# Recorder for the request being served (set by the middleware)
+_request_recorder: ContextVar[Optional[QueryRecorder]] = ContextVar("request_recorder", default=None)
+# Recorders that see every statement, from any thread (test helper)
+_global_recorders: List[QueryRecorder] = []
+_instrumented = set()
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    """Plan for statement, fetched on a raw cursor so no events fire"""
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join(" ".join(str(col) for col in row) for row in cursor.fetchall())
+    except Exception as exc:  # the plan is best effort; never fail the query
+        return f"(EXPLAIN failed: {exc})"
+    finally:
+        cursor.close()
+
+
+def install(engine):
+    """Attach the recording and slow-query listeners to engine (idempotent)"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if id(sync_engine) in _instrumented:
+        return
+    _instrumented.add(id(sync_engine))
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("diagnostics_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["diagnostics_start"].pop()) * 1000
+        recorder = _request_recorder.get()
+        if recorder is not None:
+            recorder.record(statement)
+        for recorder in _global_recorders:
+            recorder.record(statement)
+
+        if SQL_DIAGNOSTICS and elapsed_ms >= SLOW_QUERY_MS:
+            plan = ""
+            if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH")):
+                plan = _explain(conn, statement, parameters)
+            logger.warning(
+                "Slow query (%.1f ms): %s\nParameters: %r\nPlan:\n%s",
+                elapsed_ms, statement, parameters, plan or "(not explained)"
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        starts = context.connection.info.get("diagnostics_start") if context.connection else None
+        if starts:
+            starts.pop()
+
+
+def _install_default_engines():
+    from database import engine, async_engine
+
+    install(engine)
+    if async_engine is not None:
+        install(async_engine)
+
+
+@contextmanager
+def record_queries():
+    """Record every statement run on the app's engines while the block runs"""
+    _install_default_engines()
+    recorder = QueryRecorder()
+    _global_recorders.append(recorder)
+    try:
+        yield recorder
+    finally:
+        _global_recorders.remove(recorder)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, max_repeats: Optional[int] = None):
+    """
+    Fail if the block runs more than max_queries statements, or (when given)
+    any single statement shape more than max_repeats times.
+    """
+    with record_queries() as recorder:
+        yield recorder
+    if recorder.count > max_queries:
+        listing = "\n".join(f"  {i + 1}. {s}" for i, s in enumerate(recorder.statements))
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, {recorder.count} were run:\n{listing}"
+        )
+    if max_repeats is not None:
+        repeated = recorder.repeated(max_repeats)
+        if repeated:
+            shape, count = repeated[0]
+            raise AssertionError(
+                f"Statement repeated {count} times (limit {max_repeats}): {shape}"
+            )
+
+
+class QueryDiagnosticsMiddleware:
+    """Pure ASGI middleware flagging requests that repeat a statement shape"""
+
+    def __init__(self, app, threshold: int = N_PLUS_ONE_THRESHOLD):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        recorder = QueryRecorder()
+        token = _request_recorder.set(recorder)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_recorder.reset(token)
+            route = getattr(scope.get("route"), "path", scope["path"])
+            for shape, count in recorder.repeated(self.threshold):
+                logger.warning(
+                    "Possible N+1 on %s %s: %d runs of %s",
+                    scope["method"], route, count, shape
+                )
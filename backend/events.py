@@ -0,0 +1,151 @@
+"""
+In-process event bus for article changes, streamed to admins over SSE.
+
+The write endpoints in main.py publish one event per change:
+
+    article.created   summary of the new article
+    article.updated   summary, plus previous status and category
+    article.status    summary (or slug/category for bulk), plus previous status
+    article.deleted   slug, category and status of the removed article
+    articles.imported count of rows inserted by an NDJSON import
+
+Consumers either subscribe a callback (called synchronously on publish, for
+in-memory derived state) or open a Subscription (a bounded queue read by the
+SSE endpoint). Recent events are kept so a reconnecting EventSource resumes
+from Last-Event-ID; a client that fell too far behind gets a "resync" event
+and should refetch its lists.
+
+The bus lives in one process: with several workers, each one only sees the
+writes it served.
+"""
+import asyncio
+import itertools
+import os
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from serialization import dumps
+
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "256"))
+EVENT_HISTORY_SIZE = int(os.getenv("EVENT_HISTORY_SIZE", "1000"))
+# Comment line sent on idle streams so proxies keep the connection open
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
+
+class Event:
+    __slots__ = ("id", "type", "data")
+
+    def __init__(self, id: int, type: str, data: Dict[str, Any]):
+        self.id = id
+        self.type = type
+        self.data = data
+
+    def to_sse(self) -> bytes:
+        return b"id: %d\nevent: %s\ndata: %s\n\n" % (
+            self.id, self.type.encode(), dumps(self.data)
+        )
+
+
+RESYNC = "resync"
+
+
+class Subscription:
+    """Bounded queue of events for one stream consumer"""
+
+    def __init__(self, bus: "EventBus", maxsize: int):
+        self._bus = bus
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    def _offer(self, event: Event):
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow to keep up: drop the backlog, ask the client to refetch
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(Event(event.id, RESYNC, {}))
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """Next event, or None after timeout seconds without one"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self._bus._subscriptions.discard(self)
+
+
+class EventBus:
+    """
+    Fan-out of article events. publish() must be called from the event loop
+    thread (the async endpoints), as subscription queues are asyncio queues.
+    """
+
+    def __init__(self, history_size: int = EVENT_HISTORY_SIZE):
+        self._ids = itertools.count(1)
+        self._history: deque = deque(maxlen=history_size)
+        self._subscriptions = set()
+        self._callbacks: List[Callable[[Event], None]] = []
+        self.published = 0
+
+    def subscribe(self, maxsize: int = EVENT_QUEUE_SIZE) -> Subscription:
+        subscription = Subscription(self, maxsize)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def add_listener(self, callback: Callable[[Event], None]):
+        """Call callback(event) synchronously for every published event"""
+        self._callbacks.append(callback)
+
+    def publish(self, type: str, data: Dict[str, Any]) -> Event:
+        event = Event(next(self._ids), type, data)
+        self._history.append(event)
+        self.published += 1
+        for callback in self._callbacks:
+            callback(event)
+        for subscription in list(self._subscriptions):
+            subscription._offer(event)
+        return event
+
+    @property
+    def last_id(self) -> int:
+        return self._history[-1].id if self._history else 0
+
+    def replay(self, last_event_id: int) -> Optional[List[Event]]:
+        """Events after last_event_id, or None when they are no longer kept"""
+        if self._history and self._history[0].id > last_event_id + 1:
+            return None
+        if last_event_id > self.last_id:  # id from before a restart
+            return None
+        return [event for event in self._history if event.id > last_event_id]
+
+    def stats(self) -> dict:
+        return {
+            "published": self.published,
+            "subscribers": len(self._subscriptions),
+            "listeners": len(self._callbacks),
+            "history": len(self._history),
+        }
+
+
+bus = EventBus()
+
+
+async def sse_stream(subscription: Subscription, backlog: Optional[List[Event]], resync_id: int):
+    """
+    Body of a text/event-stream response: the replayed backlog (or a resync
+    when it is gone), then live events with keepalive comments in between.
+    """
+    try:
+        yield b"retry: 3000\n\n"
+        if backlog is None:
+            yield Event(resync_id, RESYNC, {}).to_sse()
+        else:
+            for event in backlog:
+                yield event.to_sse()
+        while True:
+            event = await subscription.get(SSE_KEEPALIVE_SECONDS)
+            yield b": keepalive\n\n" if event is None else event.to_sse()
+    finally:
+        subscription.close()
@@ -0,0 +1,100 @@
+"""
+Article counts per status and category, served from memory.
+
+Counts are loaded with one GROUP BY, then kept current by the article
+events the write endpoints publish (events.py). They are recounted from the
+database on the next read once FACETS_RECONCILE_SECONDS have passed, or as
+soon as an event cannot be applied exactly (bulk status changes do not know
+the previous status; imports only report a total), which also picks up
+writes made outside this process.
+"""
+import os
+import time
+from collections import Counter
+from typing import Optional
+
+from events import Event, bus
+
+FACETS_RECONCILE_SECONDS = float(os.getenv("FACETS_RECONCILE_SECONDS", "300"))
+
+
+class FacetCounts:
+    def __init__(self, reconcile_seconds: float = FACETS_RECONCILE_SECONDS):
+        self.reconcile_seconds = reconcile_seconds
+        # (status, category) -> number of articles
+        self._counts: Counter = Counter()
+        self._loaded_at: Optional[float] = None
+        self._dirty = False
+        # Bumped by every applied event, to spot events racing a recount
+        self._generation = 0
+        self.reconciled_at: Optional[float] = None
+
+    def needs_reconcile(self) -> bool:
+        return (
+            self._loaded_at is None
+            or self._dirty
+            or time.monotonic() - self._loaded_at >= self.reconcile_seconds
+        )
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def load(self, rows, generation: int):
+        """Replace the counts with (status, category, count) rows"""
+        self._counts = Counter({(status, category): count for status, category, count in rows})
+        self._loaded_at = time.monotonic()
+        self.reconciled_at = time.time()
+        # An event applied while the query ran may or may not be in it
+        self._dirty = generation != self._generation
+
+    def _move(self, key, delta: int):
+        self._counts[key] += delta
+        if self._counts[key] <= 0:
+            if self._counts[key] < 0:
+                self._dirty = True
+            del self._counts[key]
+
+    def apply(self, event: Event):
+        """Bus listener: adjust the counts for one article change"""
+        self._generation += 1
+        if self._loaded_at is None:
+            return
+        data = event.data
+        if event.type == "article.created":
+            self._move((data["status"], data["category"]), 1)
+        elif event.type == "article.deleted":
+            self._move((data["status"], data["category"]), -1)
+        elif event.type in ("article.status", "article.updated"):
+            previous_status = data.get("previous_status")
+            if previous_status is None:
+                self._dirty = True
+                return
+            previous_category = data.get("previous_category", data["category"])
+            self._move((previous_status, previous_category), -1)
+            self._move((data["status"], data["category"]), 1)
+        elif event.type == "articles.imported":
+            self._dirty = True
+
+    def snapshot(self, statuses=None) -> dict:
+        """Totals by status, by category and by both, limited to statuses if given"""
+        by_status: Counter = Counter()
+        by_category: Counter = Counter()
+        by_both = {}
+        for (status, category), count in self._counts.items():
+            if statuses is not None and status not in statuses:
+                continue
+            by_status[status] += count
+            by_category[category] += count
+            by_both.setdefault(category, {})[status] = count
+        return {
+            "total": sum(by_status.values()),
+            "statuses": dict(sorted(by_status.items())),
+            "categories": dict(sorted(by_category.items())),
+            "by_category": dict(sorted(by_both.items())),
+            "reconciled_at": self.reconciled_at,
+        }
+
+
+facet_counts = FacetCounts()
+bus.add_listener(facet_counts.apply)
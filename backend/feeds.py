@@ -0,0 +1,350 @@
+"""
+RSS 2.0 and Atom feeds (global and per category) and the XML sitemap.
+
+Documents are built from an in-memory projection of the published articles
+(feed fields only, never bodies), loaded with one query and then kept
+current by the article events the write endpoints publish (events.py):
+single-article events carry the fields themselves, bulk status changes are
+refetched by slug. Each document is cached as bytes with an ETag, and a
+change only drops the documents it can affect (the global ones, its
+categories, the sitemap), so polling readers and crawlers get 304s or
+cached bytes until the published set actually changes.
+
+The projection is reloaded on the first request once FEEDS_RELOAD_SECONDS
+have passed, which picks up writes made outside this process (CLI imports,
+seed.py, other instances); documents are only dropped if it changed.
+"""
+import heapq
+import os
+import threading
+from datetime import date, datetime, time, timezone
+from email.utils import format_datetime
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+import crud
+from events import Event, bus
+from http_cache import CachedBody, as_utc
+from models import utcnow
+
+# Public site the links point to, and the API serving the feeds themselves
+SITE_URL = os.getenv("SITE_URL", os.getenv("FRONTEND_URL", "http://localhost:5173")).rstrip("/")
+API_URL = os.getenv("API_URL", "http://localhost:8000").rstrip("/")
+SITE_TITLE = os.getenv("SITE_TITLE", "Dev Stories")
+FEED_SIZE = int(os.getenv("FEED_SIZE", "50"))
+FEEDS_RELOAD_SECONDS = float(os.getenv("FEEDS_RELOAD_SECONDS", "300"))
+# Sitemaps hold at most 50,000 URLs; beyond that /sitemap.xml is an index
+SITEMAP_MAX_URLS = 50000
+
+RSS_MEDIA_TYPE = "application/rss+xml; charset=utf-8"
+ATOM_MEDIA_TYPE = "application/atom+xml; charset=utf-8"
+XML_MEDIA_TYPE = "application/xml; charset=utf-8"
+
+SITEMAP = "sitemap"
+
+
+def article_url(slug: str) -> str:
+    return f"{SITE_URL}/article/{slug}"
+
+
+def category_url(category: Optional[str]) -> str:
+    return f"{SITE_URL}/category/{category.lower()}" if category else f"{SITE_URL}/"
+
+
+def feed_path(kind: str, category: Optional[str]) -> str:
+    return f"/api/feeds/{category.lower()}/{kind}.xml" if category else f"/api/feeds/{kind}.xml"
+
+
+def _published_at(entry: dict) -> datetime:
+    return datetime.combine(entry["date"], time(), tzinfo=timezone.utc)
+
+
+def _updated_at(entry: dict) -> datetime:
+    return as_utc(entry["updated_at"]) if entry["updated_at"] else _published_at(entry)
+
+
+def _iso(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _entry(row) -> dict:
+    """Projection entry from a crud.feed_rows row or an event payload"""
+    data = row if isinstance(row, dict) else row._asdict()
+    entry = {column.key: data.get(column.key) for column in crud.FEED_COLUMNS}
+    # Event payloads are JSON-ready: dates arrive as ISO strings
+    if isinstance(entry["date"], str):
+        entry["date"] = date.fromisoformat(entry["date"])
+    if isinstance(entry["updated_at"], str):
+        entry["updated_at"] = datetime.fromisoformat(entry["updated_at"])
+    return entry
+
+
+def render_rss(entries: List[dict], category: Optional[str]) -> bytes:
+    title = f"{SITE_TITLE} - {category}" if category else SITE_TITLE
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>',
+        f"<title>{escape(title)}</title>",
+        f"<link>{escape(category_url(category))}</link>",
+        f"<description>{escape(title)}</description>",
+        f'<atom:link href={quoteattr(API_URL + feed_path("rss", category))} '
+        'rel="self" type="application/rss+xml"/>',
+    ]
+    if entries:
+        built = max(map(_updated_at, entries))
+        parts.append(f"<lastBuildDate>{format_datetime(built, usegmt=True)}</lastBuildDate>")
+    for entry in entries:
+        url = escape(article_url(entry["slug"]))
+        parts.append(
+            f"<item><title>{escape(entry['title'])}</title><link>{url}</link>"
+            f'<guid isPermaLink="true">{url}</guid>'
+            f"<pubDate>{format_datetime(_published_at(entry), usegmt=True)}</pubDate>"
+            f"<category>{escape(entry['category'])}</category>"
+            f"<description>{escape(entry['excerpt'] or '')}</description></item>"
+        )
+    parts.append("</channel></rss>\n")
+    return "".join(parts).encode()
+
+
+def render_atom(entries: List[dict], category: Optional[str]) -> bytes:
+    title = f"{SITE_TITLE} - {category}" if category else SITE_TITLE
+    updated = max(map(_updated_at, entries)) if entries else utcnow()
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="http://www.w3.org/2005/Atom">',
+        f"<id>{escape(category_url(category))}</id>",
+        f"<title>{escape(title)}</title>",
+        f"<updated>{_iso(updated)}</updated>",
+        f"<link href={quoteattr(category_url(category))}/>",
+        f'<link rel="self" href={quoteattr(API_URL + feed_path("atom", category))}/>',
+    ]
+    for entry in entries:
+        url = escape(article_url(entry["slug"]))
+        parts.append(
+            f"<entry><id>{url}</id><title>{escape(entry['title'])}</title>"
+            f'<link href="{url}"/>'
+            f"<published>{_iso(_published_at(entry))}</published>"
+            f"<updated>{_iso(_updated_at(entry))}</updated>"
+            f"<author><name>{escape(entry['author'] or SITE_TITLE)}</name></author>"
+            f"<category term={quoteattr(entry['category'])}/>"
+            f"<summary>{escape(entry['excerpt'] or '')}</summary></entry>"
+        )
+    parts.append("</feed>\n")
+    return "".join(parts).encode()
+
+
+def render_sitemap(entries: List[dict], categories: List[str]) -> bytes:
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+    ]
+    parts.extend(f"<url><loc>{escape(category_url(c))}</loc></url>" for c in [None, *categories])
+    parts.extend(
+        f"<url><loc>{escape(article_url(entry['slug']))}</loc>"
+        f"<lastmod>{_iso(_updated_at(entry))}</lastmod></url>"
+        for entry in entries
+    )
+    parts.append("</urlset>\n")
+    return "".join(parts).encode()
+
+
+def render_sitemap_index(pages: int) -> bytes:
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+    ]
+    parts.extend(
+        f"<sitemap><loc>{escape(f'{API_URL}/sitemap-{page}.xml')}</loc></sitemap>"
+        for page in range(1, pages + 1)
+    )
+    parts.append("</sitemapindex>\n")
+    return "".join(parts).encode()
+
+
+class FeedCache:
+    """
+    Published-article projection plus the rendered documents, keyed by
+    ("rss" | "atom", category or None) and (SITEMAP, page; 0 for the root).
+    """
+
+    def __init__(self, size: int = FEED_SIZE, reload_seconds: float = FEEDS_RELOAD_SECONDS):
+        self.size = size
+        self.reload_seconds = reload_seconds
+        self._entries: Dict[str, dict] = {}
+        self._documents: Dict[Tuple[str, object], CachedBody] = {}
+        self._stale = set()
+        self._loaded_at: Optional[float] = None
+        self._reload_requested = False
+        # Bumped by every change, so a render that raced one is not cached
+        self._version = 0
+        # Single-article events seen while a load runs, replayed after it
+        self._replay: Optional[List[Event]] = None
+        # _lock guards the state above; _refresh_lock serializes database reads
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.builds = 0
+
+    def _forget(self, *categories):
+        """Drop the documents a change in these categories affects"""
+        self._version += 1
+        for key in list(self._documents):
+            kind, scope = key
+            if kind == SITEMAP or scope is None or scope in categories:
+                del self._documents[key]
+
+    def _put(self, entry: dict):
+        previous = self._entries.get(entry["slug"])
+        self._entries[entry["slug"]] = entry
+        self._forget(entry["category"], previous and previous["category"])
+
+    def _remove(self, slug: str):
+        previous = self._entries.pop(slug, None)
+        if previous is not None:
+            self._forget(previous["category"])
+
+    def apply(self, event: Event):
+        """Bus listener: keep the projection in step with published changes"""
+        data = event.data
+        with self._lock:
+            if event.type == "articles.imported":
+                self._reload_requested = True
+                self._version += 1
+                self._documents.clear()
+                return
+            if event.type == "article.deleted":
+                self._remove(data["slug"])
+            elif "title" not in data:
+                # Bulk status change: slug, category and status only
+                if data["status"] == "published":
+                    self._stale.add(data["slug"])
+                    self._forget(data["category"])
+                else:
+                    self._remove(data["slug"])
+                return
+            elif data["status"] == "published":
+                self._put(_entry(data))
+            else:
+                self._remove(data["slug"])
+            if self._replay is not None:
+                self._replay.append(event)
+
+    def needs_reload(self) -> bool:
+        return (
+            self._loaded_at is None
+            or self._reload_requested
+            or monotonic() - self._loaded_at >= self.reload_seconds
+        )
+
+    def cached(self, key) -> Optional[CachedBody]:
+        """The rendered document, if current"""
+        if self.needs_reload():
+            return None
+        return self._documents.get(key)
+
+    def _refresh(self, session_factory):
+        """Load the projection if needed and refetch stale slugs (worker thread)"""
+        with self._refresh_lock:
+            if self.needs_reload():
+                with self._lock:
+                    self._reload_requested = False
+                    self._replay = []
+                    self._stale.clear()
+                try:
+                    with session_factory() as db:
+                        rows = crud.feed_rows(db)
+                except Exception:
+                    with self._lock:
+                        self._replay = None
+                        self._reload_requested = True
+                    raise
+                entries = {row.slug: _entry(row) for row in rows}
+                with self._lock:
+                    replay, self._replay = self._replay, None
+                    if entries != self._entries:
+                        self._entries = entries
+                        self._version += 1
+                        self._documents.clear()
+                    self._loaded_at = monotonic()
+                for event in replay:
+                    self.apply(event)
+
+            with self._lock:
+                stale, self._stale = self._stale, set()
+            if stale:
+                try:
+                    with session_factory() as db:
+                        rows = crud.feed_rows(db, list(stale))
+                except Exception:
+                    with self._lock:
+                        self._stale |= stale
+                    raise
+                with self._lock:
+                    found = {row.slug: row for row in rows}
+                    for slug in stale:
+                        if slug in found:
+                            self._put(_entry(found[slug]))
+                        else:
+                            self._remove(slug)
+
+    def build(self, session_factory, key) -> Optional[CachedBody]:
+        """Render (and cache) a document; None when it does not exist (worker thread)"""
+        self._refresh(session_factory)
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                return document
+            version = self._version
+            entries = list(self._entries.values())
+
+        # Rendered outside the lock so events are not held up meanwhile
+        kind, scope = key
+        categories = sorted({entry["category"] for entry in entries})
+        if kind == SITEMAP:
+            body, media_type = self._render_sitemap(entries, scope, categories)
+            if body is None:
+                return None
+        elif scope is not None and scope not in categories:
+            return None
+        elif kind == "rss":
+            body, media_type = render_rss(self._newest(entries, scope), scope), RSS_MEDIA_TYPE
+        else:
+            body, media_type = render_atom(self._newest(entries, scope), scope), ATOM_MEDIA_TYPE
+        # Removals do not show in the entries' dates: the document is only
+        # known to be unchanged since it was rendered
+        document = CachedBody(body, last_modified=utcnow(), media_type=media_type)
+        with self._lock:
+            self.builds += 1
+            if self._version == version:
+                self._documents[key] = document
+        return document
+
+    def _newest(self, entries: List[dict], category: Optional[str]) -> List[dict]:
+        if category:
+            entries = [entry for entry in entries if entry["category"] == category]
+        return heapq.nlargest(self.size, entries, key=lambda entry: (entry["date"], entry["id"]))
+
+    @staticmethod
+    def _render_sitemap(entries: List[dict], page: int, categories: List[str]):
+        entries = sorted(entries, key=lambda entry: entry["id"])
+        pages = max(1, -(-len(entries) // SITEMAP_MAX_URLS))
+        if page == 0:
+            if pages == 1:
+                return render_sitemap(entries, categories), XML_MEDIA_TYPE
+            return render_sitemap_index(pages), XML_MEDIA_TYPE
+        if pages == 1 or page > pages:
+            return None, None
+        chunk = entries[(page - 1) * SITEMAP_MAX_URLS:page * SITEMAP_MAX_URLS]
+        return render_sitemap(chunk, categories if page == 1 else []), XML_MEDIA_TYPE
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "articles": len(self._entries),
+                "documents": len(self._documents),
+                "stale": len(self._stale),
+                "builds": self.builds,
+            }
+
+
+feed_cache = FeedCache()
+bus.add_listener(feed_cache.apply)
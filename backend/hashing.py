@@ -0,0 +1,118 @@
+"""
+Password hashing on a dedicated, size-limited process pool.
+
+bcrypt burns 100-300 ms of CPU per call while holding the GIL, so running it
+in the API process stalls every other request. Calls are sent to worker
+processes instead, and once PASSWORD_POOL_MAX_PENDING calls are in flight new
+ones fail fast with PoolSaturated rather than queueing without bound.
+
+This module is imported by the worker processes, keep its imports light.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from passlib.context import CryptContext
+
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", "2"))
+PASSWORD_POOL_MAX_PENDING = int(os.getenv("PASSWORD_POOL_MAX_PENDING", "16"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def get_password_hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+class PoolSaturated(Exception):
+    """Raised when too many hashing calls are already in flight"""
+
+
+_executor = None
+_lock = threading.Lock()
+_pending = 0
+_stats = {"calls": 0, "rejected": 0, "max_pending": 0}
+# Recent call latencies (queue wait + hashing), for percentiles
+_latencies = deque(maxlen=1000)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            # spawn: forking a process that already runs threads is unsafe
+            _executor = ProcessPoolExecutor(
+                max_workers=PASSWORD_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+async def _submit(fn, *args):
+    global _pending
+    with _lock:
+        if _pending >= PASSWORD_POOL_MAX_PENDING:
+            _stats["rejected"] += 1
+            raise PoolSaturated()
+        _pending += 1
+        _stats["max_pending"] = max(_stats["max_pending"], _pending)
+
+    executor = _get_executor()
+    start = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            _pending -= 1
+            _stats["calls"] += 1
+            _latencies.append(elapsed)
+
+
+async def hash_password(password: str) -> str:
+    return await _submit(get_password_hash, password)
+
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    return await _submit(verify_password, plain_password, hashed_password)
+
+
+def shutdown():
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def stats() -> dict:
+    with _lock:
+        latencies = sorted(_latencies)
+        pending = _pending
+        counters = dict(_stats)
+
+    def percentile(p):
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+    return {
+        "workers": PASSWORD_POOL_WORKERS,
+        "max_pending_allowed": PASSWORD_POOL_MAX_PENDING,
+        "queue_depth": pending,
+        **counters,
+        "latency_ms": {
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "max": latencies[-1] * 1000 if latencies else 0.0,
+        },
+    }
@@ -0,0 +1,120 @@
+"""
+HTTP conditional GET support for cacheable JSON responses.
+
+Bodies are serialized once into a CachedBody carrying a strong ETag (a hash
+of the exact bytes) and a Last-Modified date. Requests whose If-None-Match
+or If-Modified-Since validators still match get an empty 304. Compressed
+variants are produced on first use and kept on the CachedBody, each with its
+own ETag as required for distinct representations.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+from compression import COMPRESSION_MIN_SIZE, choose_encoding, compress
+
+# Published lists and feeds: let browsers and CDNs reuse them briefly, then revalidate
+PUBLIC_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+# Published articles: storable anywhere, but revalidated on every use (a
+# cheap 304 by ETag) so an author never reads back an older version
+ARTICLE_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+# Unpublished content: always revalidate, never store in shared caches
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything we store is UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def make_digest(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{make_digest(body)}"'
+
+
+class CachedBody:
+    """A serialized response body with its validators and compressed variants"""
+
+    __slots__ = (
+        "body", "digest", "etag", "last_modified", "cache_control", "media_type", "_encoded"
+    )
+
+    def __init__(
+        self,
+        body: bytes,
+        last_modified: Optional[datetime] = None,
+        cache_control: str = PUBLIC_CACHE_CONTROL,
+        media_type: str = "application/json"
+    ):
+        self.body = body
+        self.digest = make_digest(body)
+        self.etag = f'"{self.digest}"'
+        self.last_modified = as_utc(last_modified) if last_modified else None
+        self.cache_control = cache_control
+        self.media_type = media_type
+        self._encoded = {}
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        return f'"{self.digest}-{encoding}"' if encoding else self.etag
+
+    def encoded(self, encoding: str) -> bytes:
+        body = self._encoded.get(encoding)
+        if body is None:
+            # Two concurrent misses both compress; the result is identical
+            body = self._encoded[encoding] = compress(self.body, encoding, static=True)
+        return body
+
+
+def _tag_digest(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    return tag.strip('"').rsplit("-", 1)[0]
+
+
+def is_not_modified(request: Request, cached: CachedBody) -> bool:
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Any encoding of the same body is still current
+        tags = if_none_match.split(",")
+        return any(tag.strip() == "*" or _tag_digest(tag) == cached.digest for tag in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and cached.last_modified:
+        try:
+            since = as_utc(parsedate_to_datetime(if_modified_since))
+        except (TypeError, ValueError):
+            return False
+        return cached.last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def conditional_response(request: Request, cached: CachedBody) -> Response:
+    encoding = None
+    if len(cached.body) >= COMPRESSION_MIN_SIZE:
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+
+    headers = {
+        "ETag": cached.etag_for(encoding),
+        "Cache-Control": cached.cache_control,
+        "Vary": "Accept-Encoding",
+    }
+    if cached.last_modified:
+        headers["Last-Modified"] = format_datetime(cached.last_modified, usegmt=True)
+    if is_not_modified(request, cached):
+        return Response(status_code=304, headers=headers)
+
+    body = cached.body
+    if encoding:
+        body = cached.encoded(encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=cached.media_type, headers=headers)
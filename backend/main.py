@@ -1,28 +1,77 @@
-from fastapi import FastAPI, HTTPException, Depends
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import (
+    JSONResponse, ORJSONResponse, PlainTextResponse, Response, StreamingResponse
+)
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
 from datetime import date, timedelta
 
-from database import get_db, engine
-from models import Base, Article as ArticleModel, User as UserModel
+import crud
+from database import SessionLocal, get_read_session, get_session, replica_set, run_db
+from models import Article as ArticleModel, User as UserModel, utcnow
 from schemas import (
-    Article, ArticleCreate, ArticleUpdate, ArticleStatusUpdate,
-    UserCreate, UserLogin, User, Token
+    Article, ArticleCreate, ArticleDetail, ArticleUpdate, ArticleStatusUpdate, ArticlePage,
+    ArticleSummary,
+    BatchFetch, BatchResult, BulkItemResult, BulkResult, BulkSelection, BulkStatusUpdate,
+    PopularArticle, RelatedArticle, SearchResult, UserCreate, UserLogin, User, Token
 )
+import hashing
+from hashing import PoolSaturated, hash_password
+from ratelimit import auth_ip_limiter, auth_email_limiter, client_ip
 from auth import (
-    get_password_hash, authenticate_user, create_access_token,
-    get_current_active_user, get_current_user, get_user_by_email,
-    ACCESS_TOKEN_EXPIRE_MINUTES
+    authenticate_user, create_access_token, create_stream_ticket,
+    get_current_active_user, get_current_user, get_stream_user, get_user_by_email,
+    principal_cache, ACCESS_TOKEN_EXPIRE_MINUTES, STREAM_TICKET_SECONDS
+)
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from cache import (
+    article_cache, article_key, list_key, invalidate_article, invalidate_articles
 )
+from compression import CompressionMiddleware
+import metrics
+from metrics import MetricsMiddleware
+from diagnostics import SQL_DIAGNOSTICS, QueryDiagnosticsMiddleware
+from replicas import ReadYourWritesMiddleware
+from http_cache import (
+    CachedBody, ARTICLE_CACHE_CONTROL, PRIVATE_CACHE_CONTROL, conditional_response
+)
+from rendering import apply_rendering
+from events import bus, sse_stream
+from facets import facet_counts
+from related import RELATED_TOP_K, related_index
+from views import POPULAR_SIZE, view_counter
+from feeds import SITEMAP, feed_cache
+from snapshot import SnapshotBusy, snapshot
+from transfer import Importer, export_ndjson
+from serialization import article_json, dumps, page_content, row_dicts
+from search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, search_published
+
+# Schema changes are applied by `alembic upgrade head` before the server
+# starts (Dockerfile CMD, the migrate service in docker-compose.yml);
+# importing the app never touches the database.
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    metrics.mark_started()
+    related_index.reload_in_background(SessionLocal)
+    view_flusher = asyncio.create_task(view_counter.run(SessionLocal))
+    yield
+    view_flusher.cancel()
+    # Views counted since the last periodic flush
+    await view_counter.flush(SessionLocal)
+    hashing.shutdown()
 
-# Create tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Dev Stories API",
     description="API pour le blog Dev Stories",
-    version="1.1.0"
+    version="1.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS
@@ -40,37 +89,83 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+if SQL_DIAGNOSTICS:
+    app.add_middleware(QueryDiagnosticsMiddleware)
+if replica_set:
+    app.add_middleware(
+        ReadYourWritesMiddleware, replica_set=replica_set,
+        read_only_routes=("/api/articles/batch", "/api/auth/login")
+    )
+# Outermost, so latency covers compression and CORS handling too
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(PoolSaturated)
+async def password_pool_saturated(request: Request, exc: PoolSaturated):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication is busy, retry shortly"},
+        headers={"Retry-After": "1"}
+    )
 
 
 @app.get("/")
-def root():
+async def root():
     return {"message": "Dev Stories API", "version": "1.0.0"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(request: Request):
+    """Request, SQL and pool metrics in Prometheus text format"""
+    if metrics.METRICS_TOKEN and (
+        request.headers.get("authorization") != f"Bearer {metrics.METRICS_TOKEN}"
+    ):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+def check_auth_rate(request: Request, email: str):
+    """Per-IP and per-email token buckets for the auth endpoints"""
+    retry_after = max(
+        auth_ip_limiter.acquire(client_ip(request)),
+        auth_email_limiter.acquire(email.lower())
+    )
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many attempts, retry later",
+            headers={"Retry-After": str(int(retry_after) + 1)}
+        )
+
+
 # Auth endpoints
 @app.post("/api/auth/register", response_model=User)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, request: Request, db=Depends(get_session)):
+    check_auth_rate(request, user.email)
+
     # Check if user exists
-    existing = get_user_by_email(db, user.email)
+    existing = await run_db(db, get_user_by_email, user.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     # Create user
     db_user = UserModel(
         email=user.email,
-        hashed_password=get_password_hash(user.password),
+        hashed_password=await hash_password(user.password),
         name=user.name,
         is_admin=False
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    return await run_db(db, crud.add, db_user)
 
 
 @app.post("/api/auth/login", response_model=Token)
-def login(user: UserLogin, db: Session = Depends(get_db)):
-    db_user = authenticate_user(db, user.email, user.password)
+async def login(user: UserLogin, request: Request, db=Depends(get_session)):
+    check_auth_rate(request, user.email)
+
+    db_user = await authenticate_user(db, user.email, user.password)
     if not db_user:
         raise HTTPException(
             status_code=401,
@@ -85,90 +180,307 @@ def login(user: UserLogin, db: Session = Depends(get_db)):
 
 
 @app.get("/api/auth/me", response_model=User)
-def get_me(current_user: UserModel = Depends(get_current_active_user)):
+async def get_me(current_user: User = Depends(get_current_active_user)):
     return current_user
 
 
+@app.get("/api/auth/stats")
+async def get_auth_stats(current_user: User = Depends(get_current_active_user)):
+    """Password pool latency/queue depth and rate limiter counters (admin only)"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return {
+        "password_pool": hashing.stats(),
+        "rate_limits": {
+            "ip": auth_ip_limiter.stats(),
+            "email": auth_email_limiter.stats(),
+        },
+    }
+
+
 # Articles endpoints
-@app.get("/api/articles", response_model=List[Article])
-def get_articles(
+@app.get("/api/articles", response_model=ArticlePage)
+async def get_articles(
+    request: Request,
     category: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db=Depends(get_read_session)
 ):
-    """Get all published articles (public endpoint)"""
-    query = db.query(ArticleModel).filter(ArticleModel.status == "published")
-    if category and category.upper() != "HOME":
-        query = query.filter(ArticleModel.category == category.upper())
-    return query.order_by(ArticleModel.date.desc()).all()
+    """Get published articles, newest first (public endpoint)"""
+    category = category.upper() if category and category.upper() != "HOME" else None
+    key = list_key(category, cursor, limit)
+    cached = article_cache.get(key, None)
+    if cached is None:
+        page = await run_db(
+            db, crud.list_articles, cursor, limit,
+            status="published", category=category
+        )
+        # A deletion can change a page without touching the remaining rows'
+        # updated_at, so a list is only known to be unchanged since it was built
+        cached = CachedBody(dumps(page_content(page)), last_modified=utcnow())
+        article_cache.set(key, cached)
+    return conditional_response(request, cached)
+
+
+@app.get("/api/articles/pending", response_model=ArticlePage)
+async def get_pending_articles(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db=Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get pending articles (admin only)"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    page = await run_db(db, crud.list_articles, cursor, limit, status="pending")
+    return ORJSONResponse(page_content(page))
+
+
+@app.get("/api/articles/my", response_model=ArticlePage)
+async def get_my_articles(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db=Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get articles created by the current user"""
+    page = await run_db(
+        db, crud.list_articles, cursor, limit, author_id=current_user.id
+    )
+    return ORJSONResponse(page_content(page))
 
 
-@app.get("/api/articles/pending", response_model=List[Article])
-def get_pending_articles(
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+@app.get("/api/articles/all", response_model=ArticlePage)
+async def get_all_articles(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db=Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
 ):
-    """Get all pending articles (admin only)"""
+    """Get articles regardless of status (admin only)"""
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin access required")
-    return db.query(ArticleModel).filter(
-        ArticleModel.status == "pending"
-    ).order_by(ArticleModel.date.desc()).all()
+    page = await run_db(db, crud.list_articles, cursor, limit)
+    return ORJSONResponse(page_content(page))
 
 
-@app.get("/api/articles/my", response_model=List[Article])
-def get_my_articles(
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+@app.get("/api/articles/export")
+async def export_articles(
+    status: Optional[str] = None,
+    current_user: User = Depends(get_current_active_user)
 ):
-    """Get articles created by the current user"""
-    return db.query(ArticleModel).filter(
-        ArticleModel.author_id == current_user.id
-    ).order_by(ArticleModel.date.desc()).all()
+    """Stream every article as NDJSON, optionally filtered by status (admin only)"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return StreamingResponse(
+        export_ndjson(status),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="articles.ndjson"'}
+    )
+
+
+async def _iter_lines(chunks):
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
 
+async def _write_import_batch(importer: Importer, db):
+    prepared = await run_in_threadpool(importer.prepare, importer.take_batch())
+    await run_db(db, importer.write, prepared)
 
-@app.get("/api/articles/all", response_model=List[Article])
-def get_all_articles(
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+
+@app.post("/api/articles/import")
+async def import_articles(
+    request: Request,
+    db=Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
 ):
-    """Get all articles regardless of status (admin only)"""
+    """Bulk import a streamed NDJSON body of articles (admin only)"""
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin access required")
-    return db.query(ArticleModel).order_by(ArticleModel.date.desc()).all()
 
+    importer = Importer()
+    line_no = 0
+    async for line in _iter_lines(request.stream()):
+        line_no += 1
+        if importer.add_line(line_no, line):
+            await _write_import_batch(importer, db)
+    await _write_import_batch(importer, db)
+
+    article_cache.clear()
+    if importer.inserted:
+        bus.publish("articles.imported", {"count": importer.inserted})
+    return importer.report()
+
+
+@app.get("/api/articles/facets")
+async def get_article_facets(
+    db=Depends(get_session),
+    current_user: Optional[User] = Depends(get_current_user)
+):
+    """Article counts per category and status (published only unless admin)"""
+    if facet_counts.needs_reconcile():
+        generation = facet_counts.generation
+        rows = await run_db(db, crud.count_by_status_category)
+        facet_counts.load(rows, generation)
+    is_admin = current_user is not None and current_user.is_admin
+    return facet_counts.snapshot(None if is_admin else {"published"})
+
+
+@app.get("/api/articles/popular", response_model=List[PopularArticle])
+async def get_popular_articles(limit: int = Query(10, ge=1, le=POPULAR_SIZE)):
+    """Most read published articles, recent views weighing more"""
+    return ORJSONResponse(view_counter.popular[:limit])
+
+
+@app.get("/api/articles/search", response_model=List[SearchResult])
+async def search_articles(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    db=Depends(get_read_session)
+):
+    """Search published articles, best matches first"""
+    rows = await run_db(db, search_published, q, limit)
+    return ORJSONResponse(row_dicts(rows))
+
+
+def cache_article_body(article) -> CachedBody:
+    """Serialize a full article once and keep it in the article cache"""
+    cached = CachedBody(
+        article_json(article),
+        last_modified=article.updated_at,
+        cache_control=(
+            ARTICLE_CACHE_CONTROL if article.status == "published"
+            else PRIVATE_CACHE_CONTROL
+        )
+    )
+    article_cache.set(article_key(article.slug), cached)
+    return cached
+
+
+@app.post("/api/articles/batch", response_model=BatchResult)
+async def get_articles_batch(batch: BatchFetch, db=Depends(get_read_session)):
+    """Fetch several articles at once, in request order, with not-found markers"""
+    if batch.fields not in ["summary", "full"]:
+        raise HTTPException(status_code=400, detail="fields must be summary or full")
+    if not batch.slugs:
+        raise HTTPException(status_code=400, detail="No slugs given")
+    unique = list(dict.fromkeys(batch.slugs))
+    if len(unique) > crud.MAX_BATCH_SLUGS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {crud.MAX_BATCH_SLUGS} slugs per request"
+        )
+
+    # Serialized JSON of each found article, by slug
+    bodies = {}
+    if batch.fields == "full":
+        # Full bodies are shared with the detail endpoint's cache
+        missing = []
+        for slug in unique:
+            cached = article_cache.get(article_key(slug), None)
+            if cached is None:
+                missing.append(slug)
+            else:
+                bodies[slug] = cached.body
+        if missing:
+            for article in await run_db(db, crud.get_articles_by_slugs, missing):
+                bodies[article.slug] = cache_article_body(article).body
+    else:
+        rows = await run_db(db, crud.get_articles_by_slugs, unique, True)
+        bodies = {row.slug: dumps(row._asdict()) for row in rows}
+
+    items = [
+        b'{"slug":%s,"found":%s,"article":%s}' % (
+            dumps(slug), b"true" if slug in bodies else b"false", bodies.get(slug, b"null")
+        )
+        for slug in batch.slugs
+    ]
+    return Response(b'{"items":[' + b",".join(items) + b"]}", media_type="application/json")
 
-@app.get("/api/articles/search", response_model=List[Article])
-def search_articles(
-    q: str,
-    db: Session = Depends(get_db)
+
+@app.get("/api/articles/{slug}", response_model=ArticleDetail)
+async def get_article(
+    slug: str,
+    request: Request,
+    content: bool = Query(False, description="Include the Markdown source (edit forms)"),
+    db=Depends(get_read_session)
 ):
-    """Search published articles"""
-    search = f"%{q}%"
-    return db.query(ArticleModel).filter(
-        ArticleModel.status == "published",
-        (ArticleModel.title.ilike(search)) |
-        (ArticleModel.excerpt.ilike(search)) |
-        (ArticleModel.content.ilike(search))
-    ).all()
-
-
-@app.get("/api/articles/{slug}", response_model=Article)
-def get_article(slug: str, db: Session = Depends(get_db)):
-    article = db.query(ArticleModel).filter(ArticleModel.slug == slug).first()
-    if not article:
+    if content:
+        # Editors need the current source: never cached, not a view
+        article = await run_db(db, crud.get_article_by_slug, slug)
+        if not article:
+            raise HTTPException(status_code=404, detail="Article not found")
+        return conditional_response(request, CachedBody(
+            article_json(article, content=True),
+            last_modified=article.updated_at,
+            cache_control=PRIVATE_CACHE_CONTROL
+        ))
+    cached = article_cache.get(article_key(slug), None)
+    if cached is None:
+        article = await run_db(db, crud.get_article_by_slug, slug)
+        if not article:
+            raise HTTPException(status_code=404, detail="Article not found")
+        cached = cache_article_body(article)
+    if cached.cache_control == ARTICLE_CACHE_CONTROL:  # published
+        view_counter.hit(slug)
+    return conditional_response(request, cached)
+
+
+@app.get("/api/articles/{slug}/related", response_model=List[RelatedArticle])
+async def get_related_articles(
+    slug: str,
+    limit: int = Query(5, ge=1, le=RELATED_TOP_K),
+    db=Depends(get_session)
+):
+    """Published articles most similar to this one, best match first"""
+    if related_index.needs_reload():
+        related_index.reload_in_background(SessionLocal)
+    if not related_index.ready:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Related articles are being indexed"},
+            headers={"Retry-After": "5"}
+        )
+    # Articles written since the last lookup; the primary has their content
+    stale = related_index.take_stale()
+    if stale:
+        try:
+            rows = await run_db(db, crud.related_rows, stale)
+        except Exception:
+            related_index.mark_stale(stale)
+            raise
+        related_index.update(stale, rows)
+    items = related_index.cached(slug)
+    if items is None:
+        items = await run_in_threadpool(related_index.neighbours, slug)
+    if items is None and related_index.loading:
+        # Imports carry no slugs: the rebuild may be about to add this one
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Related articles are being indexed"},
+            headers={"Retry-After": "5"}
+        )
+    if items is None:
         raise HTTPException(status_code=404, detail="Article not found")
-    return article
+    return ORJSONResponse(items[:limit])
 
 
 @app.post("/api/articles", response_model=Article)
-def create_article(
+async def create_article(
     article: ArticleCreate,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    db=Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
 ):
     """Create a new article with status=pending"""
     # Check if slug exists
-    existing = db.query(ArticleModel).filter(ArticleModel.slug == article.slug).first()
+    existing = await run_db(db, crud.get_article_by_slug, article.slug)
     if existing:
         raise HTTPException(status_code=400, detail="Article with this slug already exists")
 
@@ -184,18 +496,19 @@ def create_article(
         status="pending",
         author_id=current_user.id
     )
-    db.add(db_article)
-    db.commit()
-    db.refresh(db_article)
+    await run_in_threadpool(apply_rendering, db_article)
+    db_article = await run_db(db, crud.add, db_article)
+    invalidate_article(db_article.slug)
+    bus.publish("article.created", article_event(db_article))
     return db_article
 
 
 @app.put("/api/articles/{slug}/status", response_model=Article)
-def update_article_status(
+async def update_article_status(
     slug: str,
     status_update: ArticleStatusUpdate,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    db=Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
 ):
     """Update article status (admin only)"""
     if not current_user.is_admin:
@@ -204,25 +517,30 @@ def update_article_status(
     if status_update.status not in ["pending", "published", "rejected"]:
         raise HTTPException(status_code=400, detail="Invalid status")
 
-    db_article = db.query(ArticleModel).filter(ArticleModel.slug == slug).first()
+    db_article = await run_db(db, crud.get_article_by_slug, slug)
     if not db_article:
         raise HTTPException(status_code=404, detail="Article not found")
 
+    previous_status = db_article.status
     db_article.status = status_update.status
-    db.commit()
-    db.refresh(db_article)
+    db_article = await run_db(db, crud.save, db_article)
+    invalidate_article(
+        slug, [db_article.category],
+        published="published" in (previous_status, db_article.status)
+    )
+    bus.publish("article.status", article_event(db_article, previous_status=previous_status))
     return db_article
 
 
 @app.put("/api/articles/{slug}", response_model=Article)
-def update_article(
+async def update_article(
     slug: str,
     article: ArticleUpdate,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    db=Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
 ):
     """Update an article (owner or admin only)"""
-    db_article = db.query(ArticleModel).filter(ArticleModel.slug == slug).first()
+    db_article = await run_db(db, crud.get_article_by_slug, slug)
     if not db_article:
         raise HTTPException(status_code=404, detail="Article not found")
 
@@ -237,22 +555,33 @@ def update_article(
         if update_data['status'] == 'published':
             raise HTTPException(status_code=403, detail="Only admins can publish articles")
 
+    previous_category, previous_status = db_article.category, db_article.status
+    # Edit forms send the stored excerpt back; only a different one is an edit
+    excerpt_edited = update_data.get("excerpt", db_article.excerpt) != db_article.excerpt
     for key, value in update_data.items():
         setattr(db_article, key, value)
+    if "content" in update_data or not db_article.excerpt or db_article.content_html is None:
+        await run_in_threadpool(apply_rendering, db_article, excerpt_edited)
 
-    db.commit()
-    db.refresh(db_article)
+    db_article = await run_db(db, crud.save, db_article)
+    invalidate_article(
+        slug, [previous_category, db_article.category],
+        published="published" in (previous_status, db_article.status)
+    )
+    bus.publish("article.updated", article_event(
+        db_article, previous_status=previous_status, previous_category=previous_category
+    ))
     return db_article
 
 
 @app.delete("/api/articles/{slug}")
-def delete_article(
+async def delete_article(
     slug: str,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_active_user)
+    db=Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
 ):
     """Delete an article (owner or admin only)"""
-    db_article = db.query(ArticleModel).filter(ArticleModel.slug == slug).first()
+    db_article = await run_db(db, crud.get_article_by_slug, slug)
     if not db_article:
         raise HTTPException(status_code=404, detail="Article not found")
 
@@ -260,18 +589,239 @@ def delete_article(
     if db_article.author_id != current_user.id and not current_user.is_admin:
         raise HTTPException(status_code=403, detail="You can only delete your own articles")
 
-    db.delete(db_article)
-    db.commit()
+    category, status = db_article.category, db_article.status
+    published = status == "published"
+    await run_db(db, crud.delete, db_article)
+    invalidate_article(slug, [category], published=published)
+    bus.publish("article.deleted", {
+        "slug": slug, "category": category, "status": status
+    })
     return {"message": "Article deleted"}
 
 
+def article_event(article, **previous) -> dict:
+    """Event payload for one article: its summary fields plus previous values"""
+    data = ArticleSummary.model_validate(article).model_dump(mode="json")
+    data.update(previous)
+    return data
+
+
+@app.post("/api/events/ticket")
+async def create_event_ticket(current_user: User = Depends(get_current_active_user)):
+    """Single-use ticket for opening the moderation stream (admin only)"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return {"ticket": create_stream_ticket(current_user.email), "expires_in": STREAM_TICKET_SECONDS}
+
+
+@app.get("/api/events/moderation")
+async def moderation_events(
+    request: Request,
+    current_user: User = Depends(get_stream_user)
+):
+    """Stream article changes as server-sent events (admin only)"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    subscription = bus.subscribe()
+    last_event_id = request.headers.get("last-event-id")
+    backlog = []
+    if last_event_id and last_event_id.isdigit():
+        backlog = bus.replay(int(last_event_id))
+    return StreamingResponse(
+        sse_stream(subscription, backlog, bus.last_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def bulk_selection(selection: BulkSelection):
+    """Validated (slugs, filter) of a bulk request; exactly one is set"""
+    if (selection.slugs is None) == (selection.filter is None):
+        raise HTTPException(status_code=400, detail="Provide either slugs or filter")
+    if selection.slugs is not None:
+        slugs = list(dict.fromkeys(selection.slugs))
+        if not slugs:
+            raise HTTPException(status_code=400, detail="No slugs given")
+        if len(slugs) > crud.MAX_BULK_SLUGS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {crud.MAX_BULK_SLUGS} slugs per request"
+            )
+        return slugs, None
+    if not selection.filter.model_dump(exclude_none=True):
+        raise HTTPException(status_code=400, detail="Filter must not be empty")
+    return None, selection.filter
+
+
+@app.post("/api/articles/bulk/status", response_model=BulkResult)
+async def bulk_update_status(
+    bulk: BulkStatusUpdate,
+    db=Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Set the status of many articles in one statement (admin only)"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    if bulk.status not in ["pending", "published", "rejected"]:
+        raise HTTPException(status_code=400, detail="Invalid status")
+
+    slugs, filters = bulk_selection(bulk)
+    changed, unchanged, has_more = await run_db(
+        db, crud.bulk_update_status, bulk.status, slugs, filters
+    )
+
+    # RETURNING only sees the new status, so a changed row may have left
+    # the published set: refresh published lists whenever rows changed
+    invalidate_articles(
+        [row.slug for row in changed], {row.category for row in changed},
+        published=bool(changed)
+    )
+    for row in changed:
+        # The previous status is not known after a set-based UPDATE
+        bus.publish("article.status", {
+            "slug": row.slug, "category": row.category,
+            "status": bulk.status, "previous_status": None
+        })
+
+    items = [BulkItemResult(slug=row.slug, result="updated", status=bulk.status) for row in changed]
+    if slugs:
+        changed_slugs = {row.slug for row in changed}
+        items = [
+            BulkItemResult(slug=slug, result="updated", status=bulk.status)
+            if slug in changed_slugs else
+            BulkItemResult(slug=slug, result="unchanged", status=bulk.status)
+            if slug in unchanged else
+            BulkItemResult(slug=slug, result="not_found")
+            for slug in slugs
+        ]
+    return BulkResult(affected=len(changed), items=items, has_more=has_more)
+
+
+@app.post("/api/articles/bulk/delete", response_model=BulkResult)
+async def bulk_delete_articles(
+    selection: BulkSelection,
+    db=Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Delete many articles in one statement (admin only)"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    slugs, filters = bulk_selection(selection)
+    deleted, has_more = await run_db(db, crud.bulk_delete, slugs, filters)
+
+    invalidate_articles(
+        [row.slug for row in deleted],
+        {row.category for row in deleted if row.status == "published"},
+        published=any(row.status == "published" for row in deleted)
+    )
+    for row in deleted:
+        bus.publish("article.deleted", {
+            "slug": row.slug, "category": row.category, "status": row.status
+        })
+
+    items = [BulkItemResult(slug=row.slug, result="deleted", status=row.status) for row in deleted]
+    if slugs:
+        by_slug = {item.slug: item for item in items}
+        items = [by_slug.get(slug) or BulkItemResult(slug=slug, result="not_found") for slug in slugs]
+    return BulkResult(affected=len(deleted), items=items, has_more=has_more)
+
+
+async def feed_document(request: Request, key) -> Response:
+    """A cached feed or sitemap document, rendered on first request after a change"""
+    cached = feed_cache.cached(key)
+    if cached is None:
+        cached = await run_in_threadpool(feed_cache.build, SessionLocal, key)
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    return conditional_response(request, cached)
+
+
+@app.get("/api/feeds/rss.xml")
+async def get_rss_feed(request: Request):
+    """Latest published articles as RSS 2.0"""
+    return await feed_document(request, ("rss", None))
+
+
+@app.get("/api/feeds/atom.xml")
+async def get_atom_feed(request: Request):
+    """Latest published articles as Atom"""
+    return await feed_document(request, ("atom", None))
+
+
+@app.get("/api/feeds/{category}/rss.xml")
+async def get_category_rss_feed(category: str, request: Request):
+    """Latest published articles of one category as RSS 2.0"""
+    return await feed_document(request, ("rss", category.upper()))
+
+
+@app.get("/api/feeds/{category}/atom.xml")
+async def get_category_atom_feed(category: str, request: Request):
+    """Latest published articles of one category as Atom"""
+    return await feed_document(request, ("atom", category.upper()))
+
+
+@app.get("/sitemap.xml", include_in_schema=False)
+async def get_sitemap(request: Request):
+    return await feed_document(request, (SITEMAP, 0))
+
+
+@app.get("/sitemap-{page:int}.xml", include_in_schema=False)
+async def get_sitemap_page(page: int, request: Request):
+    """One page of the sitemap, once there are too many URLs for one file"""
+    return await feed_document(request, (SITEMAP, page))
+
+
+@app.get("/api/cache/stats")
+async def get_cache_stats(current_user: User = Depends(get_current_active_user)):
+    """Cache counters, for sizing the *_CACHE_SIZE/TTL settings (admin only)"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return {
+        "articles": article_cache.stats(),
+        "principals": principal_cache.stats(),
+        "related": related_index.stats(),
+        "views": view_counter.stats(),
+        "feeds": feed_cache.stats(),
+    }
+
+
+@app.get("/api/db/replicas")
+async def get_replica_stats(current_user: User = Depends(get_current_active_user)):
+    """Replica health and how many reads each side served (admin only)"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return replica_set.stats()
+
+
+def export_snapshot_files(full: bool) -> dict:
+    with SessionLocal() as db:
+        return snapshot.export(db) if full else snapshot.export_pending(db)
+
+
+@app.post("/api/snapshot")
+async def export_snapshot(
+    full: bool = False,
+    current_user: User = Depends(get_current_active_user)
+):
+    """Write published articles and lists to SNAPSHOT_DIR (admin only)"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    try:
+        return await run_in_threadpool(export_snapshot_files, full)
+    except SnapshotBusy:
+        raise HTTPException(status_code=409, detail="A snapshot export is already running")
+
+
 @app.post("/api/seed")
-def seed_database(db: Session = Depends(get_db)):
+async def seed_database(db=Depends(get_session)):
     """Seed the database with sample articles"""
     from datetime import date as d
 
     # Check if articles already exist
-    existing = db.query(ArticleModel).count()
+    existing = await run_db(db, crud.count_articles)
     if existing > 0:
         return {"message": f"Database already has {existing} articles", "seeded": False}
 
@@ -344,8 +894,10 @@ def seed_database(db: Session = Depends(get_db)):
         }
     ]
 
-    for article_data in articles:
-        db.add(ArticleModel(**article_data))
-
-    db.commit()
+    rendered = await run_in_threadpool(
+        lambda: [apply_rendering(ArticleModel(**data)) for data in articles]
+    )
+    await run_db(db, crud.add_all, rendered)
+    article_cache.clear()
+    bus.publish("articles.imported", {"count": len(articles)})
     return {"message": f"Successfully seeded {len(articles)} articles", "seeded": True}
@@ -0,0 +1,300 @@
+"""
+Request and database instrumentation, exposed in Prometheus text format.
+
+MetricsMiddleware times every request and labels it with the matched route
+template (/api/articles/{slug}, not the raw path). instrument_engine() hooks
+an engine's statement events and connection checkout, attributing SQL count
+and DB time to the request being served through a context variable (copied
+into threadpool workers and run_sync greenlets alike).
+"""
+import bisect
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+CHECKOUT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# Optional bearer token for scrapers; /metrics is open when unset
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Label for requests no route matched, so scanners cannot blow up cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_labels(self.label_names, labels)} {_format(value)}"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Sequence[float], labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.label_names = tuple(labels)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def collect(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            items = sorted((labels, ([*s[0]], s[1], s[2])) for labels, s in self._values.items())
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = f'le="{_format(float(bound))}"'
+                yield f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {_format(total)}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {count}"
+
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status code",
+    ("method", "route", "status"),
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency until the last body byte is sent",
+    LATENCY_BUCKETS, ("method", "route"),
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_statements", "SQL statements executed per request",
+    QUERY_COUNT_BUCKETS, ("method", "route"),
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds", "Total SQL execution time per request",
+    DB_TIME_BUCKETS, ("method", "route"),
+)
+DB_STATEMENTS = Counter(
+    "db_statements_total", "SQL statements executed, inside or outside requests", ("engine",),
+)
+POOL_CHECKOUT = Histogram(
+    "db_pool_checkout_seconds", "Time spent waiting for a pooled connection",
+    CHECKOUT_BUCKETS, ("engine",),
+)
+
+_engines: Dict[str, object] = {}
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def _process_clock():
+    """
+    (clock, process start on that clock). On Linux the start comes from
+    /proc/self/stat in ticks since boot, so interpreter start-up and imports
+    are included; elsewhere it falls back to the import of this module.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Field 22, counted after the parenthesised command name
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        clock = lambda: time.clock_gettime(time.CLOCK_BOOTTIME)  # noqa: E731
+        return clock, start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.perf_counter, time.perf_counter()
+
+
+_clock, PROCESS_STARTED_AT = _process_clock()
+startup_seconds: Optional[float] = None
+first_response_seconds: Optional[float] = None
+
+
+def mark_started():
+    """Record time from process start until the app is ready to serve"""
+    global startup_seconds
+    startup_seconds = _clock() - PROCESS_STARTED_AT
+    logger.info("Application ready %.3fs after process start", startup_seconds)
+
+
+def _mark_first_response():
+    global first_response_seconds
+    first_response_seconds = _clock() - PROCESS_STARTED_AT
+    logger.info("First response sent %.3fs after process start", first_response_seconds)
+
+
+class RequestStats:
+    """Mutable per-request counters; shared by reference with worker threads"""
+    __slots__ = ("statements", "db_time")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def instrument_engine(engine, name: str = "primary"):
+    """Count statements and time them, and time pool checkouts, for engine"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    _engines[name] = sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_STATEMENTS.inc(name)
+        stats = current_request.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_time += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        starts = context.connection.info.get("query_start") if context.connection else None
+        if starts:
+            starts.pop()
+
+    # Pool events fire after checkout, so time the call that blocks on it
+    raw_connection = sync_engine.raw_connection
+
+    def timed_raw_connection():
+        started = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            POOL_CHECKOUT.observe(time.perf_counter() - started, name)
+
+    sync_engine.raw_connection = timed_raw_connection
+
+
+def _pool_gauges():
+    lines = [
+        "# HELP db_pool_checked_out Connections currently checked out of the pool",
+        "# TYPE db_pool_checked_out gauge",
+    ]
+    sized = []
+    for name, sync_engine in sorted(_engines.items()):
+        pool = sync_engine.pool
+        if hasattr(pool, "checkedout"):
+            lines.append(f'db_pool_checked_out{{engine="{name}"}} {pool.checkedout()}')
+        if hasattr(pool, "size"):
+            # QueuePool reports overflow as negative until the pool has filled
+            sized.append((name, pool.size(), max(0, pool.overflow())))
+    if sized:
+        lines += ["# HELP db_pool_size Configured pool size", "# TYPE db_pool_size gauge"]
+        lines += [f'db_pool_size{{engine="{name}"}} {size}' for name, size, _ in sized]
+        lines += ["# HELP db_pool_overflow Connections opened beyond the pool size",
+                  "# TYPE db_pool_overflow gauge"]
+        lines += [f'db_pool_overflow{{engine="{name}"}} {overflow}' for name, _, overflow in sized]
+    return lines
+
+
+def _startup_gauges():
+    lines = []
+    for name, help, value in (
+        ("app_startup_seconds", "Seconds from process start until the app was ready", startup_seconds),
+        ("app_first_response_seconds", "Seconds from process start until the first response",
+         first_response_seconds),
+    ):
+        if value is not None:
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {value!r}"]
+    return lines
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in (REQUESTS, REQUEST_LATENCY, REQUEST_QUERIES, REQUEST_DB_TIME,
+                   DB_STATEMENTS, POOL_CHECKOUT):
+        lines.extend(metric.collect())
+    lines.extend(_pool_gauges())
+    lines.extend(_startup_gauges())
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware (so streamed bodies are timed to the end) recording
+    latency, status and SQL statistics per route template.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            current_request.reset(token)
+            route = scope.get("route")
+            template = getattr(route, "path", None) or UNMATCHED_ROUTE
+            method = scope["method"]
+            REQUESTS.inc(method, template, str(status))
+            REQUEST_LATENCY.observe(elapsed, method, template)
+            REQUEST_QUERIES.observe(stats.statements, method, template)
+            REQUEST_DB_TIME.observe(stats.db_time, method, template)
+            if first_response_seconds is None:
+                _mark_first_response()
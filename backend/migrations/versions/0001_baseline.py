@@ -0,0 +1,58 @@
+"""Baseline: users and articles as originally created by create_all
+
+Databases created before migrations existed already have these tables;
+they are left untouched and simply stamped at this revision.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-02-02
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String(255), nullable=False),
+            sa.Column("hashed_password", sa.String(255), nullable=False),
+            sa.Column("name", sa.String(200), nullable=False),
+            sa.Column("is_active", sa.Boolean(), nullable=True),
+            sa.Column("is_admin", sa.Boolean(), nullable=True),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if not inspector.has_table("articles"):
+        op.create_table(
+            "articles",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String(500), nullable=False),
+            sa.Column("slug", sa.String(500), nullable=False),
+            sa.Column("author", sa.String(200), nullable=False),
+            sa.Column("date", sa.Date(), nullable=False),
+            sa.Column("category", sa.String(50), nullable=False),
+            sa.Column("image", sa.String(1000), nullable=True),
+            sa.Column("excerpt", sa.Text(), nullable=True),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("status", sa.String(20), nullable=False),
+            sa.Column("author_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        )
+        op.create_index("ix_articles_id", "articles", ["id"])
+        op.create_index("ix_articles_slug", "articles", ["slug"], unique=True)
+        op.create_index("ix_articles_category", "articles", ["category"])
+        op.create_index("ix_articles_status", "articles", ["status"])
+
+
+def downgrade():
+    op.drop_table("articles")
+    op.drop_table("users")
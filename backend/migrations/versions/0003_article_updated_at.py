@@ -0,0 +1,32 @@
+"""Add articles.updated_at (drives ETag / Last-Modified)
+
+Existing rows are stamped with the migration time. SQLite cannot add a NOT
+NULL column with a non-constant default, so there the column stays nullable
+in the schema; the ORM always sets it.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-02-02
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("articles")}
+    if "updated_at" in columns:  # added at startup before migrations existed
+        return
+    op.add_column("articles", sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE articles SET updated_at = CURRENT_TIMESTAMP")
+    if op.get_bind().dialect.name != "sqlite":
+        op.alter_column("articles", "updated_at", nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table("articles") as batch:
+        batch.drop_column("updated_at")
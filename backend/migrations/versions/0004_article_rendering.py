@@ -0,0 +1,37 @@
+"""Add the write-time rendering columns to articles
+
+Existing rows are left empty; fill them with `python rendering.py backfill`.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-02-02
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+COLUMNS = [
+    ("content_html", sa.Text),
+    ("toc", sa.JSON),
+    ("word_count", sa.Integer),
+    ("reading_time", sa.Integer),
+]
+
+
+def upgrade():
+    # Tables created or upgraded at startup before migrations existed have them
+    existing = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("articles")}
+    for name, type_ in COLUMNS:
+        if name not in existing:
+            op.add_column("articles", sa.Column(name, type_(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("articles") as batch:
+        for name, _ in reversed(COLUMNS):
+            batch.drop_column(name)
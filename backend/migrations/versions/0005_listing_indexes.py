@@ -0,0 +1,41 @@
+"""Composite indexes for the listing queries
+
+Every listing filters on status, category or author_id and pages on
+(date DESC, id DESC); these indexes return rows already in that order, so
+the planner stops after one page instead of sorting the filtered set.
+ix_articles_status is a prefix of the first one and is dropped.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-02-02
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    # /api/articles, /api/articles/pending
+    "ix_articles_status_date_id": ["status", "date DESC", "id DESC"],
+    # /api/articles?category=
+    "ix_articles_status_category_date_id": ["status", "category", "date DESC", "id DESC"],
+    # /api/articles/my
+    "ix_articles_author_date_id": ["author_id", "date DESC", "id DESC"],
+    # /api/articles/all
+    "ix_articles_date_id": ["date DESC", "id DESC"],
+}
+
+
+def upgrade():
+    for name, columns in INDEXES.items():
+        op.create_index(name, "articles", [sa.text(column) for column in columns])
+    op.drop_index("ix_articles_status", table_name="articles")
+
+
+def downgrade():
+    op.create_index("ix_articles_status", "articles", ["status"])
+    for name in INDEXES:
+        op.drop_index(name, table_name="articles")
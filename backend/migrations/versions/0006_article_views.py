@@ -0,0 +1,32 @@
+"""Daily view counts per article
+
+Filled by the write-behind counter in views.py with batched upserts, one
+row per article and UTC day.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-02-02
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "article_views",
+        sa.Column("article_id", sa.Integer(),
+                  sa.ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("views", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_article_views_day", "article_views", ["day"])
+
+
+def downgrade():
+    op.drop_index("ix_article_views_day", table_name="article_views")
+    op.drop_table("article_views")
@@ -1,8 +1,16 @@
-from sqlalchemy import Column, Integer, String, Text, Date, Boolean, ForeignKey
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Column, Integer, BigInteger, String, Text, Date, DateTime, Boolean, ForeignKey, JSON, Index
+)
 from sqlalchemy.orm import relationship
 from database import Base
 
 
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -28,7 +36,34 @@ class Article(Base):
     image = Column(String(1000), nullable=True)
     excerpt = Column(Text, nullable=True)
     content = Column(Text, nullable=False)
-    status = Column(String(20), nullable=False, default="pending", index=True)
+    status = Column(String(20), nullable=False, default="pending")
     author_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    # Rendered from content at write time (rendering.py)
+    content_html = Column(Text, nullable=True)
+    toc = Column(JSON, nullable=True)
+    word_count = Column(Integer, nullable=True)
+    reading_time = Column(Integer, nullable=True)
+    # Bumped by every ORM insert/update; drives ETag/Last-Modified
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=utcnow, onupdate=utcnow)
 
     user = relationship("User", back_populates="articles")
+
+    # Listing access paths, all paged on (date DESC, id DESC); see migration 0005
+    __table_args__ = (
+        Index("ix_articles_status_date_id", status, date.desc(), id.desc()),
+        Index("ix_articles_status_category_date_id", status, category, date.desc(), id.desc()),
+        Index("ix_articles_author_date_id", author_id, date.desc(), id.desc()),
+        Index("ix_articles_date_id", date.desc(), id.desc()),
+    )
+
+
+class ArticleView(Base):
+    """Views per article and UTC day, written in batches by views.py"""
+    __tablename__ = "article_views"
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    views = Column(BigInteger, nullable=False, default=0)
+
+    # Ranking reload reads recent days only
+    __table_args__ = (Index("ix_article_views_day", day),)
@@ -0,0 +1,66 @@
+"""
+Keyset (cursor) pagination for article listings.
+
+Pages are ordered by (date DESC, id DESC) and the cursor encodes the
+(date, id) of the last row sent, so fetching page N costs the same as page 1.
+"""
+import base64
+from datetime import date
+from typing import Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+from models import Article
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Columns selected for list responses (everything except content)
+SUMMARY_COLUMNS = (
+    Article.id,
+    Article.title,
+    Article.slug,
+    Article.author,
+    Article.date,
+    Article.category,
+    Article.image,
+    Article.excerpt,
+    Article.status,
+    Article.author_id,
+    Article.updated_at,
+    Article.reading_time,
+)
+
+
+def encode_cursor(article_date: date, article_id: int) -> str:
+    raw = f"{article_date.isoformat()}|{article_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_part, id_part = base64.urlsafe_b64decode(padded).decode().split("|")
+        return date.fromisoformat(date_part), int(id_part)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(query, cursor: str = None, limit: int = DEFAULT_PAGE_SIZE) -> dict:
+    """Fetch one page of a summary query, plus the cursor of the next page"""
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        # Row-value comparison, so the (date, id) index seeks straight to it
+        query = query.filter(tuple_(Article.date, Article.id) < (cursor_date, cursor_id))
+
+    # One extra row tells us whether another page exists
+    rows = query.order_by(
+        Article.date.desc(), Article.id.desc()
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].date, rows[-1].id)
+    return {"items": rows, "next_cursor": next_cursor}
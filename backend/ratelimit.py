@@ -0,0 +1,81 @@
+"""
+Token-bucket rate limiting for the authentication endpoints.
+
+Each key (client IP, submitted email) owns a bucket of `capacity` tokens
+refilled at `rate` tokens per second. Buckets live in process memory; the
+least recently used are dropped past max_keys so the table stays bounded.
+
+Behind a reverse proxy the socket peer is the proxy, so set
+TRUSTED_PROXY_HOPS to the number of proxies that append to
+X-Forwarded-For (1 on Render); see client_ip.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenBucketLimiter:
+    def __init__(self, rate: float, capacity: float, max_keys: int = 10000):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+
+    def acquire(self, key) -> float:
+        """Take one token for key; return 0 if allowed, else seconds to wait"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+                self.allowed += 1
+            else:
+                retry_after = (1 - tokens) / self.rate
+                self.limited += 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return retry_after
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate_per_minute": self.rate * 60,
+                "burst": self.capacity,
+                "tracked_keys": len(self._buckets),
+                "allowed": self.allowed,
+                "limited": self.limited,
+            }
+
+
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+AUTH_IP_PER_MINUTE = float(os.getenv("AUTH_IP_PER_MINUTE", "20"))
+AUTH_IP_BURST = float(os.getenv("AUTH_IP_BURST", "10"))
+AUTH_EMAIL_PER_MINUTE = float(os.getenv("AUTH_EMAIL_PER_MINUTE", "5"))
+AUTH_EMAIL_BURST = float(os.getenv("AUTH_EMAIL_BURST", "5"))
+
+auth_ip_limiter = TokenBucketLimiter(AUTH_IP_PER_MINUTE / 60, AUTH_IP_BURST)
+auth_email_limiter = TokenBucketLimiter(AUTH_EMAIL_PER_MINUTE / 60, AUTH_EMAIL_BURST)
+
+
+def client_ip(request) -> str:
+    """
+    The client address as seen by the outermost trusted proxy: the
+    TRUSTED_PROXY_HOPS-th X-Forwarded-For entry from the right. Entries
+    left of it come from the client and are ignored.
+    """
+    if TRUSTED_PROXY_HOPS:
+        forwarded = [
+            host.strip()
+            for header in request.headers.getlist("x-forwarded-for")
+            for host in header.split(",") if host.strip()
+        ]
+        if len(forwarded) >= TRUSTED_PROXY_HOPS:
+            return forwarded[-TRUSTED_PROXY_HOPS]
+    return request.client.host if request.client else "unknown"
@@ -0,0 +1,327 @@
+"""
+Related articles from TF-IDF vectors over title, excerpt and content.
+
+Words of each published article are hashed into RELATED_DIMENSIONS buckets
+(title words count three times, excerpt words twice), weighted by log term
+frequency and the inverse document frequency of their bucket, and stored
+L2-normalized as one float32 matrix (about 1 KB per article at 256
+dimensions). Cosine similarity to every article is then a single
+matrix-vector product, and the top RELATED_TOP_K neighbours of a slug are
+cached until a change could alter them.
+
+The matrix is built in a background thread at startup and rebuilt every
+RELATED_RELOAD_SECONDS, which refreshes the IDF weights and picks up writes
+made by other processes. In between, article events mark slugs stale and
+the next lookup re-vectorizes only those. Lookups keep doing so against the
+old matrix while a rebuild runs, and marks made since it started are
+re-applied to the new one, which may have been read before them.
+"""
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import crud
+from events import Event, bus
+
+RELATED_DIMENSIONS = int(os.getenv("RELATED_DIMENSIONS", "256"))
+RELATED_TOP_K = int(os.getenv("RELATED_TOP_K", "10"))
+RELATED_CACHE_SIZE = int(os.getenv("RELATED_CACHE_SIZE", "10000"))
+RELATED_RELOAD_SECONDS = float(os.getenv("RELATED_RELOAD_SECONDS", "3600"))
+# Word -> bucket memo, reset when it grows past this many words
+MAX_MEMO_WORDS = 500000
+
+FIELD_WEIGHTS = (("title", 3), ("excerpt", 2), ("content", 1))
+# Letters only, three or more: skips numbers, markup and most stop words
+_WORD = re.compile(r"[^\W\d_]{3,}")
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class RelatedIndex:
+    def __init__(
+        self,
+        dimensions: int = RELATED_DIMENSIONS,
+        top_k: int = RELATED_TOP_K,
+        cache_size: int = RELATED_CACHE_SIZE,
+        reload_seconds: float = RELATED_RELOAD_SECONDS,
+    ):
+        self.dimensions = dimensions
+        self.top_k = top_k
+        self.cache_size = cache_size
+        self.reload_seconds = reload_seconds
+        # Rows [0, _size) are in use; the rest is room to grow
+        self._matrix = np.zeros((0, dimensions), dtype=np.float32)
+        self._size = 0
+        self._slugs: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._summaries: List[dict] = []
+        self._idf = np.ones(dimensions, dtype=np.float32)
+        self._buckets: Dict[str, int] = {}
+        # slug -> (neighbours, lowest score that still gets in, their slugs)
+        self._neighbours: OrderedDict = OrderedDict()
+        self._stale = set()
+        # Marks made since the running rebuild started, None when idle
+        self._marked_during_load: Optional[set] = None
+        self._reload_requested = False
+        self._loaded_at: Optional[float] = None
+        # Guards everything above; never held across database I/O
+        self._lock = threading.Lock()
+        self._loading = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._loaded_at is not None
+
+    @property
+    def loading(self) -> bool:
+        return self._loading.locked()
+
+    def needs_reload(self) -> bool:
+        return (
+            self._loaded_at is None
+            or self._reload_requested
+            or time.monotonic() - self._loaded_at >= self.reload_seconds
+        )
+
+    def _bucket(self, word: str) -> int:
+        bucket = self._buckets.get(word)
+        if bucket is None:
+            if len(self._buckets) >= MAX_MEMO_WORDS:
+                self._buckets = {}
+            # crc32 rather than hash(): stable across processes and restarts
+            bucket = self._buckets[word] = zlib.crc32(word.encode()) % self.dimensions
+        return bucket
+
+    def term_frequencies(self, article: dict) -> np.ndarray:
+        """1 + log(weighted count) per bucket for one article"""
+        counts = Counter()
+        for field, weight in FIELD_WEIGHTS:
+            for word in _WORD.findall((article.get(field) or "").lower()):
+                counts[self._bucket(word)] += weight
+        tf = np.zeros(self.dimensions, dtype=np.float32)
+        if counts:
+            buckets = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+            values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            tf[buckets] = 1 + np.log(values)
+        return tf
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1
+        vectors /= norms
+        return vectors
+
+    @staticmethod
+    def _split(row):
+        """(summary dict, text fields) for a crud.related_rows row"""
+        summary = row._asdict()
+        content = summary.pop("content")
+        return summary, {"title": summary["title"], "excerpt": summary["excerpt"], "content": content}
+
+    def load(self, rows):
+        """Replace the index with rows from crud.related_rows(db)"""
+        started = time.perf_counter()
+        summaries, vectors = [], []
+        for row in rows:
+            summary, text = self._split(row)
+            summaries.append(summary)
+            vectors.append(self.term_frequencies(text))
+        matrix = (
+            np.vstack(vectors) if vectors
+            else np.zeros((0, self.dimensions), dtype=np.float32)
+        )
+        document_frequency = np.count_nonzero(matrix, axis=0)
+        idf = (np.log((1 + len(summaries)) / (1 + document_frequency)) + 1).astype(np.float32)
+        matrix *= idf
+        self._normalize(matrix)
+
+        with self._lock:
+            self._matrix = matrix
+            self._size = len(summaries)
+            self._summaries = summaries
+            self._slugs = [summary["slug"] for summary in summaries]
+            self._rows = {slug: i for i, slug in enumerate(self._slugs)}
+            self._idf = idf
+            self._neighbours.clear()
+            if self._marked_during_load is not None:
+                self._stale |= self._marked_during_load
+                self._marked_during_load = None
+            self._loaded_at = time.monotonic()
+        self.load_seconds = time.perf_counter() - started
+        logger.info("Related articles indexed: %d in %.2fs", len(summaries), self.load_seconds)
+
+    def reload(self, session_factory):
+        """Rebuild from the database, unless a rebuild is already running"""
+        if not self._loading.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                self._marked_during_load = set()
+                self._reload_requested = False
+            with session_factory() as db:
+                self.load(crud.related_rows(db))
+        except Exception:
+            with self._lock:
+                self._marked_during_load = None
+            self._reload_requested = True
+            logger.exception("Related articles index rebuild failed")
+        finally:
+            self._loading.release()
+
+    def reload_in_background(self, session_factory):
+        if not self.loading:
+            threading.Thread(
+                target=self.reload, args=(session_factory,), name="related-index", daemon=True
+            ).start()
+
+    def apply(self, event: Event):
+        """Bus listener: mark the article stale if its published version changed"""
+        data = event.data
+        if event.type == "articles.imported":
+            self._reload_requested = True
+            return
+        if event.type in ("article.created", "article.deleted"):
+            touches_published = data["status"] == "published"
+        else:
+            # previous_status is None for bulk changes, where it is unknown
+            touches_published = (
+                data["status"] == "published"
+                or data.get("previous_status") in ("published", None)
+            )
+        if touches_published:
+            self.mark_stale([data["slug"]])
+
+    def take_stale(self) -> List[str]:
+        with self._lock:
+            stale, self._stale = self._stale, set()
+        return list(stale)
+
+    def mark_stale(self, slugs):
+        with self._lock:
+            self._stale.update(slugs)
+            if self._marked_during_load is not None:
+                self._marked_during_load.update(slugs)
+
+    def update(self, slugs: List[str], rows):
+        """
+        Re-vectorize slugs from their crud.related_rows(db, slugs) rows;
+        slugs without a row are no longer published and leave the index
+        """
+        found = {row.slug: row for row in rows}
+        with self._lock:
+            for slug in slugs:
+                row = found.get(slug)
+                if row is not None:
+                    summary, text = self._split(row)
+                    vector = self.term_frequencies(text) * self._idf
+                    self._normalize(vector)
+                    self._put(slug, summary, vector)
+                    self._invalidate(slug, vector)
+                elif slug in self._rows:
+                    self._remove(slug)
+                    self._invalidate(slug, None)
+
+    def _put(self, slug: str, summary: dict, vector: np.ndarray):
+        row = self._rows.get(slug)
+        if row is None:
+            if self._size == len(self._matrix):
+                grown = np.zeros((max(16, self._size * 3 // 2), self.dimensions), dtype=np.float32)
+                grown[:self._size] = self._matrix[:self._size]
+                self._matrix = grown
+            row = self._size
+            self._size += 1
+            self._rows[slug] = row
+            self._slugs.append(slug)
+            self._summaries.append(summary)
+        self._summaries[row] = summary
+        self._matrix[row] = vector
+
+    def _remove(self, slug: str):
+        # Move the last row into the hole so rows stay contiguous
+        row = self._rows.pop(slug)
+        last = self._size - 1
+        if row != last:
+            self._matrix[row] = self._matrix[last]
+            self._slugs[row] = self._slugs[last]
+            self._summaries[row] = self._summaries[last]
+            self._rows[self._slugs[row]] = row
+        self._slugs.pop()
+        self._summaries.pop()
+        self._size = last
+
+    def _invalidate(self, slug: str, vector: Optional[np.ndarray]):
+        """Drop cached neighbour lists that a change to slug can alter"""
+        self._neighbours.pop(slug, None)
+        if not self._neighbours:
+            return
+        keys = list(self._neighbours)
+        entries = list(self._neighbours.values())
+        drop = [key for key, (_, _, members) in zip(keys, entries) if slug in members]
+        if vector is not None:
+            rows = np.fromiter((self._rows[key] for key in keys), dtype=np.intp, count=len(keys))
+            floors = np.fromiter((floor for _, floor, _ in entries), dtype=np.float32, count=len(keys))
+            # Lists the changed article now scores its way into
+            drop.extend(keys[i] for i in np.flatnonzero(self._matrix[rows] @ vector > floors))
+        for key in drop:
+            self._neighbours.pop(key, None)
+
+    def cached(self, slug: str) -> Optional[list]:
+        """Cached neighbours of slug, or None when they must be computed"""
+        with self._lock:
+            entry = self._neighbours.get(slug)
+            if entry is None:
+                return None
+            self._neighbours.move_to_end(slug)
+            self.hits += 1
+            return entry[0]
+
+    def neighbours(self, slug: str) -> Optional[list]:
+        """Top-k most similar published articles, or None if slug is not indexed"""
+        with self._lock:
+            row = self._rows.get(slug)
+            if row is None:
+                return None
+            self.misses += 1
+            scores = self._matrix[:self._size] @ self._matrix[row]
+            scores[row] = -1
+            k = min(self.top_k, self._size - 1)
+            top = np.argpartition(-scores, k - 1)[:k] if k > 0 else np.empty(0, dtype=np.intp)
+            top = top[np.argsort(-scores[top], kind="stable")]
+            top = [i for i in top if scores[i] > 0]
+            items = [dict(self._summaries[i], score=round(float(scores[i]), 4)) for i in top]
+            # A full list only admits better scores; a short one admits any
+            floor = float(scores[top[-1]]) if len(top) == self.top_k else 0.0
+            self._neighbours[slug] = (items, floor, {item["slug"] for item in items})
+            while len(self._neighbours) > self.cache_size:
+                self._neighbours.popitem(last=False)
+            return items
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "articles": self._size,
+                "dimensions": self.dimensions,
+                "matrix_bytes": self._matrix.nbytes,
+                "cached": len(self._neighbours),
+                "stale": len(self._stale),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "load_seconds": self.load_seconds,
+            }
+
+
+related_index = RelatedIndex()
+bus.add_listener(related_index.apply)
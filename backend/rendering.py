@@ -0,0 +1,210 @@
+"""
+Write-time Markdown rendering for articles.
+
+create_article, update_article and the seed scripts render content once
+(GitHub-flavoured Markdown) into sanitized HTML, a heading table of contents,
+a word count and reading time, and fill in an excerpt when none was given.
+Readers get the stored result, so a view costs no rendering, and the
+Markdown source is only sent to edit forms.
+
+Existing rows can be (re)rendered with:
+    python rendering.py backfill [--all]
+"""
+import html as html_lib
+import math
+import re
+import sys
+import threading
+import unicodedata
+
+import bleach
+from bleach.html5lib_shim import Filter
+from markdown_it import MarkdownIt
+from mdit_py_plugins.deflist import deflist_plugin
+from mdit_py_plugins.footnote import footnote_plugin
+from mdit_py_plugins.tasklists import tasklists_plugin
+
+WORDS_PER_MINUTE = 200
+EXCERPT_LENGTH = 200
+
+ALLOWED_TAGS = [
+    "p", "br", "hr", "h1", "h2", "h3", "h4", "h5", "h6",
+    "strong", "em", "del", "s", "sup", "sub", "abbr",
+    "a", "img", "code", "pre", "blockquote",
+    "ul", "ol", "li", "dl", "dt", "dd", "section", "input",
+    "table", "thead", "tbody", "tr", "th", "td",
+]
+# class only carries the renderer's own markers (language-*, task lists, footnotes)
+ALLOWED_ATTRIBUTES = {
+    "a": ["href", "title", "id", "class"],
+    "img": ["src", "alt", "title"],
+    "abbr": ["title"],
+    "code": ["class"],
+    "hr": ["class"],
+    "ul": ["class"],
+    "ol": ["class"],
+    "li": ["id", "class"],
+    "sup": ["class"],
+    "section": ["class"],
+    "input": ["type", "checked", "disabled", "class"],
+    "th": ["align"],
+    "td": ["align"],
+    **{f"h{level}": ["id"] for level in range(1, 7)},
+}
+ALLOWED_PROTOCOLS = ["http", "https", "mailto"]
+
+
+_TAG = re.compile(r"<[^>]+>")
+# Raw HTML elements whose text must go with them: stripping only their tags
+# would leave scripts and style sheets on the page as text
+_DROPPED = re.compile(
+    r"<(script|style|iframe|object|noscript|template|textarea|title)\b[^>]*>.*?</\1\s*>",
+    re.I | re.S
+)
+_ALIGN = re.compile(r"text-align:\s*(left|right|center)")
+
+class _Checkboxes(Filter):
+    """Task list items are the only inputs: keep them as disabled checkboxes"""
+
+    def __iter__(self):
+        for token in super().__iter__():
+            if token.get("name") == "input" and token["type"] in ("StartTag", "EmptyTag"):
+                if token["data"].get((None, "type")) != "checkbox":
+                    continue
+                token["data"][(None, "disabled")] = "disabled"
+            yield token
+
+
+# Renderers and Cleaners are costly to build and not thread-safe (linkify
+# keeps match state): keep one of each per thread
+_local = threading.local()
+
+
+def _renderers():
+    if not hasattr(_local, "markdown"):
+        # CommonMark plus the GitHub extensions: tables, strikethrough,
+        # autolinked URLs, task lists; footnotes and definition lists too
+        _local.markdown = (
+            MarkdownIt("gfm-like")
+            .use(tasklists_plugin)
+            .use(footnote_plugin)
+            .use(deflist_plugin)
+        )
+        _local.cleaner = bleach.Cleaner(
+            tags=ALLOWED_TAGS,
+            attributes=ALLOWED_ATTRIBUTES,
+            protocols=ALLOWED_PROTOCOLS,
+            strip=True,
+            filters=[_Checkboxes]
+        )
+    return _local.markdown, _local.cleaner
+
+
+def _plain_text(sanitized_html: str) -> str:
+    # Input is already sanitized, a tag regex is enough to drop markup
+    return " ".join(html_lib.unescape(_TAG.sub(" ", sanitized_html)).split())
+
+
+def _slugify(value: str) -> str:
+    # Same ids as the Python-Markdown toc extension used to produce
+    value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode()
+    value = re.sub(r"[^\w\s-]", "", value).strip().lower()
+    return re.sub(r"[-\s]+", "-", value)
+
+
+def _unique(anchor: str, used: set) -> str:
+    while anchor in used or not anchor:
+        match = re.match(r"^(.*)_([0-9]+)$", anchor)
+        anchor = f"{match.group(1)}_{int(match.group(2)) + 1}" if match else f"{anchor}_1"
+    used.add(anchor)
+    return anchor
+
+
+def _prepare(tokens) -> list:
+    """Give headings ids and table cells align attributes; return the toc"""
+    toc, used = [], set()
+    for i, token in enumerate(tokens):
+        if token.type == "heading_open":
+            title = "".join(
+                child.content for child in tokens[i + 1].children or ()
+                if child.type in ("text", "code_inline")
+            )
+            anchor = _unique(_slugify(title), used)
+            token.attrSet("id", anchor)
+            toc.append({"id": anchor, "title": title, "level": int(token.tag[1])})
+        elif token.type in ("th_open", "td_open"):
+            align = _ALIGN.search(token.attrs.pop("style", "") or "")
+            if align:
+                token.attrSet("align", align.group(1))
+    return toc
+
+
+def _auto_excerpt(html: str) -> str:
+    first_paragraph = re.search(r"<p>(.*?)</p>", html, re.S)
+    text = _plain_text(first_paragraph.group(1) if first_paragraph else html)
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+    return text[:EXCERPT_LENGTH].rsplit(" ", 1)[0] + "…"
+
+
+def render_article(content: str, excerpt: str = None) -> dict:
+    """Render Markdown content into the stored columns of an article"""
+    md, cleaner = _renderers()
+    env = {}
+    tokens = md.parse(content, env)
+    toc = _prepare(tokens)
+    html = cleaner.clean(_DROPPED.sub("", md.renderer.render(tokens, md.options, env)))
+    words = len(_plain_text(html).split())
+    return {
+        "content_html": html,
+        "toc": toc,
+        "word_count": words,
+        "reading_time": max(1, math.ceil(words / WORDS_PER_MINUTE)),
+        "excerpt": excerpt or _auto_excerpt(html),
+    }
+
+
+def apply_rendering(article, keep_excerpt: bool = False):
+    """
+    Set the rendered columns of an Article (ORM object) from its content.
+
+    An excerpt generated from the previously rendered content is generated
+    again, unless keep_excerpt (the writer has just set it).
+    """
+    excerpt = article.excerpt
+    if (
+        excerpt and not keep_excerpt and article.content_html is not None
+        and excerpt == _auto_excerpt(article.content_html)
+    ):
+        excerpt = None
+    for key, value in render_article(article.content, excerpt).items():
+        setattr(article, key, value)
+    return article
+
+
+def backfill(render_all: bool = False, batch_size: int = 500):
+    from database import SessionLocal
+    from models import Article
+
+    db = SessionLocal()
+    try:
+        query = db.query(Article).order_by(Article.id)
+        if not render_all:
+            query = query.filter(Article.content_html.is_(None))
+        ids = [article_id for (article_id,) in query.with_entities(Article.id)]
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            for article in db.query(Article).filter(Article.id.in_(batch)):
+                apply_rendering(article)
+            db.commit()
+            db.expunge_all()
+        print(f"Rendered {len(ids)} articles")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "backfill":
+        print("Usage: python rendering.py backfill [--all]")
+        sys.exit(1)
+    backfill(render_all="--all" in sys.argv[2:])
@@ -0,0 +1,168 @@
+"""
+Read-replica routing for public read endpoints.
+
+READ_REPLICA_URLS lists replica databases (comma separated). Read-only
+endpoints take their session from database.get_read_session, which picks
+replicas round-robin, skipping any that failed a health check (connection
+error, or a PostgreSQL standby lagging more than REPLICA_MAX_LAG_SECONDS).
+Unhealthy replicas are re-checked every REPLICA_HEALTH_INTERVAL seconds;
+with none available reads fall back to the primary.
+
+Read-your-writes: for READ_YOUR_WRITES_SECONDS after this process serves a
+successful write, reads go to the primary too. That covers the writer's own
+follow-up reads, and also keeps a lagging replica from refilling the article
+cache (just invalidated by the write) with the previous version. Set it above
+the usual replication lag. Like the cache, the window is per process.
+
+Locally, point DATABASE_URL and READ_REPLICA_URLS at two SQLite files (or
+two Postgres instances); the replica only sees what is copied into it.
+"""
+import itertools
+import os
+import time
+from typing import List, Optional
+
+from sqlalchemy import event, text
+
+READ_REPLICA_URLS = [url.strip() for url in os.getenv("READ_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", "10"))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "30"))
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "ELSE 0 END"
+)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class Replica:
+    """One replica: its engine, session factory and health state"""
+
+    def __init__(self, name: str, engine, session_factory, is_async: bool = False):
+        self.name = name
+        self.engine = engine
+        self.session_factory = session_factory
+        self.is_async = is_async
+        self.healthy = True
+        self.checked_at = 0.0
+        self.last_error: Optional[str] = None
+        self.lag: Optional[float] = None
+
+        # A dropped connection during a request takes the replica out at once
+        sync_engine = getattr(engine, "sync_engine", engine)
+
+        @event.listens_for(sync_engine, "handle_error")
+        def _on_error(context):
+            if context.is_disconnect:
+                self.mark(False, str(context.original_exception))
+
+    def due(self, interval: float) -> bool:
+        return time.monotonic() - self.checked_at >= interval
+
+    def mark(self, healthy: bool, error: Optional[str] = None):
+        self.healthy = healthy
+        self.last_error = error
+        self.checked_at = time.monotonic()
+
+    def _probe(self, conn):
+        if conn.dialect.name == "postgresql":
+            self.lag = float(conn.execute(_LAG_QUERY).scalar() or 0)
+            if self.lag > REPLICA_MAX_LAG_SECONDS:
+                return f"replication lag {self.lag:.1f}s"
+        else:
+            conn.execute(text("SELECT 1"))
+        return None
+
+    def check(self) -> bool:
+        """Synchronous health check"""
+        try:
+            with self.engine.connect() as conn:
+                error = self._probe(conn)
+        except Exception as exc:
+            error = str(exc)
+        self.mark(error is None, error)
+        return self.healthy
+
+    async def check_async(self) -> bool:
+        try:
+            async with self.engine.connect() as conn:
+                error = await conn.run_sync(self._probe)
+        except Exception as exc:
+            error = str(exc)
+        self.mark(error is None, error)
+        return self.healthy
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "last_error": self.last_error,
+        }
+
+
+class ReplicaSet:
+    def __init__(self, replicas: List[Replica], health_interval: float = REPLICA_HEALTH_INTERVAL):
+        self.replicas = replicas
+        self.health_interval = health_interval
+        self._order = itertools.cycle(range(len(replicas))) if replicas else None
+        self.last_write_at = float("-inf")
+        self.primary_reads = 0
+        self.replica_reads = 0
+
+    def __bool__(self):
+        return bool(self.replicas)
+
+    def choose(self) -> Optional[Replica]:
+        """Next replica in round-robin order that is healthy or due a re-check"""
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[next(self._order)]
+            if replica.healthy or replica.due(self.health_interval):
+                return replica
+        return None
+
+    def mark_write(self):
+        self.last_write_at = time.monotonic()
+
+    def wants_primary(self) -> bool:
+        """True while a write served by this process may not have replicated"""
+        return time.monotonic() - self.last_write_at < READ_YOUR_WRITES_SECONDS
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [replica.stats() for replica in self.replicas],
+            "primary_reads": self.primary_reads,
+            "replica_reads": self.replica_reads,
+            "reading_from_primary": self.wants_primary(),
+        }
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware recording when a write request succeeded.
+    read_only_routes are route templates that use POST without writing
+    (batch fetch, login) and so should not send reads to the primary.
+    """
+
+    def __init__(self, app, replica_set: ReplicaSet, read_only_routes=()):
+        self.app = app
+        self.replica_set = replica_set
+        self.read_only_routes = frozenset(read_only_routes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                # The router has resolved the route by the time a response starts
+                route = getattr(scope.get("route"), "path", None)
+                if route not in self.read_only_routes:
+                    self.replica_set.mark_write()
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
-from datetime import date
+from typing import Any, Dict, List, Optional, Union
+from datetime import date, datetime
 
 
 # Auth Schemas
@@ -66,15 +66,123 @@ class ArticleUpdate(BaseModel):
     status: Optional[str] = None  # pending, published, rejected
 
 
+class ArticleImport(BaseModel):
+    """One line of an NDJSON import"""
+    title: str
+    slug: str
+    author: str = "ABEL R."
+    date: date
+    category: str
+    image: Optional[str] = None
+    excerpt: Optional[str] = None
+    content: str
+    status: str = "pending"
+
+
 class ArticleStatusUpdate(BaseModel):
     status: str  # pending, published, rejected
 
 
+class ArticleFilter(BaseModel):
+    """Selects articles for bulk operations; every given field must match"""
+    status: Optional[str] = None
+    category: Optional[str] = None
+    author_id: Optional[int] = None
+    date_before: Optional[date] = None
+
+
+class BulkSelection(BaseModel):
+    """Either explicit slugs or a filter"""
+    slugs: Optional[List[str]] = None
+    filter: Optional[ArticleFilter] = None
+
+
+class BulkStatusUpdate(BulkSelection):
+    status: str  # pending, published, rejected
+
+
+class BulkItemResult(BaseModel):
+    slug: str
+    result: str  # updated, unchanged, deleted, not_found
+    status: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    affected: int
+    items: List[BulkItemResult]
+    # A filter touches at most MAX_BULK_SLUGS articles; repeat the request
+    # while this is set
+    has_more: bool = False
+
+
 class Article(ArticleBase):
     id: int
     date: date
     status: str = "pending"
     author_id: Optional[int] = None
+    updated_at: Optional[datetime] = None
+    content_html: Optional[str] = None
+    toc: Optional[List[Dict[str, Any]]] = None
+    word_count: Optional[int] = None
+    reading_time: Optional[int] = None
 
     class Config:
         from_attributes = True
+
+
+class ArticleDetail(Article):
+    """Article as read: rendered HTML, the Markdown source only on request"""
+    content: Optional[str] = None
+
+
+class ArticleSummary(BaseModel):
+    """Article fields sent in list responses (no content)"""
+    id: int
+    title: str
+    slug: str
+    author: str
+    date: date
+    category: str
+    image: Optional[str] = None
+    excerpt: Optional[str] = None
+    status: str = "pending"
+    author_id: Optional[int] = None
+    updated_at: Optional[datetime] = None
+    reading_time: Optional[int] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ArticlePage(BaseModel):
+    items: List[ArticleSummary]
+    next_cursor: Optional[str] = None
+
+
+class SearchResult(ArticleSummary):
+    rank: float
+    snippet: Optional[str] = None
+
+
+class RelatedArticle(ArticleSummary):
+    score: float  # cosine similarity, 0..1
+
+
+class PopularArticle(ArticleSummary):
+    views: int  # over the ranking window
+    score: float  # time-decayed views
+
+
+class BatchFetch(BaseModel):
+    slugs: List[str]
+    fields: str = "summary"  # summary or full (as the detail endpoint, no source)
+
+
+class BatchItem(BaseModel):
+    slug: str
+    found: bool
+    article: Optional[Union[ArticleDetail, ArticleSummary]] = None
+
+
+class BatchResult(BaseModel):
+    items: List[BatchItem]
@@ -0,0 +1,69 @@
+"""
+Full-text search over published articles.
+
+PostgreSQL keeps a weighted ``search_vector`` generated column (french
+configuration, so terms are stemmed) behind a GIN index. SQLite, used for
+local runs and tests, mirrors the articles table into an FTS5 external
+content table kept in sync by triggers. Either way the database updates the
+index on every insert, update and delete of an article. Both are created by
+migration 0002.
+"""
+import re
+
+from sqlalchemy import Date, DateTime, text
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+
+_POSTGRES_SEARCH = text("""
+    WITH matches AS (
+        SELECT a.id, a.title, a.slug, a.author, a.date, a.category, a.image,
+               a.excerpt, a.status, a.author_id, a.updated_at, a.reading_time,
+               a.content, query,
+               ts_rank(a.search_vector, query) AS rank
+        FROM articles a, websearch_to_tsquery('french', :q) query
+        WHERE a.status = 'published' AND a.search_vector @@ query
+        ORDER BY rank DESC, a.date DESC
+        LIMIT :limit
+    )
+    SELECT id, title, slug, author, date, category, image, excerpt, status,
+           author_id, updated_at, reading_time, rank,
+           ts_headline('french', content, query,
+                       'StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10')
+               AS snippet
+    FROM matches
+    ORDER BY rank DESC, date DESC
+""").columns(date=Date, updated_at=DateTime(timezone=True))
+
+# bm25() is lower-is-better; weights follow the column order title, excerpt, content
+_SQLITE_SEARCH = text("""
+    SELECT a.id, a.title, a.slug, a.author, a.date, a.category, a.image,
+           a.excerpt, a.status, a.author_id, a.updated_at, a.reading_time,
+           -bm25(articles_fts, 10.0, 5.0, 1.0) AS rank,
+           snippet(articles_fts, 2, '<mark>', '</mark>', '…', 24) AS snippet
+    FROM articles_fts
+    JOIN articles a ON a.id = articles_fts.rowid
+    WHERE articles_fts MATCH :q AND a.status = 'published'
+    ORDER BY bm25(articles_fts, 10.0, 5.0, 1.0), a.date DESC
+    LIMIT :limit
+""").columns(date=Date, updated_at=DateTime(timezone=True))
+
+
+def _fts5_query(q: str) -> str:
+    # FTS5 has no French stemmer: prefix-match every term instead, which
+    # covers plural and most inflected forms. Quoting disables the operators.
+    terms = re.findall(r"\w+", q)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def search_published(db, q: str, limit: int = DEFAULT_SEARCH_LIMIT):
+    """Return ranked published articles matching q, with highlighted snippets"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return db.execute(_POSTGRES_SEARCH, {"q": q, "limit": limit}).all()
+    if dialect == "sqlite":
+        match = _fts5_query(q)
+        if not match:
+            return []
+        return db.execute(_SQLITE_SEARCH, {"q": match, "limit": limit}).all()
+    raise NotImplementedError(f"Full-text search is not supported on {dialect}")
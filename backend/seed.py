@@ -3,11 +3,9 @@ Script to seed the database with initial articles.
 Run with: python seed.py
 """
 from datetime import date
-from database import SessionLocal, engine
-from models import Base, Article
-
-# Create tables
-Base.metadata.create_all(bind=engine)
+from database import SessionLocal, run_migrations
+from models import Article
+from rendering import apply_rendering
 
 # Sample articles
 articles = [
@@ -126,7 +124,7 @@ def seed():
 
         # Add articles
         for article_data in articles:
-            article = Article(**article_data)
+            article = apply_rendering(Article(**article_data))
             db.add(article)
 
         db.commit()
@@ -140,4 +138,5 @@ def seed():
 
 
 if __name__ == "__main__":
+    run_migrations()
     seed()
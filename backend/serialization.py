@@ -0,0 +1,34 @@
+"""
+Fast JSON serialization for list responses.
+
+Summary rows come straight from column selects and are already typed by
+the database driver, so there is nothing for Pydantic to validate: rows are
+turned into dicts and encoded by orjson in a single pass.
+
+Full articles go through the Article schema (JSON columns, dates) once,
+when they are cached.
+"""
+import orjson
+
+from schemas import Article
+
+
+def row_dicts(rows) -> list:
+    return [row._asdict() for row in rows]
+
+
+def page_content(page: dict) -> dict:
+    return {"items": row_dicts(page["items"]), "next_cursor": page["next_cursor"]}
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content)
+
+
+def article_json(article, content: bool = False) -> bytes:
+    """
+    An Article row as the detail endpoint sends it. Readers get the rendered
+    HTML; the Markdown source is only included with content (edit forms).
+    """
+    exclude = None if content else {"content"}
+    return Article.model_validate(article).model_dump_json(exclude=exclude).encode()
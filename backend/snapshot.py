@@ -0,0 +1,275 @@
+"""
+Static snapshot of the published site, for a static host or CDN.
+
+Layout under SNAPSHOT_DIR (same JSON bodies as the API):
+
+    articles/{slug}.json        one published article (GET /api/articles/{slug})
+    lists/all/{n}.json          published summaries, newest first, in pages
+    lists/{category}/{n}.json   the same for one category (lower case)
+    manifest.json               every file with its ETag, plus list page counts
+
+A file is only rewritten when its bytes change. Files are written to a
+temporary name and renamed, and manifest.json is swapped the same way once
+everything it lists is in place; files that dropped out are removed after
+the swap. A host syncing from the manifest never sees a half-written
+snapshot.
+
+An export is either full (everything re-rendered, unchanged files skipped)
+or limited to some slugs: their article files, the global list and the
+lists of their current and previous categories. The app records the slugs
+its write endpoints change (events.py), and POST /api/snapshot exports
+just those. Those marks live in memory, so the first export after a start
+is a full one.
+
+Run from backend/:
+    python snapshot.py                   # full export into SNAPSHOT_DIR
+    python snapshot.py --slug a --slug b # only what these articles affect
+"""
+import argparse
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+import orjson
+
+import crud
+from events import Event, bus
+from http_cache import make_etag
+from models import utcnow
+from pagination import MAX_PAGE_SIZE
+from serialization import article_json, dumps
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "snapshot")
+SNAPSHOT_PAGE_SIZE = int(os.getenv("SNAPSHOT_PAGE_SIZE", str(MAX_PAGE_SIZE)))
+MANIFEST = "manifest.json"
+ALL = "all"
+
+# Slugs and categories are user input: anything else could escape the directory
+_SAFE_SLUG = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]*")
+
+
+class SnapshotBusy(Exception):
+    pass
+
+
+def article_path(slug: str) -> str:
+    return f"articles/{slug}.json"
+
+
+def list_path(name: str, page: int) -> str:
+    return f"lists/{name}/{page}.json"
+
+
+class Snapshot:
+    def __init__(self, root: str = SNAPSHOT_DIR, page_size: int = SNAPSHOT_PAGE_SIZE):
+        self.root = root
+        self.page_size = page_size
+        # Held by the running export
+        self._lock = threading.Lock()
+        # Slugs changed since the last export (see apply); changes made
+        # before this process started are unknown, hence a full export first
+        self._pending = set()
+        self._full_needed = True
+        # Guards the two above: apply runs on the event loop, exports in a
+        # worker thread
+        self._marks_lock = threading.Lock()
+
+    # Change tracking
+
+    def apply(self, event: Event):
+        """Bus listener: remember articles whose published version changed"""
+        data = event.data
+        if event.type == "articles.imported":
+            with self._marks_lock:
+                self._full_needed = True
+            return
+        if event.type in ("article.created", "article.deleted"):
+            changed = data["status"] == "published"
+        else:
+            # previous_status is None for bulk changes, where it is unknown
+            changed = data["status"] == "published" or data.get("previous_status") in (
+                "published", None
+            )
+        if changed:
+            with self._marks_lock:
+                self._pending.add(data["slug"])
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    # Files
+
+    def _read_manifest(self) -> Optional[dict]:
+        try:
+            with open(os.path.join(self.root, MANIFEST), "rb") as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            return None
+
+    def _write_file(self, path: str, body: bytes):
+        target = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temporary = f"{target}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, target)
+
+    def _remove_file(self, path: str):
+        try:
+            os.remove(os.path.join(self.root, path))
+        except FileNotFoundError:
+            pass
+
+    # Rendering
+
+    def _list_files(self, name: str, rows) -> Dict[str, bytes]:
+        items = [row._asdict() for row in rows]
+        pages = max(1, -(-len(items) // self.page_size))
+        files = {}
+        for page in range(1, pages + 1):
+            next_cursor = list_path(name, page + 1) if page < pages else None
+            chunk = items[(page - 1) * self.page_size:page * self.page_size]
+            files[list_path(name, page)] = dumps({"items": chunk, "next_cursor": next_cursor})
+        return files
+
+    @staticmethod
+    def _article_body(article) -> bytes:
+        return article_json(article)
+
+    # Export
+
+    def export(self, db, slugs: Optional[List[str]] = None) -> dict:
+        """
+        Export everything (slugs None, or no snapshot yet) or only what the
+        given slugs affect. Raises SnapshotBusy if an export is running.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise SnapshotBusy()
+        try:
+            return self._export(db, slugs)
+        finally:
+            self._lock.release()
+
+    def export_pending(self, db) -> dict:
+        """
+        Export what changed through the app since the last export. If it
+        fails (SnapshotBusy included) the changes stay pending.
+        """
+        with self._marks_lock:
+            full, self._full_needed = self._full_needed, False
+            slugs, self._pending = self._pending, set()
+        try:
+            return self.export(db) if full else self.export(db, sorted(slugs))
+        except Exception:
+            with self._marks_lock:
+                self._full_needed = self._full_needed or full
+                self._pending |= slugs
+            raise
+
+    def _export(self, db, slugs: Optional[List[str]]) -> dict:
+        started = time.perf_counter()
+        previous = self._read_manifest()
+        full = slugs is None or previous is None
+        old_files: Dict[str, str] = previous["files"] if previous else {}
+        old_articles: Dict[str, str] = previous["articles"] if previous else {}
+
+        files: Dict[str, str] = {}  # path -> ETag, for the new manifest
+        articles: Dict[str, str] = {}  # slug -> category
+        report = {"mode": "full" if full else "incremental", "written": 0, "unchanged": 0,
+                  "deleted": 0, "skipped": 0}
+
+        def put(path: str, body: bytes):
+            etag = make_etag(body)
+            files[path] = etag
+            if old_files.get(path) == etag and os.path.exists(os.path.join(self.root, path)):
+                report["unchanged"] += 1
+            else:
+                self._write_file(path, body)
+                report["written"] += 1
+
+        def put_article(article):
+            if not _SAFE_SLUG.fullmatch(article.slug):
+                report["skipped"] += 1
+                return
+            articles[article.slug] = article.category
+            put(article_path(article.slug), self._article_body(article))
+
+        if full:
+            for article in crud.published_articles(db):
+                put_article(article)
+            by_category: Dict[str, list] = {}
+            summaries = crud.published_summaries(db)
+            for row in summaries:
+                by_category.setdefault(row.category, []).append(row)
+            lists = {ALL: summaries, **{c.lower(): rows for c, rows in by_category.items()}}
+        else:
+            # Keep every untouched article and list page as it is
+            files.update(old_files)
+            articles.update(old_articles)
+            categories = set()
+            for slug in slugs:
+                if slug in articles:
+                    categories.add(articles.pop(slug))
+                    files.pop(article_path(slug), None)
+            for article in crud.published_articles(db, slugs):
+                put_article(article)
+                categories.add(article.category)
+            touched = {ALL} | {category.lower() for category in categories}
+            for name, pages in previous["lists"].items():
+                if name in touched:
+                    for page in range(1, pages + 1):
+                        files.pop(list_path(name, page), None)
+            lists = {ALL: crud.published_summaries(db)}
+            for category in categories:
+                lists[category.lower()] = crud.published_summaries(db, category)
+
+        list_pages = {} if full else dict(previous["lists"])
+        for name, rows in lists.items():
+            if name != ALL and not _SAFE_SLUG.fullmatch(name):
+                report["skipped"] += 1
+                continue
+            if name != ALL and not rows:
+                list_pages.pop(name, None)
+                continue
+            rendered = self._list_files(name, rows)
+            for path, body in rendered.items():
+                put(path, body)
+            list_pages[name] = len(rendered)
+
+        manifest = {
+            "generated_at": utcnow().isoformat(),
+            "page_size": self.page_size,
+            "lists": dict(sorted(list_pages.items())),
+            "articles": dict(sorted(articles.items())),
+            "files": dict(sorted(files.items())),
+        }
+        self._write_file(MANIFEST, orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+
+        # Only now nothing refers to them any more
+        for path in old_files.keys() - files.keys():
+            self._remove_file(path)
+            report["deleted"] += 1
+        report["files"] = len(files)
+        report["seconds"] = round(time.perf_counter() - started, 3)
+        return report
+
+
+snapshot = Snapshot()
+bus.add_listener(snapshot.apply)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dir", default=SNAPSHOT_DIR, help="output directory")
+    parser.add_argument("--slug", action="append", help="only export what this article affects")
+    args = parser.parse_args()
+
+    from database import SessionLocal
+
+    with SessionLocal() as db:
+        print(orjson.dumps(Snapshot(args.dir).export(db, args.slug)).decode())
@@ -0,0 +1,132 @@
+"""
+Shared fixtures: a migrated SQLite database with a small corpus, and a
+TestClient on the app. DATABASE_URL is set before the app is imported.
+
+Run from backend/:
+    pip install -r requirements-dev.txt
+    python -m pytest
+"""
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_db_dir = tempfile.mkdtemp(prefix="devstories-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ["DB_ASYNC"] = "false"
+os.environ.setdefault("READ_REPLICA_URLS", "")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+from auth import create_access_token, principal_cache  # noqa: E402
+from cache import article_cache  # noqa: E402
+from database import SessionLocal, run_migrations  # noqa: E402
+from hashing import get_password_hash  # noqa: E402
+from models import Article, User  # noqa: E402
+from rendering import apply_rendering  # noqa: E402
+
+CATEGORIES = ["IA", "RH", "CLOUD"]
+ARTICLES = 30
+AUTHOR_EMAIL = "author@example.com"
+ADMIN_EMAIL = "admin@example.com"
+
+
+def _seed():
+    db = SessionLocal()
+    try:
+        hashed = get_password_hash("password")
+        author = User(email=AUTHOR_EMAIL, name="Author", hashed_password=hashed)
+        admin = User(email=ADMIN_EMAIL, name="Admin", hashed_password=hashed, is_admin=True)
+        db.add_all([author, admin])
+        db.flush()
+        for i in range(ARTICLES):
+            db.add(apply_rendering(Article(
+                title=f"Kubernetes et cache HTTP, partie {i}",
+                slug=f"article-{i}",
+                author=author.name,
+                author_id=author.id,
+                date=date(2026, 1, 31) - timedelta(days=i),
+                category=CATEGORIES[i % len(CATEGORIES)],
+                excerpt=f"Extrait {i}",
+                content=f"# Partie {i}\n\nLe cluster Kubernetes et le cache HTTP, partie {i}.",
+                status="published" if i % 5 else "pending",
+            )))
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def database():
+    """The migrated, seeded database, for tests that use its sessions directly"""
+    run_migrations()
+    _seed()
+
+
+@pytest.fixture(scope="session")
+def client(database):
+    # No lifespan: the background index build and view flusher would run
+    # queries of their own while budgets are being measured
+    return TestClient(main.app)
+
+
+@pytest.fixture(autouse=True)
+def cold_caches():
+    """Every test starts from the uncached path"""
+    article_cache.clear()
+    principal_cache.clear()
+    yield
+
+
+@pytest.fixture
+def seeded_published():
+    """Slugs of the seeded published articles, newest first"""
+    return [f"article-{i}" for i in range(ARTICLES) if i % 5]
+
+
+def _bearer(email: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': email})}"}
+
+
+@pytest.fixture
+def author_headers():
+    return _bearer(AUTHOR_EMAIL)
+
+
+@pytest.fixture
+def admin_headers():
+    return _bearer(ADMIN_EMAIL)
+
+
+@pytest.fixture
+def make_article(client, author_headers, admin_headers):
+    """
+    Create articles through the API, so events and cache invalidation run as
+    in production; they are deleted again after the test. Tests that write
+    use their own articles and leave the seeded corpus alone.
+    """
+    created = []
+
+    def make(slug: str, category: str = "TEST", status: str = "published", **fields) -> dict:
+        body = {
+            "title": f"Article {slug}", "slug": slug, "category": category,
+            "content": f"# {slug}\n\nContenu de {slug}.", **fields,
+        }
+        response = client.post("/api/articles", json=body, headers=author_headers)
+        assert response.status_code == 200, response.text
+        created.append(slug)
+        if status != "pending":
+            response = client.put(
+                f"/api/articles/{slug}/status", json={"status": status}, headers=admin_headers
+            )
+            assert response.status_code == 200, response.text
+        return response.json()
+
+    yield make
+    for slug in created:
+        client.delete(f"/api/articles/{slug}", headers=admin_headers)
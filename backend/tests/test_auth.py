@@ -0,0 +1,53 @@
+"""
+Stream tickets: the event stream never takes the access token from the
+query string, only a short-lived ticket, once.
+"""
+from datetime import timedelta
+
+from jose import jwt
+
+from auth import ALGORITHM, SECRET_KEY, STREAM_TICKET_TYPE, redeem_stream_ticket
+
+
+def ticket(client, headers):
+    response = client.post("/api/events/ticket", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["ticket"]
+
+
+def test_ticket_is_single_use(client, admin_headers):
+    issued = ticket(client, admin_headers)
+    email = client.get("/api/auth/me", headers=admin_headers).json()["email"]
+    assert redeem_stream_ticket(issued) == email
+    assert redeem_stream_ticket(issued) is None
+
+
+def test_expired_ticket(client, admin_headers):
+    payload = jwt.decode(ticket(client, admin_headers), SECRET_KEY, algorithms=[ALGORITHM])
+    payload["exp"] -= timedelta(minutes=5).total_seconds()
+    assert redeem_stream_ticket(jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)) is None
+
+
+def test_access_token_is_not_a_ticket(admin_headers):
+    token = admin_headers["Authorization"].split()[1]
+    assert redeem_stream_ticket(token) is None
+
+
+def test_ticket_is_not_an_access_token(client, admin_headers):
+    issued = ticket(client, admin_headers)
+    assert jwt.get_unverified_claims(issued)["typ"] == STREAM_TICKET_TYPE
+    response = client.get("/api/auth/me", headers={"Authorization": f"Bearer {issued}"})
+    assert response.status_code == 401
+
+
+def test_stream_rejects_token_in_query(client, admin_headers):
+    token = admin_headers["Authorization"].split()[1]
+    response = client.get("/api/events/moderation", params={"access_token": token})
+    assert response.status_code == 401
+    response = client.get("/api/events/moderation", params={"ticket": token})
+    assert response.status_code == 401
+
+
+def test_tickets_are_for_admins(client, author_headers):
+    assert client.post("/api/events/ticket", headers=author_headers).status_code == 403
+    assert client.post("/api/events/ticket").status_code == 401
@@ -0,0 +1,85 @@
+"""
+Bulk status changes and deletes: explicit slugs are capped per request,
+filter selections are processed MAX_BULK_SLUGS rows at a time.
+"""
+import pytest
+
+import crud
+
+
+@pytest.fixture
+def small_cap(monkeypatch):
+    monkeypatch.setattr(crud, "MAX_BULK_SLUGS", 2)
+
+
+def bulk(client, headers, action, body):
+    response = client.post(f"/api/articles/bulk/{action}", json=body, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_status_by_slugs(client, admin_headers, make_article):
+    make_article("bulk-a", status="pending")
+    make_article("bulk-b")
+    result = bulk(client, admin_headers, "status", {
+        "slugs": ["bulk-a", "bulk-b", "bulk-missing"], "status": "published"
+    })
+    assert result["affected"] == 1
+    assert result["has_more"] is False
+    assert [(item["slug"], item["result"]) for item in result["items"]] == [
+        ("bulk-a", "updated"), ("bulk-b", "unchanged"), ("bulk-missing", "not_found")
+    ]
+    assert client.get("/api/articles/bulk-a").json()["status"] == "published"
+
+
+def test_too_many_slugs(client, admin_headers, small_cap):
+    response = client.post("/api/articles/bulk/delete", json={"slugs": ["a", "b", "c"]},
+                           headers=admin_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("body", [
+    {"filter": {}},
+    {"slugs": ["a"], "filter": {"status": "pending"}},
+    {},
+])
+def test_invalid_selection(client, admin_headers, body):
+    response = client.post("/api/articles/bulk/delete", json=body, headers=admin_headers)
+    assert response.status_code == 400
+
+
+def test_requires_admin(client, author_headers):
+    response = client.post("/api/articles/bulk/delete", json={"slugs": ["article-1"]},
+                           headers=author_headers)
+    assert response.status_code == 403
+
+
+def test_status_by_filter_in_batches(client, admin_headers, make_article, small_cap):
+    for i in range(5):
+        make_article(f"bulk-filter-{i}", category="BULK", status="pending")
+    selection = {"filter": {"category": "BULK", "status": "pending"}, "status": "published"}
+
+    affected = []
+    while True:
+        result = bulk(client, admin_headers, "status", selection)
+        assert result["affected"] <= 2
+        affected.append(result["affected"])
+        if not result["has_more"]:
+            break
+    assert affected == [2, 2, 1]
+    page = client.get("/api/articles", params={"category": "BULK"}).json()
+    assert len(page["items"]) == 5
+    # Nothing left to match
+    assert bulk(client, admin_headers, "status", selection)["affected"] == 0
+
+
+def test_delete_by_filter_in_batches(client, admin_headers, make_article, small_cap):
+    for i in range(3):
+        make_article(f"bulk-delete-{i}", category="BULKDEL")
+
+    first = bulk(client, admin_headers, "delete", {"filter": {"category": "BULKDEL"}})
+    assert (first["affected"], first["has_more"]) == (2, True)
+    second = bulk(client, admin_headers, "delete", {"filter": {"category": "BULKDEL"}})
+    assert (second["affected"], second["has_more"]) == (1, False)
+    assert client.get("/api/articles", params={"category": "BULKDEL"}).json()["items"] == []
+    assert client.get("/api/articles/bulk-delete-0").status_code == 404
@@ -0,0 +1,99 @@
+"""
+Read-through caching: writes invalidate the cached article and list pages,
+and conditional GETs get 304s per representation.
+"""
+import pytest
+
+from cache import article_cache, article_key
+
+
+def test_update_invalidates_cached_article(client, author_headers, make_article):
+    make_article("cache-update")
+    assert client.get("/api/articles/cache-update").json()["title"] == "Article cache-update"
+    assert article_cache.get(article_key("cache-update"), None) is not None
+
+    response = client.put(
+        "/api/articles/cache-update", json={"title": "Nouveau titre"}, headers=author_headers
+    )
+    assert response.status_code == 200
+    assert client.get("/api/articles/cache-update").json()["title"] == "Nouveau titre"
+
+
+def test_publish_invalidates_cached_list(client, make_article):
+    make_article("cache-list-old", category="CACHE")
+    first = client.get("/api/articles", params={"category": "CACHE"}).json()
+    assert [item["slug"] for item in first["items"]] == ["cache-list-old"]
+
+    make_article("cache-list-new", category="CACHE")
+    page = client.get("/api/articles", params={"category": "CACHE"}).json()
+    assert {item["slug"] for item in page["items"]} == {"cache-list-old", "cache-list-new"}
+    assert "cache-list-new" in [item["slug"] for item in client.get("/api/articles").json()["items"]]
+
+
+def test_unpublish_invalidates_cached_list(client, admin_headers, make_article):
+    make_article("cache-gone", category="CACHE")
+    assert client.get("/api/articles", params={"category": "CACHE"}).json()["items"]
+
+    client.put("/api/articles/cache-gone/status", json={"status": "rejected"}, headers=admin_headers)
+    assert client.get("/api/articles", params={"category": "CACHE"}).json()["items"] == []
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "br", "identity"])
+def test_etag_per_encoding(client, encoding):
+    # Long enough to be compressed
+    response = client.get("/api/articles", params={"limit": 20}, headers={"Accept-Encoding": encoding})
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    if encoding == "identity":
+        assert "-" not in etag
+        assert "content-encoding" not in response.headers
+    else:
+        assert etag.endswith(f'-{encoding}"')
+        assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    again = client.get(
+        "/api/articles", params={"limit": 20},
+        headers={"Accept-Encoding": encoding, "If-None-Match": etag}
+    )
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    assert again.content == b""
+
+
+def test_etag_of_another_encoding_still_matches(client):
+    gzip_etag = client.get(
+        "/api/articles", params={"limit": 20}, headers={"Accept-Encoding": "gzip"}
+    ).headers["etag"]
+    response = client.get(
+        "/api/articles", params={"limit": 20},
+        headers={"Accept-Encoding": "br", "If-None-Match": gzip_etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"].endswith('-br"')
+
+
+def test_changed_article_fails_old_etag(client, author_headers, make_article):
+    make_article("cache-etag")
+    etag = client.get("/api/articles/cache-etag").headers["etag"]
+    client.put("/api/articles/cache-etag", json={"excerpt": "Autre extrait"}, headers=author_headers)
+    response = client.get("/api/articles/cache-etag", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_cache_control(client, author_headers, make_article):
+    make_article("cache-control")
+    make_article("cache-control-pending", status="pending")
+    # Published: storable, but revalidated before every use
+    assert client.get("/api/articles/cache-control").headers["cache-control"] == (
+        "public, max-age=0, must-revalidate"
+    )
+    assert client.get("/api/articles/cache-control-pending").headers["cache-control"] == (
+        "private, no-cache"
+    )
+    # The edit form's copy, with the Markdown source, is never shared
+    response = client.get("/api/articles/cache-control?content=true", headers=author_headers)
+    assert response.headers["cache-control"] == "private, no-cache"
+    assert response.json()["content"].startswith("# cache-control")
+    assert "content" not in client.get("/api/articles/cache-control").json()
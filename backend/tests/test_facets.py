@@ -0,0 +1,56 @@
+"""
+Facet counts follow status changes without a recount, and bulk changes
+(previous status unknown) trigger one.
+"""
+
+
+def facets(client, headers=None):
+    response = client.get("/api/articles/facets", headers=headers or {})
+    assert response.status_code == 200
+    return response.json()
+
+
+def counts(client, headers, category="FACETS"):
+    return facets(client, headers)["by_category"].get(category, {})
+
+
+def test_counts_follow_status_changes(client, admin_headers, make_article):
+    before = facets(client, admin_headers)
+    make_article("facets-a", category="FACETS", status="pending")
+    assert counts(client, admin_headers) == {"pending": 1}
+
+    client.put("/api/articles/facets-a/status", json={"status": "published"}, headers=admin_headers)
+    assert counts(client, admin_headers) == {"published": 1}
+    after = facets(client, admin_headers)
+    assert after["total"] == before["total"] + 1
+    assert after["statuses"]["published"] == before["statuses"]["published"] + 1
+    # Events were applied in place, no recount happened
+    assert after["reconciled_at"] == before["reconciled_at"]
+
+    client.delete("/api/articles/facets-a", headers=admin_headers)
+    assert counts(client, admin_headers) == {}
+
+
+def test_category_change_moves_the_count(client, author_headers, admin_headers, make_article):
+    make_article("facets-move", category="FACETS")
+    client.put("/api/articles/facets-move", json={"category": "FACETS2"}, headers=author_headers)
+    assert counts(client, admin_headers) == {}
+    assert counts(client, admin_headers, "FACETS2") == {"published": 1}
+
+
+def test_bulk_change_is_recounted(client, admin_headers, make_article):
+    for i in range(3):
+        make_article(f"facets-bulk-{i}", category="FACETS", status="pending")
+    response = client.post("/api/articles/bulk/status", json={
+        "filter": {"category": "FACETS"}, "status": "rejected"
+    }, headers=admin_headers)
+    assert response.json()["affected"] == 3
+    assert counts(client, admin_headers) == {"rejected": 3}
+
+
+def test_visitors_only_see_published(client, admin_headers, make_article):
+    make_article("facets-public", category="FACETS")
+    make_article("facets-hidden", category="FACETS", status="pending")
+    assert counts(client, None) == {"published": 1}
+    assert set(facets(client)["statuses"]) == {"published"}
+    assert counts(client, admin_headers) == {"published": 1, "pending": 1}
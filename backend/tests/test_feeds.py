@@ -0,0 +1,53 @@
+"""
+Feeds follow published changes through events, and reload from the
+database periodically to pick up writes made by other processes.
+"""
+from datetime import date
+
+import pytest
+
+from database import SessionLocal
+from feeds import FeedCache
+from models import Article
+
+
+@pytest.fixture
+def outside_write(database):
+    """An article published without going through this process' events"""
+    with SessionLocal() as db:
+        db.add(Article(
+            title="Écrit ailleurs", slug="feeds-outside", author="CLI", date=date.today(),
+            category="FEEDS", content="x", status="published",
+        ))
+        db.commit()
+    yield "feeds-outside"
+    with SessionLocal() as db:
+        db.query(Article).filter(Article.slug == "feeds-outside").delete()
+        db.commit()
+
+
+def test_events_update_feeds(client, admin_headers, make_article):
+    make_article("feeds-event", category="FEEDS")
+    assert "feeds-event" in client.get("/api/feeds/rss.xml").text
+    assert "feeds-event" in client.get("/api/feeds/feeds/atom.xml").text
+
+    client.put("/api/articles/feeds-event/status", json={"status": "pending"}, headers=admin_headers)
+    assert "feeds-event" not in client.get("/api/feeds/rss.xml").text
+
+
+def test_reload_picks_up_outside_writes(outside_write, monkeypatch):
+    feeds = FeedCache(reload_seconds=300)
+    rss = feeds.build(SessionLocal, ("rss", None))
+    assert feeds.cached(("rss", None)) is rss
+
+    monkeypatch.setattr(feeds, "reload_seconds", 0)
+    assert feeds.cached(("rss", None)) is None
+    assert outside_write.encode() in feeds.build(SessionLocal, ("rss", None)).body
+
+
+def test_unchanged_reload_keeps_documents(database):
+    feeds = FeedCache(reload_seconds=0)
+    first = feeds.build(SessionLocal, ("atom", None))
+    builds = feeds.builds
+    assert feeds.build(SessionLocal, ("atom", None)) is first
+    assert feeds.builds == builds
@@ -0,0 +1,66 @@
+"""
+Query budgets for the main endpoints. A budget failure lists the
+statements that ran; a statement shape repeated per row is an N+1.
+"""
+import pytest
+
+from diagnostics import assert_max_queries
+
+
+def get_ok(client, url, **kwargs):
+    response = client.get(url, **kwargs)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_list_first_page(client):
+    with assert_max_queries(1):
+        page = get_ok(client, "/api/articles", params={"limit": 10})
+    assert len(page["items"]) == 10
+
+
+def test_list_next_page(client):
+    cursor = get_ok(client, "/api/articles", params={"limit": 10})["next_cursor"]
+    with assert_max_queries(1):
+        page = get_ok(client, "/api/articles", params={"limit": 10, "cursor": cursor})
+    assert page["items"]
+
+
+def test_list_category(client):
+    with assert_max_queries(1):
+        page = get_ok(client, "/api/articles", params={"category": "IA"})
+    assert {item["category"] for item in page["items"]} == {"IA"}
+
+
+def test_article_detail(client):
+    with assert_max_queries(1):
+        article = get_ok(client, "/api/articles/article-1")
+    assert article["content_html"]
+
+
+def test_search(client):
+    with assert_max_queries(1):
+        results = get_ok(client, "/api/articles/search", params={"q": "kubernetes"})
+    assert results
+
+
+def test_my_articles(client, author_headers):
+    # The user lookup behind the token, then one page
+    with assert_max_queries(2, max_repeats=1):
+        page = get_ok(client, "/api/articles/my", headers=author_headers)
+    assert page["items"]
+
+
+@pytest.mark.parametrize("url", ["/api/articles/all", "/api/articles/pending"])
+def test_admin_listings(client, admin_headers, url):
+    with assert_max_queries(2, max_repeats=1):
+        page = get_ok(client, url, headers=admin_headers)
+    assert page["items"]
+
+
+def test_batch_fetch(client):
+    slugs = [f"article-{i}" for i in range(1, 10)]
+    with assert_max_queries(1):
+        response = client.post("/api/articles/batch", json={"slugs": slugs, "fields": "full"})
+    assert response.status_code == 200
+    assert all(item["found"] for item in response.json()["items"])
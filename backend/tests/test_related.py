@@ -0,0 +1,80 @@
+"""
+Related articles index: stale marks survive a rebuild, so lookups never
+miss an article published since the last build.
+"""
+import pytest
+
+import crud
+from database import SessionLocal
+from events import Event
+from related import RelatedIndex
+
+
+def published(slug: str) -> Event:
+    return Event(1, "article.status", {
+        "slug": slug, "category": "IA", "status": "published", "previous_status": "pending"
+    })
+
+
+@pytest.fixture
+def index(database):
+    index = RelatedIndex(dimensions=64)
+    index.reload(SessionLocal)
+    assert index.ready
+    return index
+
+
+def test_neighbours_share_words(index):
+    items = index.neighbours("article-1")
+    assert items and all(item["slug"] != "article-1" for item in items)
+    assert index.neighbours("article-0") is None  # pending
+
+
+def test_reload_keeps_marks(index):
+    index.apply(published("article-0"))
+    index.reload(SessionLocal)
+    # Still looked up on the next request, whatever the rebuild read
+    assert "article-0" in index.take_stale()
+
+
+def test_marks_made_during_reload_are_reapplied(index, monkeypatch):
+    rows = crud.related_rows
+
+    def read_then_publish(db, slugs=None):
+        result = rows(db, slugs)
+        # Published after the rebuild read its rows
+        index.apply(published("article-5"))
+        assert index.take_stale() == ["article-5"]
+        return result
+
+    monkeypatch.setattr(crud, "related_rows", read_then_publish)
+    index.reload(SessionLocal)
+    assert index.take_stale() == ["article-5"]
+
+
+def test_failed_reload_is_retried(index, monkeypatch):
+    def fail(db, slugs=None):
+        raise RuntimeError("database down")
+
+    monkeypatch.setattr(crud, "related_rows", fail)
+    index.mark_stale(["article-1"])
+    index.reload(SessionLocal)
+    assert index.needs_reload()
+    assert index.take_stale() == ["article-1"]
+
+
+def test_unknown_slug_while_rebuilding(client, monkeypatch):
+    from main import related_index
+
+    if not related_index.ready:
+        related_index.reload(SessionLocal)
+    monkeypatch.setattr(related_index, "needs_reload", lambda: False)
+    assert client.get("/api/articles/no-such-article/related").status_code == 404
+
+    related_index._loading.acquire()
+    try:
+        response = client.get("/api/articles/no-such-article/related")
+    finally:
+        related_index._loading.release()
+    assert response.status_code == 503
+    assert response.headers["retry-after"]
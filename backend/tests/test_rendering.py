@@ -0,0 +1,63 @@
+"""
+Write-time rendering: GitHub-flavoured Markdown, sanitized HTML.
+"""
+import pytest
+
+from rendering import render_article
+
+
+def html(content: str) -> str:
+    return render_article(content)["content_html"]
+
+
+@pytest.mark.parametrize("content, expected", [
+    ("~~barré~~", "<s>barré</s>"),
+    ("Liste :\n- un\n- deux", "<li>un</li>"),
+    ("Voir https://example.com/page", '<a href="https://example.com/page">'),
+    ("| a | b |\n|:--|--:|\n| 1 | 2 |", '<td align="right">2</td>'),
+    ("- [x] fait", 'checked disabled type="checkbox"'),
+    ("```python\nx = 1\n```", '<code class="language-python">'),
+])
+def test_gfm(content, expected):
+    assert expected in html(content)
+
+
+@pytest.mark.parametrize("content", [
+    "<script>alert(1)</script>",
+    "Texte <script>alert(1)</script> suite",
+    "<style>p { display: none }</style>",
+])
+def test_script_and_style_bodies_are_dropped(content):
+    rendered = html(content)
+    assert "<script" not in rendered and "<style" not in rendered
+    assert "alert(1)" not in rendered and "display: none" not in rendered
+
+
+@pytest.mark.parametrize("content", [
+    '<img src="x" onerror="alert(1)">',
+    '<a href="javascript:alert(1)">lien</a>',
+    "[lien](javascript:alert(1))",
+])
+def test_unsafe_attributes_are_dropped(content):
+    rendered = html(content)
+    assert "onerror" not in rendered and 'href="javascript' not in rendered
+
+
+def test_raw_inputs_are_dropped():
+    assert "<input" not in html('<input type="text" value="x">')
+
+
+def test_code_keeps_markup_as_text():
+    assert "&lt;script&gt;" in html("`<script>`")
+
+
+def test_toc_and_counts():
+    rendered = render_article("# Titre\n\n## Étape `un`\n\n## Étape `un`\n\n" + "mot " * 450)
+    assert rendered["toc"] == [
+        {"id": "titre", "title": "Titre", "level": 1},
+        {"id": "etape-un", "title": "Étape un", "level": 2},
+        {"id": "etape-un_1", "title": "Étape un", "level": 2},
+    ]
+    assert 'id="etape-un_1"' in rendered["content_html"]
+    assert rendered["reading_time"] == 3
+    assert rendered["excerpt"].startswith("mot mot")
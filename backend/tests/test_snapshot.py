@@ -0,0 +1,89 @@
+"""
+Static snapshot: the first export after a start is full, later ones only
+cover marked slugs, and a failed export keeps what was pending.
+"""
+import os
+
+import orjson
+import pytest
+
+from database import SessionLocal
+from events import Event
+from snapshot import Snapshot, SnapshotBusy
+
+
+def status_event(slug: str, status: str = "published", previous_status: str = "pending"):
+    return Event(1, "article.status", {
+        "slug": slug, "category": "IA", "status": status, "previous_status": previous_status
+    })
+
+
+@pytest.fixture
+def snapshot(database, tmp_path):
+    return Snapshot(root=str(tmp_path), page_size=10)
+
+
+def export_pending(snapshot):
+    with SessionLocal() as db:
+        return snapshot.export_pending(db)
+
+
+def test_first_export_is_full(snapshot, seeded_published):
+    report = export_pending(snapshot)
+    assert report["mode"] == "full"
+    manifest = orjson.loads(open(os.path.join(snapshot.root, "manifest.json"), "rb").read())
+    assert set(seeded_published) <= set(manifest["articles"])
+    article = orjson.loads(open(os.path.join(snapshot.root, "articles/article-1.json"), "rb").read())
+    assert article["content_html"] and "content" not in article
+
+    # Nothing marked since: an empty incremental export
+    report = export_pending(snapshot)
+    assert report["mode"] == "incremental"
+    assert report["written"] == 0
+
+
+def test_marks_drive_incremental_exports(snapshot):
+    export_pending(snapshot)
+    snapshot.apply(status_event("article-1"))
+    # Unpublished on both sides: nothing the snapshot shows
+    snapshot.apply(status_event("article-0", status="rejected"))
+    assert snapshot.pending == 1
+    report = export_pending(snapshot)
+    assert report["mode"] == "incremental"
+    assert snapshot.pending == 0
+
+
+def test_import_requests_full_export(snapshot):
+    export_pending(snapshot)
+    snapshot.apply(Event(2, "articles.imported", {"count": 3}))
+    assert export_pending(snapshot)["mode"] == "full"
+
+
+def test_busy_export_keeps_marks(snapshot):
+    snapshot.apply(status_event("article-1"))
+    snapshot._lock.acquire()
+    try:
+        with pytest.raises(SnapshotBusy):
+            export_pending(snapshot)
+    finally:
+        snapshot._lock.release()
+    assert snapshot.pending == 1
+    # The full export requested at start is still owed
+    assert export_pending(snapshot)["mode"] == "full"
+
+
+def test_failed_export_keeps_marks(snapshot, monkeypatch):
+    export_pending(snapshot)
+    snapshot.apply(Event(2, "articles.imported", {"count": 1}))
+    snapshot.apply(status_event("article-2"))
+
+    def fail(db, slugs=None):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(snapshot, "_export", fail)
+    with pytest.raises(OSError):
+        export_pending(snapshot)
+    monkeypatch.undo()
+
+    assert snapshot.pending == 1
+    assert export_pending(snapshot)["mode"] == "full"
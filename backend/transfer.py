@@ -0,0 +1,238 @@
+"""
+Bulk NDJSON export and import of articles.
+
+Export streams one JSON object per line, reading rows with yield_per so
+memory stays flat whatever the table size. Import reads NDJSON line by line,
+validates and renders each article, and inserts in batches: COPY into a temp
+table then INSERT ... ON CONFLICT DO NOTHING on PostgreSQL (psycopg2),
+executemany elsewhere. Slug conflicts and invalid lines are reported per row
+without aborting the batch.
+
+    python transfer.py export [--status published] > articles.ndjson
+    python transfer.py import articles.ndjson   (or - for stdin)
+"""
+import csv
+import io
+import json
+import sys
+from typing import Iterator, Optional
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import insert, text
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database import SessionLocal
+from models import Article, utcnow
+from rendering import render_article
+from schemas import ArticleImport
+
+EXPORT_BATCH_SIZE = 1000
+IMPORT_BATCH_SIZE = 2000
+# Per-row details kept in the report; counts are always complete
+MAX_REPORTED = 1000
+
+ARTICLE_STATUSES = ("pending", "published", "rejected")
+
+EXPORT_COLUMNS = (
+    Article.title,
+    Article.slug,
+    Article.author,
+    Article.date,
+    Article.category,
+    Article.image,
+    Article.excerpt,
+    Article.content,
+    Article.status,
+)
+
+IMPORT_COLUMNS = (
+    "title", "slug", "author", "date", "category", "image", "excerpt",
+    "content", "status", "content_html", "toc", "word_count", "reading_time",
+    "updated_at",
+)
+
+
+def export_ndjson(status: Optional[str] = None) -> Iterator[bytes]:
+    """Yield NDJSON chunks of EXPORT_BATCH_SIZE articles, oldest first"""
+    db = SessionLocal()
+    try:
+        query = db.query(*EXPORT_COLUMNS).order_by(Article.id)
+        if status:
+            query = query.filter(Article.status == status)
+        chunk = []
+        for row in query.yield_per(EXPORT_BATCH_SIZE):
+            chunk.append(orjson.dumps(row._asdict()))
+            if len(chunk) == EXPORT_BATCH_SIZE:
+                yield b"\n".join(chunk) + b"\n"
+                chunk = []
+        if chunk:
+            yield b"\n".join(chunk) + b"\n"
+    finally:
+        db.close()
+
+
+def _insert_ignoring_conflicts(dialect_name: str):
+    if dialect_name == "postgresql":
+        return postgresql.insert(Article.__table__).on_conflict_do_nothing(index_elements=["slug"])
+    if dialect_name == "sqlite":
+        return sqlite.insert(Article.__table__).on_conflict_do_nothing(index_elements=["slug"])
+    return insert(Article.__table__)
+
+
+def _executemany_batch(db, rows: list) -> set:
+    slugs = [row["slug"] for row in rows]
+    existing = {slug for (slug,) in db.query(Article.slug).filter(Article.slug.in_(slugs))}
+    fresh = [row for row in rows if row["slug"] not in existing]
+    if fresh:
+        db.execute(_insert_ignoring_conflicts(db.get_bind().dialect.name), fresh)
+    return {row["slug"] for row in fresh}
+
+
+def _copy_batch(db, rows: list) -> set:
+    columns = ", ".join(IMPORT_COLUMNS)
+    connection = db.connection()
+    connection.exec_driver_sql(
+        "CREATE TEMP TABLE IF NOT EXISTS articles_import ON COMMIT DELETE ROWS "
+        f"AS SELECT {columns} FROM articles WITH NO DATA"
+    )
+
+    # QUOTE_NONNUMERIC: None is written unquoted (NULL), "" stays an empty string
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+    for row in rows:
+        values = dict(row, toc=json.dumps(row["toc"]))
+        writer.writerow([
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in (values[column] for column in IMPORT_COLUMNS)
+        ])
+    buffer.seek(0)
+
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY articles_import ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+    result = connection.execute(text(
+        f"INSERT INTO articles ({columns}) SELECT {columns} FROM articles_import "
+        "ON CONFLICT (slug) DO NOTHING RETURNING slug"
+    ))
+    return {slug for (slug,) in result}
+
+
+class Importer:
+    """Accumulates NDJSON lines into batches and records per-row outcomes"""
+
+    def __init__(self, batch_size: int = IMPORT_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.pending = []
+        self.inserted = 0
+        self.conflict_count = 0
+        self.error_count = 0
+        self.conflicts = []
+        self.errors = []
+
+    def _conflict(self, line_no: int, slug: str):
+        self.conflict_count += 1
+        if len(self.conflicts) < MAX_REPORTED:
+            self.conflicts.append({"line": line_no, "slug": slug})
+
+    def _error(self, line_no: int, error: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED:
+            self.errors.append({"line": line_no, "error": error})
+
+    def add_line(self, line_no: int, line) -> bool:
+        """Queue one line; True when a full batch is ready to be written"""
+        if line.strip():
+            self.pending.append((line_no, line))
+        return len(self.pending) >= self.batch_size
+
+    def take_batch(self) -> list:
+        batch, self.pending = self.pending, []
+        return batch
+
+    def prepare(self, batch: list) -> list:
+        """Parse, validate and render a batch (CPU only, no database access)"""
+        prepared = []
+        seen = set()
+        for line_no, line in batch:
+            try:
+                article = ArticleImport.model_validate(orjson.loads(line))
+            except orjson.JSONDecodeError as exc:
+                self._error(line_no, f"Invalid JSON: {exc}")
+                continue
+            except ValidationError as exc:
+                self._error(line_no, str(exc.errors()[0]["msg"]))
+                continue
+            if article.status not in ARTICLE_STATUSES:
+                self._error(line_no, f"Invalid status: {article.status}")
+                continue
+            if article.slug in seen:
+                self._conflict(line_no, article.slug)
+                continue
+            seen.add(article.slug)
+
+            row = article.model_dump()
+            row.update(render_article(article.content, article.excerpt))
+            row["updated_at"] = utcnow()
+            prepared.append((line_no, row))
+        return prepared
+
+    def write(self, db, prepared: list):
+        """Insert a prepared batch in one transaction"""
+        if not prepared:
+            return
+        rows = [row for _, row in prepared]
+        bind = db.get_bind()
+        if bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2":
+            inserted = _copy_batch(db, rows)
+        else:
+            inserted = _executemany_batch(db, rows)
+        db.commit()
+
+        self.inserted += len(inserted)
+        for line_no, row in prepared:
+            if row["slug"] not in inserted:
+                self._conflict(line_no, row["slug"])
+
+    def report(self) -> dict:
+        return {
+            "inserted": self.inserted,
+            "conflict_count": self.conflict_count,
+            "error_count": self.error_count,
+            "conflicts": self.conflicts,
+            "errors": self.errors,
+        }
+
+
+def import_file(stream, batch_size: int = IMPORT_BATCH_SIZE) -> dict:
+    importer = Importer(batch_size)
+    db = SessionLocal()
+    try:
+        for line_no, line in enumerate(stream, start=1):
+            if importer.add_line(line_no, line):
+                importer.write(db, importer.prepare(importer.take_batch()))
+        importer.write(db, importer.prepare(importer.take_batch()))
+    finally:
+        db.close()
+    return importer.report()
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    if command == "export":
+        status = sys.argv[sys.argv.index("--status") + 1] if "--status" in sys.argv else None
+        for chunk in export_ndjson(status):
+            sys.stdout.buffer.write(chunk)
+    elif command == "import" and len(sys.argv) > 2:
+        path = sys.argv[2]
+        if path == "-":
+            report = import_file(sys.stdin.buffer)
+        else:
+            with open(path, "rb") as source:
+                report = import_file(source)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print("Usage: python transfer.py export [--status STATUS] | import FILE")
+        sys.exit(1)
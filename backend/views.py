@@ -0,0 +1,203 @@
+"""
+Write-behind article view counters and the "most read" ranking.
+
+get_article counts views in memory; a background task writes them every
+VIEW_FLUSH_SECONDS (sooner once VIEW_FLUSH_MAX_PENDING views are waiting)
+as one batched upsert into article_views, a row per article and UTC day.
+A crash loses at most the views counted since the last flush.
+
+The ranking is a time-decayed view count (half-life VIEW_HALF_LIFE_HOURS)
+kept in memory. Each flush adds the flushed views to it and rebuilds the
+popular list; every VIEW_RELOAD_SECONDS it is reloaded from the last
+VIEW_RANKING_DAYS of article_views, which also brings in the views other
+processes flushed.
+"""
+import asyncio
+import heapq
+import logging
+import math
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+import crud
+from events import Event, bus
+
+VIEW_FLUSH_SECONDS = float(os.getenv("VIEW_FLUSH_SECONDS", "10"))
+VIEW_FLUSH_MAX_PENDING = int(os.getenv("VIEW_FLUSH_MAX_PENDING", "10000"))
+VIEW_HALF_LIFE_HOURS = float(os.getenv("VIEW_HALF_LIFE_HOURS", "24"))
+VIEW_RANKING_DAYS = int(os.getenv("VIEW_RANKING_DAYS", "14"))
+VIEW_RELOAD_SECONDS = float(os.getenv("VIEW_RELOAD_SECONDS", "300"))
+# Length of the precomputed popular list; the endpoint's maximum limit
+POPULAR_SIZE = 50
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ViewCounter:
+    """
+    Pending counts are only touched from the event loop (get_article and the
+    flush task), so they need no lock.
+    """
+
+    def __init__(
+        self,
+        half_life_hours: float = VIEW_HALF_LIFE_HOURS,
+        flush_seconds: float = VIEW_FLUSH_SECONDS,
+        max_pending: int = VIEW_FLUSH_MAX_PENDING,
+    ):
+        self.rate = math.log(2) / (half_life_hours * 3600)
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._pending: Dict[str, int] = {}
+        self._pending_total = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        # slug -> views * exp(rate * (t - epoch)); rescaled before it overflows
+        self._epoch = time.time()
+        self._scores: Dict[str, float] = {}
+        self._recent_views: Dict[str, int] = {}
+        self._loaded_at: Optional[float] = None
+        self._summaries_stale = False
+        self.popular: List[dict] = []
+        self.flushed = 0
+        self.flush_failures = 0
+
+    def hit(self, slug: str):
+        self._pending[slug] = self._pending.get(slug, 0) + 1
+        self._pending_total += 1
+        if self._pending_total >= self.max_pending and self._wakeup is not None:
+            self._wakeup.set()
+
+    def apply(self, event: Event):
+        """Bus listener: refetch the popular summaries after article changes"""
+        if event.type != "article.created":
+            self._summaries_stale = True
+
+    def _add(self, slug: str, views: int, at: float):
+        weight = math.exp(self.rate * (at - self._epoch))
+        self._scores[slug] = self._scores.get(slug, 0.0) + views * weight
+        self._recent_views[slug] = self._recent_views.get(slug, 0) + views
+
+    def _rescale(self, now: float):
+        # Keep exponents small; scores that decayed to nothing are dropped
+        if self.rate * (now - self._epoch) < 30:
+            return
+        factor = math.exp(-self.rate * (now - self._epoch))
+        self._scores = {
+            slug: score * factor for slug, score in self._scores.items() if score * factor >= 1e-3
+        }
+        self._recent_views = {slug: self._recent_views[slug] for slug in self._scores}
+        self._epoch = now
+
+    def _load(self, rows, now: float):
+        """Rebuild the ranking from (slug, day, views) rows"""
+        self._epoch = now
+        self._scores = {}
+        self._recent_views = {}
+        for slug, day, views in rows:
+            # A day's views are taken to have happened at its midpoint
+            midday = datetime(day.year, day.month, day.day, 12, tzinfo=timezone.utc)
+            self._add(slug, views, min(midday.timestamp(), now))
+        self._loaded_at = time.monotonic()
+
+    def score(self, slug: str, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        return self._scores.get(slug, 0.0) * math.exp(-self.rate * (now - self._epoch))
+
+    def _candidates(self, now: float) -> List[tuple]:
+        """(slug, score, recent views) of the best ranked slugs"""
+        # Extra candidates make up for unpublished articles dropped later
+        slugs = heapq.nlargest(POPULAR_SIZE * 2, self._scores, key=self._scores.__getitem__)
+        return [(slug, round(self.score(slug, now), 4), self._recent_views[slug]) for slug in slugs]
+
+    @staticmethod
+    def _popular(session_factory, candidates: List[tuple]) -> List[dict]:
+        """Published summaries for candidates, best first (worker thread)"""
+        if not candidates:
+            return []
+        with session_factory() as db:
+            rows = crud.get_articles_by_slugs(db, [slug for slug, _, _ in candidates], summary=True)
+        by_slug = {row.slug: row for row in rows if row.status == "published"}
+        return [
+            dict(by_slug[slug]._asdict(), views=views, score=score)
+            for slug, score, views in candidates if slug in by_slug
+        ][:POPULAR_SIZE]
+
+    @staticmethod
+    def _write(session_factory, pending: Dict[str, int]):
+        with session_factory() as db:
+            crud.record_views(db, pending, _utcnow().date())
+
+    @staticmethod
+    def _recent_rows(session_factory) -> list:
+        since = _utcnow().date() - timedelta(days=VIEW_RANKING_DAYS - 1)
+        with session_factory() as db:
+            return crud.views_since(db, since)
+
+    async def flush(self, session_factory):
+        """Write pending counts, then update the ranking and popular list"""
+        pending, self._pending = self._pending, {}
+        total, self._pending_total = self._pending_total, 0
+        if pending:
+            try:
+                await run_in_threadpool(self._write, session_factory, pending)
+            except Exception:
+                # Keep the counts for the next attempt
+                for slug, views in pending.items():
+                    self._pending[slug] = self._pending.get(slug, 0) + views
+                self._pending_total += total
+                self.flush_failures += 1
+                logger.exception("Flushing %d article views failed", total)
+                return
+            self.flushed += total
+
+        changed = bool(pending) or self._summaries_stale
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= VIEW_RELOAD_SECONDS:
+            # Includes what was just written, and other processes' views
+            rows = await run_in_threadpool(self._recent_rows, session_factory)
+            self._load(rows, time.time())
+            changed = True
+        else:
+            now = time.time()
+            for slug, views in pending.items():
+                self._add(slug, views, now)
+            self._rescale(now)
+        if changed:
+            self._summaries_stale = False
+            self.popular = await run_in_threadpool(
+                self._popular, session_factory, self._candidates(time.time())
+            )
+
+    async def run(self, session_factory):
+        """Flush loop, started by the app lifespan"""
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                await self.flush(session_factory)
+            except Exception:
+                logger.exception("Refreshing the popular articles failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def stats(self) -> dict:
+        return {
+            "pending": self._pending_total,
+            "flushed": self.flushed,
+            "flush_failures": self.flush_failures,
+            "ranked": len(self._scores),
+            "popular": len(self.popular),
+        }
+
+
+view_counter = ViewCounter()
+bus.add_listener(view_counter.apply)
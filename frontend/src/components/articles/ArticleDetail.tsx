@@ -9,8 +9,12 @@ interface ArticleDetailProps {
   article: Article;
 }
 
+const PROSE_CLASSES = 'prose prose-lg dark:prose-invert max-w-none prose-headings:text-gray-900 dark:prose-headings:text-white prose-a:text-accent hover:prose-a:text-accent-light prose-code:bg-gray-100 dark:prose-code:bg-gray-800 prose-code:px-1 prose-code:rounded prose-pre:bg-gray-900 dark:prose-pre:bg-gray-800';
+
 export const ArticleDetail = ({ article }: ArticleDetailProps) => {
   const categoryInfo = getCategoryInfo(article.category);
+  // Second and third level headings; the first is usually the title again
+  const toc = (article.toc ?? []).filter(entry => entry.level >= 2 && entry.level <= 3);
 
   return (
     <article className="max-w-4xl mx-auto">
@@ -64,6 +68,12 @@ export const ArticleDetail = ({ article }: ArticleDetailProps) => {
           </div>
           <span className="text-gray-300 dark:text-gray-600">•</span>
           <time dateTime={article.date}>{formatDate(article.date)}</time>
+          {article.reading_time != null && (
+            <>
+              <span className="text-gray-300 dark:text-gray-600">•</span>
+              <span>{article.reading_time} min de lecture</span>
+            </>
+          )}
         </div>
       </header>
 
@@ -76,12 +86,39 @@ export const ArticleDetail = ({ article }: ArticleDetailProps) => {
         />
       </div>
 
-      {/* Content */}
-      <div className="prose prose-lg dark:prose-invert max-w-none prose-headings:text-gray-900 dark:prose-headings:text-white prose-a:text-accent hover:prose-a:text-accent-light prose-code:bg-gray-100 dark:prose-code:bg-gray-800 prose-code:px-1 prose-code:rounded prose-pre:bg-gray-900 dark:prose-pre:bg-gray-800">
-        <ReactMarkdown remarkPlugins={[remarkGfm]}>
-          {article.content}
-        </ReactMarkdown>
-      </div>
+      {/* Table of contents */}
+      {toc.length > 1 && (
+        <nav className="mb-8 p-4 rounded-xl bg-gray-50 dark:bg-gray-800/50" aria-label="Sommaire">
+          <p className="font-semibold text-gray-900 dark:text-white mb-2">Sommaire</p>
+          <ul className="space-y-1">
+            {toc.map(entry => (
+              <li key={entry.id} className={entry.level === 3 ? 'ml-4' : ''}>
+                <a
+                  href={`#${entry.id}`}
+                  className="text-gray-600 dark:text-gray-400 hover:text-accent transition-colors"
+                >
+                  {entry.title}
+                </a>
+              </li>
+            ))}
+          </ul>
+        </nav>
+      )}
+
+      {/* Content: HTML rendered and sanitized by the API when the article
+          was written; only local articles are rendered here */}
+      {article.content_html != null ? (
+        <div
+          className={PROSE_CLASSES}
+          dangerouslySetInnerHTML={{ __html: article.content_html }}
+        />
+      ) : (
+        <div className={PROSE_CLASSES}>
+          <ReactMarkdown remarkPlugins={[remarkGfm]}>
+            {article.content}
+          </ReactMarkdown>
+        </div>
+      )}
 
       {/* Footer */}
       <footer className="mt-12 pt-8 border-t border-gray-200 dark:border-gray-700">
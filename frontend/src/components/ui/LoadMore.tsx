@@ -0,0 +1,33 @@
+import { useEffect, useRef } from 'react';
+import { Button } from './Button';
+
+interface LoadMoreProps {
+  hasMore: boolean;
+  loading: boolean;
+  onLoadMore: () => void;
+}
+
+// Fetches the next page when scrolled into view, or on click
+export const LoadMore = ({ hasMore, loading, onLoadMore }: LoadMoreProps) => {
+  const ref = useRef<HTMLDivElement>(null);
+
+  useEffect(() => {
+    const element = ref.current;
+    if (!element || !hasMore || loading) return;
+    const observer = new IntersectionObserver(entries => {
+      if (entries.some(entry => entry.isIntersecting)) onLoadMore();
+    }, { rootMargin: '200px' });
+    observer.observe(element);
+    return () => observer.disconnect();
+  }, [hasMore, loading, onLoadMore]);
+
+  if (!hasMore) return null;
+
+  return (
+    <div ref={ref} className="flex justify-center py-6">
+      <Button variant="secondary" onClick={onLoadMore} disabled={loading}>
+        {loading ? 'Chargement...' : 'Charger plus d\'articles'}
+      </Button>
+    </div>
+  );
+};
@@ -88,62 +88,104 @@ Kubernetes continue d'évoluer. GitOps partout avec ArgoCD et Flux.`
   }
 ];
 
+// One list per scope ('HOME' or a category). Backed by the API it holds
+// the pages fetched so far; loadMore fetches the next one on demand.
+interface ArticleList {
+  articles: Article[];
+  nextCursor: string | null;
+  loading: boolean;
+}
+
+interface StoreState {
+  lists: Partial<Record<Category, ArticleList>>;
+  // Every article when not backed by the API; scopes are filtered from it
+  local: Article[] | null;
+}
+
+const EMPTY_LIST: ArticleList = { articles: [], nextCursor: null, loading: false };
+
 // Store class
 class ArticlesStore {
-  private articles: Article[] = [];
+  private state: StoreState = { lists: {}, local: null };
   private listeners: Set<() => void> = new Set();
-  private loading = false;
 
   constructor() {
-    this.loadInitialData();
-  }
-
-  private async loadInitialData() {
-    if (USE_API) {
-      await this.fetchFromApi();
-    } else {
+    if (!USE_API) {
       this.loadFromStorage();
     }
   }
 
-  private async fetchFromApi() {
+  private isLocal(): boolean {
+    return this.state.local !== null;
+  }
+
+  private setState(state: Partial<StoreState>) {
+    this.state = { ...this.state, ...state };
+    this.emitChange();
+  }
+
+  private setList(scope: Category, list: ArticleList) {
+    this.setState({ lists: { ...this.state.lists, [scope]: list } });
+  }
+
+  private setLocal(articles: Article[]) {
+    this.setState({ local: articles });
+    this.saveToStorage();
+  }
+
+  // Apply a change to every loaded list
+  private mapLists(change: (articles: Article[]) => Article[]) {
+    const lists: StoreState['lists'] = {};
+    (Object.keys(this.state.lists) as Category[]).forEach(scope => {
+      const list = this.state.lists[scope]!;
+      lists[scope] = { ...list, articles: change(list.articles) };
+    });
+    this.setState({ lists });
+  }
+
+  private async fetchPage(scope: Category, more: boolean) {
+    const current = this.state.lists[scope] ?? EMPTY_LIST;
+    if (current.loading || (more && !current.nextCursor)) return;
+    this.setList(scope, { ...current, loading: true });
     try {
-      this.loading = true;
-      this.emitChange();
-      this.articles = await api.getArticles();
-      this.loading = false;
-      this.emitChange();
+      const page = await api.getArticlesPage(
+        more ? current.nextCursor ?? undefined : undefined,
+        scope === 'HOME' ? undefined : scope,
+      );
+      const articles = more ? [...current.articles, ...page.items] : page.items;
+      this.setList(scope, { articles, nextCursor: page.next_cursor, loading: false });
     } catch (error) {
-      console.error('Failed to fetch from API, falling back to localStorage:', error);
-      this.loadFromStorage();
-      this.loading = false;
-      this.emitChange();
+      if (more) {
+        console.error('Failed to fetch more articles:', error);
+        this.setList(scope, { ...current, loading: false });
+      } else {
+        console.error('Failed to fetch from API, falling back to localStorage:', error);
+        this.loadFromStorage();
+      }
     }
   }
 
   private loadFromStorage() {
     if (typeof window === 'undefined') {
-      this.articles = defaultArticles;
+      this.setState({ local: defaultArticles });
       return;
     }
 
     const stored = localStorage.getItem(STORAGE_KEY);
     if (stored) {
       try {
-        this.articles = JSON.parse(stored);
+        this.setState({ local: JSON.parse(stored) });
       } catch {
-        this.articles = defaultArticles;
-        this.saveToStorage();
+        this.setLocal(defaultArticles);
       }
     } else {
-      this.articles = defaultArticles;
-      this.saveToStorage();
+      this.setLocal(defaultArticles);
     }
   }
 
   private saveToStorage() {
-    if (typeof window !== 'undefined') {
-      localStorage.setItem(STORAGE_KEY, JSON.stringify(this.articles));
+    if (typeof window !== 'undefined' && this.state.local) {
+      localStorage.setItem(STORAGE_KEY, JSON.stringify(this.state.local));
     }
   }
 
@@ -151,8 +193,8 @@ class ArticlesStore {
     this.listeners.forEach(listener => listener());
   }
 
-  getSnapshot = (): Article[] => {
-    return this.articles;
+  getSnapshot = (): StoreState => {
+    return this.state;
   };
 
   subscribe = (listener: () => void): (() => void) => {
@@ -162,68 +204,87 @@ class ArticlesStore {
     };
   };
 
+  listFor(state: StoreState, scope: Category): ArticleList {
+    if (state.local) {
+      const articles = scope === 'HOME'
+        ? state.local
+        : state.local.filter(article => article.category === scope);
+      return { articles, nextCursor: null, loading: false };
+    }
+    return state.lists[scope] ?? EMPTY_LIST;
+  }
+
   async addArticle(article: Article) {
-    if (USE_API) {
-      try {
-        const newArticle = await api.createArticle(article);
-        this.articles = [newArticle, ...this.articles];
-      } catch (error) {
-        console.error('Failed to create article:', error);
-        throw error;
-      }
-    } else {
-      this.articles = [article, ...this.articles];
-      this.saveToStorage();
+    if (this.isLocal()) {
+      this.setLocal([article, ...this.state.local!]);
+      return;
+    }
+    try {
+      const newArticle = await api.createArticle(article);
+      const lists = { ...this.state.lists };
+      (['HOME', newArticle.category] as Category[]).forEach(scope => {
+        const list = lists[scope];
+        if (list) lists[scope] = { ...list, articles: [newArticle, ...list.articles] };
+      });
+      this.setState({ lists });
+    } catch (error) {
+      console.error('Failed to create article:', error);
+      throw error;
     }
-    this.emitChange();
   }
 
   async deleteArticle(slug: string) {
-    if (USE_API) {
-      try {
-        await api.deleteArticle(slug);
-        this.articles = this.articles.filter(a => a.slug !== slug);
-      } catch (error) {
-        console.error('Failed to delete article:', error);
-        throw error;
-      }
-    } else {
-      this.articles = this.articles.filter(a => a.slug !== slug);
-      this.saveToStorage();
+    const remove = (articles: Article[]) => articles.filter(a => a.slug !== slug);
+    if (this.isLocal()) {
+      this.setLocal(remove(this.state.local!));
+      return;
+    }
+    try {
+      await api.deleteArticle(slug);
+      this.mapLists(remove);
+    } catch (error) {
+      console.error('Failed to delete article:', error);
+      throw error;
     }
-    this.emitChange();
   }
 
   async updateArticle(slug: string, updates: Partial<Article>) {
-    if (USE_API) {
-      try {
-        const updated = await api.updateArticle(slug, updates);
-        this.articles = this.articles.map(a => a.slug === slug ? updated : a);
-      } catch (error) {
-        console.error('Failed to update article:', error);
-        throw error;
-      }
-    } else {
-      this.articles = this.articles.map(a =>
+    if (this.isLocal()) {
+      this.setLocal(this.state.local!.map(a =>
         a.slug === slug ? { ...a, ...updates } : a
-      );
-      this.saveToStorage();
+      ));
+      return;
+    }
+    try {
+      const updated = await api.updateArticle(slug, updates);
+      this.mapLists(articles => articles.map(a => a.slug === slug ? updated : a));
+    } catch (error) {
+      console.error('Failed to update article:', error);
+      throw error;
     }
-    this.emitChange();
   }
 
   getArticleBySlug(slug: string): Article | undefined {
-    return this.articles.find(article => article.slug === slug);
+    if (this.state.local) {
+      return this.state.local.find(article => article.slug === slug);
+    }
+    for (const list of Object.values(this.state.lists)) {
+      const article = list?.articles.find(a => a.slug === slug);
+      if (article) return article;
+    }
+    return undefined;
   }
 
-  async refresh() {
-    if (USE_API) {
-      await this.fetchFromApi();
+  async refresh(scope: Category) {
+    if (!this.isLocal()) {
+      await this.fetchPage(scope, false);
     }
   }
 
-  isLoading(): boolean {
-    return this.loading;
+  async loadMore(scope: Category) {
+    if (!this.isLocal()) {
+      await this.fetchPage(scope, true);
+    }
   }
 }
 
@@ -231,11 +292,12 @@ class ArticlesStore {
 const store = new ArticlesStore();
 
 export const useArticlesStore = (category?: Category) => {
-  const articles = useSyncExternalStore(
+  const state = useSyncExternalStore(
     store.subscribe,
     store.getSnapshot,
     store.getSnapshot
   );
+  const scope: Category = category || 'HOME';
 
   const addArticle = useCallback(async (article: Article) => {
     await store.addArticle(article);
@@ -254,20 +316,22 @@ export const useArticlesStore = (category?: Category) => {
   }, []);
 
   const refresh = useCallback(async () => {
-    await store.refresh();
-  }, []);
+    await store.refresh(scope);
+  }, [scope]);
 
-  const filteredArticles = useMemo(() => {
-    if (!category || category === 'HOME') {
-      return articles;
-    }
-    return articles.filter(article => article.category === category);
-  }, [articles, category]);
+  const loadMore = useCallback(async () => {
+    await store.loadMore(scope);
+  }, [scope]);
+
+  const list = useMemo(() => store.listFor(state, scope), [state, scope]);
+  const home = useMemo(() => store.listFor(state, 'HOME'), [state]);
 
   return {
-    articles: filteredArticles,
-    allArticles: articles,
-    loading: store.isLoading(),
+    articles: list.articles,
+    allArticles: home.articles,
+    loading: list.loading,
+    hasMore: list.nextCursor !== null,
+    loadMore,
     addArticle,
     deleteArticle,
     updateArticle,
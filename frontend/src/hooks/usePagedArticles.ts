@@ -0,0 +1,43 @@
+import { useState, useCallback } from 'react';
+import type { Article, ArticlePage } from '../types';
+
+// A cursor-paginated list: reload() fetches the first page, loadMore() the
+// next. fetchPage should be stable (defined outside the component).
+export const usePagedArticles = (fetchPage: (cursor?: string) => Promise<ArticlePage>) => {
+  const [articles, setArticles] = useState<Article[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  const reload = useCallback(async () => {
+    const page = await fetchPage();
+    setArticles(page.items);
+    setNextCursor(page.next_cursor);
+  }, [fetchPage]);
+
+  const loadMore = useCallback(async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(nextCursor);
+      // Live updates may already have added some of them
+      setArticles(list => {
+        const seen = new Set(list.map(a => a.slug));
+        return [...list, ...page.items.filter(a => !seen.has(a.slug))];
+      });
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      console.error('Error fetching more articles:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [fetchPage, nextCursor, loadingMore]);
+
+  return {
+    articles,
+    setArticles,
+    hasMore: nextCursor !== null,
+    loadingMore,
+    reload,
+    loadMore,
+  };
+};
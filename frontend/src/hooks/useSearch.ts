@@ -1,6 +1,11 @@
-import { useState, useMemo } from 'react';
+import { useState, useMemo, useEffect } from 'react';
 import Fuse from 'fuse.js';
 import type { Article } from '../types';
+import { api } from '../services/api';
+
+const USE_API = import.meta.env.VITE_USE_API === 'true';
+// Wait for a pause in typing before asking the API
+const SEARCH_DELAY_MS = 250;
 
 interface UseSearchOptions {
   threshold?: number;
@@ -9,6 +14,7 @@ interface UseSearchOptions {
 
 export const useSearch = (articles: Article[], options: UseSearchOptions = {}) => {
   const [query, setQuery] = useState('');
+  const [remoteResults, setRemoteResults] = useState<Article[]>([]);
 
   const {
     threshold = 0.3,
@@ -24,14 +30,33 @@ export const useSearch = (articles: Article[], options: UseSearchOptions = {}) =
     });
   }, [articles, keys, threshold]);
 
+  // Backed by the API only a page of articles is loaded: search server-side
+  useEffect(() => {
+    const q = query.trim();
+    if (!USE_API || !q) return;
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      api.searchArticles(q)
+        .then(results => { if (!cancelled) setRemoteResults(results); })
+        .catch(() => { if (!cancelled) setRemoteResults([]); });
+    }, SEARCH_DELAY_MS);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [query]);
+
   const results = useMemo(() => {
     if (!query.trim()) {
       return articles;
     }
+    if (USE_API) {
+      return remoteResults;
+    }
 
     const searchResults = fuse.search(query);
     return searchResults.map(result => result.item);
-  }, [query, fuse, articles]);
+  }, [query, fuse, articles, remoteResults]);
 
   const clearSearch = () => {
     setQuery('');
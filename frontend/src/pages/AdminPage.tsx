@@ -1,21 +1,33 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
 import { api } from '../services/api';
+import { usePagedArticles } from '../hooks/usePagedArticles';
+import { LoadMore } from '../components/ui/LoadMore';
 import { categories } from '../data/categories';
-import type { Article, Category, ArticleStatus } from '../types';
+import type {
+  Article, Category, ArticleStatus, ModerationEvent, ModerationEventType,
+} from '../types';
 
 type TabType = 'my-articles' | 'pending' | 'all';
 
+const fetchMyPage = (cursor?: string) => api.getMyArticlesPage(cursor);
+const fetchPendingPage = (cursor?: string) => api.getPendingArticlesPage(cursor);
+const fetchAllPage = (cursor?: string) => api.getAllArticlesPage(cursor);
+
 export const AdminPage = () => {
   const navigate = useNavigate();
   const { user } = useAuth();
   const isAdmin = user?.is_admin || false;
 
   const [activeTab, setActiveTab] = useState<TabType>('pending');
-  const [myArticles, setMyArticles] = useState<Article[]>([]);
-  const [pendingArticles, setPendingArticles] = useState<Article[]>([]);
-  const [allArticles, setAllArticles] = useState<Article[]>([]);
+  // One page each; more are fetched as the table is scrolled
+  const myList = usePagedArticles(fetchMyPage);
+  const pendingList = usePagedArticles(fetchPendingPage);
+  const allList = usePagedArticles(fetchAllPage);
+  const { setArticles: setMyArticles } = myList;
+  const { setArticles: setPendingArticles } = pendingList;
+  const { setArticles: setAllArticles } = allList;
   const [loading, setLoading] = useState(true);
   const [isFormOpen, setIsFormOpen] = useState(false);
   const [editingSlug, setEditingSlug] = useState<string | null>(null);
@@ -31,15 +43,9 @@ export const AdminPage = () => {
   const fetchArticles = async () => {
     setLoading(true);
     try {
-      const my = await api.getMyArticles();
-      setMyArticles(my);
-
-      if (isAdmin) {
-        const pending = await api.getPendingArticles();
-        setPendingArticles(pending);
-        const all = await api.getAllArticles();
-        setAllArticles(all);
-      }
+      await Promise.all(isAdmin
+        ? [myList.reload(), pendingList.reload(), allList.reload()]
+        : [myList.reload()]);
     } catch (error) {
       console.error('Error fetching articles:', error);
     } finally {
@@ -51,6 +57,44 @@ export const AdminPage = () => {
     fetchArticles();
   }, [isAdmin]);
 
+  // Admins get live updates instead of refetching every list after a change
+  const resyncTimer = useRef<ReturnType<typeof setTimeout>>();
+  const scheduleResync = () => {
+    clearTimeout(resyncTimer.current);
+    resyncTimer.current = setTimeout(fetchArticles, 300);
+  };
+
+  useEffect(() => {
+    if (!isAdmin) return;
+
+    const applyEvent = (type: ModerationEventType, data: ModerationEvent) => {
+      if (type !== 'article.deleted' && data.title === undefined) {
+        // Bulk events carry no summary fields
+        scheduleResync();
+        return;
+      }
+      const deleted = type === 'article.deleted';
+      const upsert = (list: Article[], keep: boolean) => {
+        const existing = list.find(a => a.slug === data.slug);
+        const rest = list.filter(a => a.slug !== data.slug);
+        if (!keep) return rest;
+        return [{ ...existing, ...data } as Article, ...rest].sort(
+          (a, b) => b.date.localeCompare(a.date) || (b.id ?? 0) - (a.id ?? 0),
+        );
+      };
+      setPendingArticles(list => upsert(list, !deleted && data.status === 'pending'));
+      setAllArticles(list => upsert(list, !deleted));
+      setMyArticles(list => upsert(list, !deleted && data.author_id === user?.id));
+    };
+
+    return api.subscribeModerationEvents(applyEvent, scheduleResync);
+  }, [isAdmin, user?.id]);
+
+  const refreshAfterWrite = () => {
+    // The moderation feed already delivers admin changes
+    if (!isAdmin) fetchArticles();
+  };
+
   const generateSlug = (title: string) => {
     return title
       .toLowerCase()
@@ -82,15 +126,18 @@ export const AdminPage = () => {
     setIsFormOpen(true);
   };
 
-  const openEditForm = (article: Article) => {
-    setEditingSlug(article.slug);
+  const openEditForm = async (article: Article) => {
+    // Load the current Markdown source: list copies have none, and a
+    // copy kept from an earlier save may predate someone else's
+    const full = await api.getArticleForEdit(article.slug);
+    setEditingSlug(full.slug);
     setFormData({
-      title: article.title,
-      slug: article.slug,
-      excerpt: article.excerpt || '',
-      category: article.category,
-      image: article.image || '',
-      content: article.content,
+      title: full.title,
+      slug: full.slug,
+      excerpt: full.excerpt || '',
+      category: full.category,
+      image: full.image || '',
+      content: full.content || '',
     });
     setIsFormOpen(true);
   };
@@ -133,7 +180,7 @@ export const AdminPage = () => {
       });
       setEditingSlug(null);
       setIsFormOpen(false);
-      fetchArticles();
+      refreshAfterWrite();
     } catch (error) {
       console.error('Error saving article:', error);
       alert('Erreur lors de la sauvegarde de l\'article');
@@ -144,7 +191,7 @@ export const AdminPage = () => {
     if (confirm('Supprimer cet article ?')) {
       try {
         await api.deleteArticle(slug);
-        fetchArticles();
+        refreshAfterWrite();
       } catch (error) {
         console.error('Error deleting article:', error);
         alert('Erreur lors de la suppression');
@@ -155,7 +202,7 @@ export const AdminPage = () => {
   const handleStatusChange = async (slug: string, status: ArticleStatus) => {
     try {
       await api.updateArticleStatus(slug, status);
-      fetchArticles();
+      refreshAfterWrite();
     } catch (error) {
       console.error('Error updating status:', error);
       alert('Erreur lors de la mise a jour du statut');
@@ -166,30 +213,34 @@ export const AdminPage = () => {
     try {
       const newStatus = activate ? 'published' : 'pending';
       await api.updateArticleStatus(slug, newStatus);
-      fetchArticles();
+      refreshAfterWrite();
     } catch (error) {
       console.error('Error toggling status:', error);
       alert('Erreur lors du changement de statut');
     }
   };
 
-  const getCurrentArticles = () => {
+  const getCurrentList = () => {
     switch (activeTab) {
       case 'my-articles':
-        return myArticles;
+        return myList;
       case 'pending':
-        return pendingArticles;
-      case 'all':
-        return allArticles;
+        return pendingList;
       default:
-        return [];
+        return allList;
     }
   };
 
+  const getCurrentArticles = () => getCurrentList().articles;
+
+  // Loaded so far; '+' when more pages remain
+  const countLabel = (list: typeof myList) =>
+    `${list.articles.length}${list.hasMore ? '+' : ''}`;
+
   const tabs = [
-    { id: 'pending' as TabType, label: 'En attente', count: pendingArticles.length },
-    { id: 'all' as TabType, label: 'Tous les articles', count: allArticles.length },
-    { id: 'my-articles' as TabType, label: 'Mes articles', count: myArticles.length },
+    { id: 'pending' as TabType, label: 'En attente', count: countLabel(pendingList) },
+    { id: 'all' as TabType, label: 'Tous les articles', count: countLabel(allList) },
+    { id: 'my-articles' as TabType, label: 'Mes articles', count: countLabel(myList) },
   ];
 
   return (
@@ -500,6 +551,12 @@ export const AdminPage = () => {
               {activeTab === 'all' && 'Aucun article dans la base de donnees.'}
             </div>
           )}
+
+          <LoadMore
+            hasMore={getCurrentList().hasMore}
+            loading={getCurrentList().loadingMore}
+            onLoadMore={getCurrentList().loadMore}
+          />
         </div>
       )}
     </div>
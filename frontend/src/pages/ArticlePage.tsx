@@ -1,20 +1,60 @@
+import { useEffect, useState } from 'react';
 import { useParams, Navigate } from 'react-router-dom';
 import { useArticlesStore } from '../hooks/useArticlesStore';
 import { ArticleDetail } from '../components/articles/ArticleDetail';
+import { ArticleGrid } from '../components/articles/ArticleGrid';
+import { api } from '../services/api';
+import type { Article, RelatedArticle } from '../types';
 
 export const ArticlePage = () => {
   const { slug } = useParams<{ slug: string }>();
   const { getArticleBySlug } = useArticlesStore();
+  const [fetched, setFetched] = useState<Article | null>(null);
+  const [notFound, setNotFound] = useState(false);
+  const [related, setRelated] = useState<RelatedArticle[]>([]);
 
-  const article = slug ? getArticleBySlug(slug) : undefined;
+  const stored = slug ? getArticleBySlug(slug) : undefined;
+  // The store only holds list summaries when backed by the API; local
+  // articles carry their Markdown, written ones their rendered HTML
+  const hasContent = stored?.content_html != null || stored?.content !== undefined;
 
-  if (!article) {
+  useEffect(() => {
+    if (!slug || hasContent) return;
+    api.getArticleBySlug(slug)
+      .then(setFetched)
+      .catch(() => setNotFound(true));
+  }, [slug, hasContent]);
+
+  useEffect(() => {
+    setRelated([]);
+    if (!slug) return;
+    // Optional: the index may still be building, or the article unpublished
+    api.getRelatedArticles(slug)
+      .then(setRelated)
+      .catch(() => setRelated([]));
+  }, [slug]);
+
+  const article = hasContent ? stored : fetched;
+
+  if (!slug || notFound) {
     return <Navigate to="/" replace />;
   }
 
+  if (!article) {
+    return null;
+  }
+
   return (
     <div className="px-4 py-8">
       <ArticleDetail article={article} />
+      {related.length > 0 && (
+        <section className="max-w-7xl mx-auto mt-12">
+          <h2 className="text-2xl font-bold text-gray-900 dark:text-white mb-4 lg:mb-6 pb-2 border-b border-gray-200 dark:border-gray-700">
+            Articles similaires
+          </h2>
+          <ArticleGrid articles={related} />
+        </section>
+      )}
     </div>
   );
 };
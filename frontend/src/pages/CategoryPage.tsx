@@ -1,20 +1,36 @@
-import { useEffect } from 'react';
+import { useEffect, useState } from 'react';
 import { useParams } from 'react-router-dom';
 import { useArticlesStore } from '../hooks/useArticlesStore';
+import { api } from '../services/api';
 import { ArticleGrid } from '../components/articles/ArticleGrid';
+import { LoadMore } from '../components/ui/LoadMore';
 import { getCategoryInfo } from '../data/categories';
-import type { Category } from '../types';
+import type { Category, Facets } from '../types';
 
 export const CategoryPage = () => {
   const { category } = useParams<{ category: string }>();
   const categoryUpper = category?.toUpperCase() as Category;
-  const { articles, refresh } = useArticlesStore(categoryUpper);
+  const { articles, refresh, hasMore, loadMore, loading } = useArticlesStore(categoryUpper);
   const categoryInfo = getCategoryInfo(categoryUpper);
+  // Only a page is loaded at a time; the facets hold the full count
+  const [facets, setFacets] = useState<Facets | null>(null);
 
   useEffect(() => {
     refresh();
   }, [refresh]);
 
+  useEffect(() => {
+    if (!hasMore || facets) return;
+    api.getFacets()
+      .then(setFacets)
+      .catch(() => setFacets(null));
+  }, [hasMore, facets]);
+
+  // Admins get every status in the facets; the page lists published ones
+  const count = hasMore && facets
+    ? facets.by_category[categoryUpper]?.published ?? articles.length
+    : articles.length;
+
   return (
     <div className="max-w-7xl mx-auto px-4 py-8">
       {/* Category Header */}
@@ -32,7 +48,7 @@ export const CategoryPage = () => {
           {categoryInfo?.label || category}
         </h1>
         <p className="text-gray-600 dark:text-gray-400">
-          {articles.length} article{articles.length !== 1 ? 's' : ''} dans cette
+          {count} article{count !== 1 ? 's' : ''} dans cette
           catégorie
         </p>
       </section>
@@ -40,6 +56,7 @@ export const CategoryPage = () => {
       {/* Articles Grid */}
       <section>
         <ArticleGrid articles={articles} />
+        <LoadMore hasMore={hasMore} loading={loading} onLoadMore={loadMore} />
       </section>
     </div>
   );
@@ -1,18 +1,28 @@
-import { useEffect } from 'react';
+import { useEffect, useState } from 'react';
 import { Link } from 'react-router-dom';
 import { useArticlesStore } from '../hooks/useArticlesStore';
+import { api } from '../services/api';
 import { getCategoryInfo } from '../data/categories';
 import { formatDateShort } from '../utils/date';
+import type { Article } from '../types';
 
 export const HomePage = () => {
   const { articles, refresh } = useArticlesStore();
+  const [mostRead, setMostRead] = useState<Article[]>([]);
 
   useEffect(() => {
     refresh();
   }, [refresh]);
 
+  useEffect(() => {
+    // Empty until views have been counted; the latest articles stand in
+    api.getPopularArticles(4)
+      .then(setMostRead)
+      .catch(() => setMostRead([]));
+  }, []);
+
   const featuredArticle = articles[0];
-  const popularArticles = articles.slice(1, 5);
+  const popularArticles = mostRead.length > 0 ? mostRead : articles.slice(1, 5);
   const recentArticles = articles.slice(5, 11);
 
   return (
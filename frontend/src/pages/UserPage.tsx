@@ -2,9 +2,13 @@ import { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
 import { api } from '../services/api';
+import { usePagedArticles } from '../hooks/usePagedArticles';
+import { LoadMore } from '../components/ui/LoadMore';
 import { categories } from '../data/categories';
 import type { Article, Category, ArticleStatus } from '../types';
 
+const fetchMyPage = (cursor?: string) => api.getMyArticlesPage(cursor);
+
 const StatusBadge = ({ status }: { status?: ArticleStatus }) => {
   const styles = {
     pending: 'bg-yellow-100 text-yellow-800 dark:bg-yellow-900/30 dark:text-yellow-400',
@@ -30,7 +34,8 @@ export const UserPage = () => {
   const navigate = useNavigate();
   const { user } = useAuth();
 
-  const [myArticles, setMyArticles] = useState<Article[]>([]);
+  const myList = usePagedArticles(fetchMyPage);
+  const myArticles = myList.articles;
   const [loading, setLoading] = useState(true);
   const [isFormOpen, setIsFormOpen] = useState(false);
   const [editingSlug, setEditingSlug] = useState<string | null>(null);
@@ -46,8 +51,7 @@ export const UserPage = () => {
   const fetchArticles = async () => {
     setLoading(true);
     try {
-      const my = await api.getMyArticles();
-      setMyArticles(my);
+      await myList.reload();
     } catch (error) {
       console.error('Error fetching articles:', error);
     } finally {
@@ -90,15 +94,18 @@ export const UserPage = () => {
     setIsFormOpen(true);
   };
 
-  const openEditForm = (article: Article) => {
-    setEditingSlug(article.slug);
+  const openEditForm = async (article: Article) => {
+    // Load the current Markdown source: list copies have none, and a
+    // copy kept from an earlier save may predate someone else's
+    const full = await api.getArticleForEdit(article.slug);
+    setEditingSlug(full.slug);
     setFormData({
-      title: article.title,
-      slug: article.slug,
-      excerpt: article.excerpt || '',
-      category: article.category,
-      image: article.image || '',
-      content: article.content,
+      title: full.title,
+      slug: full.slug,
+      excerpt: full.excerpt || '',
+      category: full.category,
+      image: full.image || '',
+      content: full.content || '',
     });
     setIsFormOpen(true);
   };
@@ -451,6 +458,12 @@ export const UserPage = () => {
               Vous n'avez pas encore d'articles. Creez votre premier article !
             </div>
           )}
+
+          <LoadMore
+            hasMore={myList.hasMore}
+            loading={myList.loadingMore}
+            onLoadMore={myList.loadMore}
+          />
         </div>
       )}
     </div>
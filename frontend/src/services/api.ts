@@ -1,4 +1,7 @@
-import type { Article, ArticleStatus } from '../types';
+import type {
+  Article, ArticlePage, ArticleStatus, BatchItem, Facets, ModerationEvent,
+  ModerationEventType, PopularArticle, RelatedArticle,
+} from '../types';
 
 const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api';
 
@@ -24,32 +27,65 @@ class ApiService {
     return response.json();
   }
 
+  // List endpoints are cursor-paginated: one page per call, pass the
+  // previous page's next_cursor to get the following one
+  private async getPage(
+    endpoint: string,
+    params: Record<string, string | undefined> = {},
+    options?: RequestInit,
+  ): Promise<ArticlePage> {
+    const query = new URLSearchParams();
+    Object.entries(params).forEach(([key, value]) => {
+      if (value) query.set(key, value);
+    });
+    const search = query.toString();
+    return this.request<ArticlePage>(`${endpoint}${search ? `?${search}` : ''}`, options);
+  }
+
   // Articles - Public
-  async getArticles(): Promise<Article[]> {
-    return this.request<Article[]>('/articles');
+  async getArticlesPage(cursor?: string, category?: string): Promise<ArticlePage> {
+    return this.getPage('/articles', { cursor, category });
   }
 
+  // Rendered HTML and table of contents, without the Markdown source
   async getArticleBySlug(slug: string): Promise<Article> {
     return this.request<Article>(`/articles/${slug}`);
   }
 
-  // Articles - Authenticated
-  async getMyArticles(): Promise<Article[]> {
-    return this.request<Article[]>('/articles/my', {
+  // With the Markdown source, for the edit forms: always revalidated, a
+  // form filled from a stale copy would overwrite the last save
+  async getArticleForEdit(slug: string): Promise<Article> {
+    return this.request<Article>(`/articles/${slug}?content=true`, {
       headers: this.getAuthHeader(),
+      cache: 'no-cache',
     });
   }
 
-  async getPendingArticles(): Promise<Article[]> {
-    return this.request<Article[]>('/articles/pending', {
-      headers: this.getAuthHeader(),
+  // Up to 50 articles in one request, in the order asked; missing slugs
+  // come back with found=false. 'summary' omits the body, 'full' is the
+  // detail response (rendered HTML).
+  async getArticlesBySlugs(
+    slugs: string[],
+    fields: 'summary' | 'full' = 'summary',
+  ): Promise<BatchItem[]> {
+    const result = await this.request<{ items: BatchItem[] }>('/articles/batch', {
+      method: 'POST',
+      body: JSON.stringify({ slugs, fields }),
     });
+    return result.items;
   }
 
-  async getAllArticles(): Promise<Article[]> {
-    return this.request<Article[]>('/articles/all', {
-      headers: this.getAuthHeader(),
-    });
+  // Articles - Authenticated
+  async getMyArticlesPage(cursor?: string): Promise<ArticlePage> {
+    return this.getPage('/articles/my', { cursor }, { headers: this.getAuthHeader() });
+  }
+
+  async getPendingArticlesPage(cursor?: string): Promise<ArticlePage> {
+    return this.getPage('/articles/pending', { cursor }, { headers: this.getAuthHeader() });
+  }
+
+  async getAllArticlesPage(cursor?: string): Promise<ArticlePage> {
+    return this.getPage('/articles/all', { cursor }, { headers: this.getAuthHeader() });
   }
 
   async createArticle(article: Omit<Article, 'slug' | 'author' | 'status' | 'author_id' | 'date'> & { slug?: string }): Promise<Article> {
@@ -83,15 +119,80 @@ class ApiService {
     });
   }
 
-  // Categories
-  async getArticlesByCategory(category: string): Promise<Article[]> {
-    return this.request<Article[]>(`/articles?category=${category}`);
+  // Counts per category and status; published only unless signed in as admin
+  async getFacets(): Promise<Facets> {
+    return this.request<Facets>('/articles/facets', {
+      headers: this.getAuthHeader(),
+    });
+  }
+
+  // Moderation feed (admin). EventSource cannot send headers, so each
+  // connection is opened with a short-lived single-use ticket rather than the
+  // token. onResync means events were missed: refetch.
+  subscribeModerationEvents(
+    onEvent: (type: ModerationEventType, data: ModerationEvent) => void,
+    onResync: () => void,
+  ): () => void {
+    const types: ModerationEventType[] = [
+      'article.created', 'article.updated', 'article.status', 'article.deleted',
+    ];
+    let source: EventSource | null = null;
+    let retry: ReturnType<typeof setTimeout> | undefined;
+    let closed = false;
+
+    const connect = async (reconnecting: boolean) => {
+      let ticket: string;
+      try {
+        ({ ticket } = await this.request<{ ticket: string }>('/events/ticket', {
+          method: 'POST',
+          headers: this.getAuthHeader(),
+        }));
+      } catch {
+        if (!closed) retry = setTimeout(() => connect(reconnecting), 5000);
+        return;
+      }
+      if (closed) return;
+      source = new EventSource(
+        `${API_URL}/events/moderation?ticket=${encodeURIComponent(ticket)}`,
+      );
+      types.forEach(type => {
+        source?.addEventListener(type, event => {
+          onEvent(type, JSON.parse((event as MessageEvent).data));
+        });
+      });
+      source.addEventListener('resync', onResync);
+      source.addEventListener('articles.imported', onResync);
+      // A new connection cannot replay what the old one missed
+      if (reconnecting) source.addEventListener('open', onResync, { once: true });
+      source.onerror = () => {
+        // The browser retries with the same, now spent, ticket and gives up
+        // once refused: open a new connection with a new ticket
+        if (source?.readyState === EventSource.CLOSED && !closed) {
+          retry = setTimeout(() => connect(true), 1000);
+        }
+      };
+    };
+
+    void connect(false);
+    return () => {
+      closed = true;
+      clearTimeout(retry);
+      source?.close();
+    };
   }
 
   // Search
   async searchArticles(query: string): Promise<Article[]> {
     return this.request<Article[]>(`/articles/search?q=${encodeURIComponent(query)}`);
   }
+
+  async getPopularArticles(limit = 10): Promise<PopularArticle[]> {
+    return this.request<PopularArticle[]>(`/articles/popular?limit=${limit}`);
+  }
+
+  async getRelatedArticles(slug: string, limit = 4): Promise<RelatedArticle[]> {
+    return this.request<RelatedArticle[]>(`/articles/${slug}/related?limit=${limit}`);
+  }
 }
 
 export const api = new ApiService();
@@ -9,11 +9,63 @@ export interface Article {
   category: Category;
   image: string;
   excerpt: string;
-  content: string;
+  content?: string; // Markdown source: edit forms and local data only
   status?: ArticleStatus;
   author_id?: number;
+  // Rendered by the API when the article is written (detail responses)
+  content_html?: string | null;
+  toc?: TocEntry[] | null;
+  word_count?: number | null;
+  reading_time?: number | null; // minutes
 }
 
+export interface TocEntry {
+  id: string; // of the heading in content_html
+  title: string;
+  level: number;
+}
+
+export interface ArticlePage {
+  items: Article[];
+  next_cursor: string | null;
+}
+
+export interface BatchItem {
+  slug: string;
+  found: boolean;
+  article: Article | null;
+}
+
+export interface RelatedArticle extends Article {
+  score: number; // cosine similarity, 0..1
+}
+
+export interface PopularArticle extends Article {
+  views: number; // over the ranking window
+  score: number; // time-decayed views
+}
+
+export interface Facets {
+  total: number;
+  statuses: Partial<Record<ArticleStatus, number>>;
+  categories: Partial<Record<Category, number>>;
+  by_category: Partial<Record<Category, Partial<Record<ArticleStatus, number>>>>;
+  reconciled_at: number | null;
+}
+
+export type ModerationEventType =
+  | 'article.created'
+  | 'article.updated'
+  | 'article.status'
+  | 'article.deleted';
+
+// Summary fields of the article (bulk events only carry slug, category, status)
+export type ModerationEvent = Partial<Article> & {
+  slug: string;
+  previous_status?: ArticleStatus | null;
+  previous_category?: Category;
+};
+
 export type Category =
   | 'HOME'
   | 'STORY'